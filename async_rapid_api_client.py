@@ -0,0 +1,547 @@
+"""
+Cliente assíncrono (aiohttp) para a RapidAPI - Futebol Virtual Bet365
+Mesmos endpoints do RapidAPIClient, mas busca todas as ligas em paralelo:
+um ciclo completo leva o tempo da liga mais lenta, não a soma de todas.
+"""
+
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+import aiohttp
+
+from rapid_api_client import RapidAPIClient, _parse_retry_after, is_cacheable, revalidate_in_background
+from rate_limiter import QuotaRateLimiter, get_rate_limiter
+from resilience import RetryPolicy, RETRYABLE_STATUS, get_circuit_breaker, new_request_stats, merge_request_stats
+from response_cache import ResponseCache, get_response_cache, FRESH, STALE
+from raw_archive import RawArchive, get_raw_archive
+from sources import Source, source_key, DEFAULT_BOOKMAKER, DEFAULT_SPORT_ID
+from config import (
+    RAPIDAPI_RATE_LIMITER_ENABLED,
+    RAPIDAPI_CACHE_ENABLED,
+    RAW_ARCHIVE_ENABLED,
+    RAPIDAPI_KEY,
+    RAPIDAPI_HOST,
+    RAPIDAPI_CONNECT_TIMEOUT,
+    RAPIDAPI_READ_TIMEOUT,
+    RAPIDAPI_MAX_CONCURRENCY,
+    SOURCE_MAX_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRapidAPIClient:
+    """Cliente asyncio da API do Futebol Virtual Bet365 na RapidAPI"""
+
+    BASE_URL = RapidAPIClient.BASE_URL
+    AVAILABLE_LEAGUES = RapidAPIClient.AVAILABLE_LEAGUES
+
+    # Nome do endpoint (como em get_all_leagues_data) -> caminho
+    ENDPOINTS = {
+        "last-updated": "/last-updated",
+        "next-matchs": "/next-matchs",
+        "matchs": "/matchs"
+    }
+
+    def __init__(
+        self,
+        api_key: str,
+        api_host: str = "futebol-virtual-bet3651.p.rapidapi.com",
+        max_concurrency: int = RAPIDAPI_MAX_CONCURRENCY,
+        connect_timeout: float = RAPIDAPI_CONNECT_TIMEOUT,
+        read_timeout: float = RAPIDAPI_READ_TIMEOUT,
+        rate_limiter: Optional[QuotaRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        archive: Optional[RawArchive] = None
+    ):
+        """
+        Inicializa o cliente assíncrono
+
+        Args:
+            api_key: Chave de API da RapidAPI (X-RapidAPI-Key)
+            api_host: Host da API (X-RapidAPI-Host)
+            max_concurrency: Máximo de requisições simultâneas
+            connect_timeout: Timeout (s) para abrir a conexão
+            read_timeout: Timeout (s) aguardando a resposta
+            rate_limiter: Limitador de cota (None = limitador compartilhado entre processos,
+                se RAPIDAPI_RATE_LIMITER_ENABLED)
+            retry_policy: Política de retentativas (None = padrão do config)
+            cache: Cache de respostas (None = cache em disco compartilhado,
+                se RAPIDAPI_CACHE_ENABLED)
+            archive: Arquivo bruto das respostas (None = arquivo diário padrão,
+                se RAW_ARCHIVE_ENABLED)
+        """
+        self.api_key = api_key
+        self.api_host = api_host
+        self.max_concurrency = max_concurrency
+
+        if rate_limiter is None and RAPIDAPI_RATE_LIMITER_ENABLED:
+            rate_limiter = get_rate_limiter()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+
+        if cache is None and RAPIDAPI_CACHE_ENABLED:
+            cache = get_response_cache()
+        self.cache = cache
+
+        if archive is None and RAW_ARCHIVE_ENABLED:
+            archive = get_raw_archive()
+        self.archive = archive
+
+        # Contadores de requisições/retentativas (registrados no ScraperLog)
+        self.stats = new_request_stats()
+
+        self.headers = {
+            "x-rapidapi-key": api_key,
+            "x-rapidapi-host": api_host
+        }
+        self.timeout = aiohttp.ClientTimeout(
+            connect=connect_timeout,
+            sock_read=read_timeout
+        )
+
+        # Criados dentro do event loop (em __aenter__)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncRapidAPIClient":
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=self.timeout,
+            connector=connector
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Fecha a sessão HTTP"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _send_once(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        method: str
+    ) -> Tuple[Optional[Dict], bool, Optional[float]]:
+        """
+        Faz uma única tentativa de requisição
+
+        Returns:
+            Tupla (resposta_json, vale_tentar_de_novo, retry_after)
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+
+        try:
+            logger.info(f"🌐 Requisição (async): {method} {endpoint} [{data.get('league')}]")
+            logger.debug(f"   Payload: {data}")
+
+            async with self._session.request(method, url, data=data) as response:
+                if response.status >= 400:
+                    retry_after = None
+                    if response.headers.get("Retry-After") is not None:
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status == 429 and self.rate_limiter is not None:
+                        # Grava no SQLite do limitador: fora do event loop
+                        await asyncio.to_thread(
+                            self.rate_limiter.report_throttled, retry_after if retry_after is not None else 60.0
+                        )
+                    text = await response.text()
+                    logger.error(f"❌ Erro HTTP {response.status} em {endpoint}")
+                    logger.error(f"   Response: {text}")
+                    return None, response.status in RETRYABLE_STATUS, retry_after
+
+                result = await response.json(content_type=None)
+                logger.info(f"✓ Status: {response.status} [{data.get('league')}]")
+
+                return result, False, None
+
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Timeout na requisição para {endpoint} [{data.get('league')}]")
+            return None, True, None
+
+        except aiohttp.ClientError as e:
+            logger.error(f"❌ Erro na requisição: {e}")
+            return None, True, None
+
+        except ValueError as e:
+            logger.error(f"❌ Erro ao parsear JSON: {e}")
+            return None, False, None
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """
+        Faz requisição à API, passando antes pelo cache compartilhado
+
+        Args:
+            endpoint: Endpoint da API (ex: '/last-updated')
+            data: Dados do body (form-data)
+            method: Método HTTP (POST)
+
+        Returns:
+            Resposta JSON ou None em caso de erro
+        """
+        # Cache em SQLite: leitura/gravação em thread, fora do event loop
+        if self.cache is not None:
+            cached, freshness = await asyncio.to_thread(self.cache.get, endpoint, data)
+            if freshness == FRESH:
+                return cached
+            if freshness == STALE:
+                # Serve a resposta antiga e atualiza em segundo plano
+                revalidate_in_background(self.api_key, self.api_host, endpoint, data, method)
+                return cached
+
+        return await self.refresh(endpoint, data, method)
+
+    async def refresh(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """Busca na API ignorando o cache e grava a resposta no cache"""
+        result = await self._fetch(endpoint, data, method)
+
+        if result is not None and self.cache is not None and is_cacheable(result):
+            await asyncio.to_thread(self.cache.set, endpoint, data, result)
+
+        return result
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """
+        Faz requisição à API respeitando o limite de concorrência,
+        com retentativas e circuit breaker por liga
+
+        Args:
+            endpoint: Endpoint da API (ex: '/last-updated')
+            data: Dados do body (form-data)
+            method: Método HTTP (POST)
+
+        Returns:
+            Resposta JSON ou None em caso de erro
+        """
+        if self._session is None:
+            raise RuntimeError("Use 'async with AsyncRapidAPIClient(...)' antes de fazer requisições")
+
+        # Circuit breaker por célula (liga, ou liga@casa/esporte fora do padrão)
+        league = source_key(str(data.get("league", "")), data.get("home", DEFAULT_BOOKMAKER), data.get("sport_id", DEFAULT_SPORT_ID))
+        breaker = get_circuit_breaker(league)
+
+        # Liga fora do ar: falha rápido sem gastar timeout nem cota
+        if not breaker.allow_request():
+            logger.warning(f"⛔ Liga {league} com circuit breaker aberto, pulando {endpoint}")
+            self.stats["short_circuited"] += 1
+            return None
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                # Token bucket + cota compartilhados com os outros processos
+                if self.rate_limiter is not None and not await self.rate_limiter.acquire_async(endpoint):
+                    # Recusa por cota não indica problema na liga
+                    breaker.release_probe()
+                    return None
+
+                self.stats["requests"] += 1
+                result, retryable, retry_after = await self._send_once(endpoint, data, method)
+
+            if result is not None:
+                breaker.record_success()
+                if self.archive is not None:
+                    # gzip + escrita em disco em thread (não atrasa as outras ligas)
+                    await asyncio.to_thread(self.archive.append, endpoint, data, result, datetime.now())
+                return result
+
+            delay = self.retry_policy.compute_delay(attempt, retry_after) if retryable else None
+            if delay is None:
+                break
+
+            # Espera fora do semáforo para não segurar vaga de outras ligas
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.info(f"🔁 Nova tentativa {attempt}/{self.retry_policy.max_retries} de {endpoint} [{league}] em {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        self.stats["failures"] += 1
+        breaker.record_failure()
+        return None
+
+    def _league_payload(self, league: str, home: str, sport_id: int) -> Dict[str, Any]:
+        """Monta o body padrão de uma requisição por liga"""
+        if league not in self.AVAILABLE_LEAGUES:
+            logger.warning(f"⚠️ Liga '{league}' pode não ser válida. Disponíveis: {self.AVAILABLE_LEAGUES}")
+
+        return {
+            "league": league,
+            "home": home,
+            "sport_id": sport_id
+        }
+
+    async def get_last_updated(
+        self,
+        league: str = "euro",
+        home: str = "bet365",
+        sport_id: int = 1,
+        use_cache: bool = True
+    ) -> Optional[Dict]:
+        """Obtém última atualização da liga (use_cache=False: sempre consulta a API)"""
+        payload = self._league_payload(league, home, sport_id)
+        if not use_cache:
+            return await self.refresh("/last-updated", payload)
+        return await self._make_request("/last-updated", payload)
+
+    async def get_next_matches(
+        self,
+        league: str = "euro",
+        home: str = "bet365",
+        sport_id: int = 1
+    ) -> Optional[Dict]:
+        """Obtém próximas partidas da liga"""
+        return await self._make_request("/next-matchs", self._league_payload(league, home, sport_id))
+
+    async def get_matches(
+        self,
+        league: str = "euro",
+        home: str = "bet365",
+        sport_id: int = 1
+    ) -> Optional[Dict]:
+        """Obtém partidas (resultados) da liga"""
+        return await self._make_request("/matchs", self._league_payload(league, home, sport_id))
+
+    async def get_all_leagues_data(
+        self,
+        endpoint: str = "next-matchs",
+        leagues: Optional[List[str]] = None,
+        home: str = "bet365",
+        sport_id: int = 1,
+        on_result: Optional[Callable[[str, Optional[Dict]], None]] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Obtém dados de todas as ligas em paralelo
+
+        Args:
+            endpoint: Endpoint a chamar ('last-updated', 'next-matchs', 'matchs')
+            leagues: Ligas a buscar (None = todas)
+            home: Casa de apostas
+            sport_id: ID do esporte
+            on_result: Chamado com (liga, dados) assim que cada liga chega, em uma
+                thread auxiliar (pode bloquear sem travar as outras requisições)
+            use_cache: False = ignora o cache de respostas (grava a resposta nova)
+
+        Returns:
+            Dicionário com {liga: dados} para cada liga (None em caso de erro)
+        """
+        if leagues is None:
+            leagues = self.AVAILABLE_LEAGUES
+
+        path = self.ENDPOINTS.get(endpoint)
+        if path is None:
+            logger.error(f"❌ Endpoint inválido: {endpoint}")
+            return {league: None for league in leagues}
+
+        logger.info(f"📊 Coletando /{endpoint} de {len(leagues)} ligas em paralelo (máx. {self.max_concurrency})")
+
+        request = self._make_request if use_cache else self.refresh
+
+        async def _fetch_league(league: str) -> Optional[Dict]:
+            response = await request(path, self._league_payload(league, home, sport_id))
+            if on_result is not None:
+                await asyncio.get_running_loop().run_in_executor(None, on_result, league, response)
+            return response
+
+        responses = await asyncio.gather(
+            *(_fetch_league(league) for league in leagues),
+            return_exceptions=True
+        )
+
+        results = {}
+        for league, response in zip(leagues, responses):
+            if isinstance(response, Exception):
+                logger.error(f"❌ Erro inesperado na liga {league}: {response}")
+                response = None
+            results[league] = response
+
+        return results
+
+
+    async def get_sources_data(
+        self,
+        endpoint: str,
+        sources: List[Source],
+        on_result: Optional[Callable[[Source, Optional[Dict]], None]] = None
+    ) -> Dict[Source, Optional[Dict]]:
+        """
+        Obtém dados de várias células (liga × casa × esporte) em paralelo
+
+        No máximo max_concurrency requisições ficam em andamento; on_result
+        roda em um pool com o mesmo limite de threads (parse/fila do escritor).
+
+        Args:
+            endpoint: Endpoint a chamar ('last-updated', 'next-matchs', 'matchs')
+            sources: Células a buscar
+            on_result: Chamado com (célula, dados) assim que cada célula chega
+
+        Returns:
+            Dicionário com {célula: dados} (None em caso de erro)
+        """
+        path = self.ENDPOINTS.get(endpoint)
+        if path is None:
+            logger.error(f"❌ Endpoint inválido: {endpoint}")
+            return {source: None for source in sources}
+
+        logger.info(f"📊 Coletando /{endpoint} de {len(sources)} fontes em paralelo (máx. {self.max_concurrency})")
+
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="source") as pool:
+            async def _fetch_source(source: Source) -> Optional[Dict]:
+                response = await self._make_request(
+                    path, self._league_payload(source.league, source.bookmaker, source.sport_id)
+                )
+                if on_result is not None:
+                    await loop.run_in_executor(pool, on_result, source, response)
+                return response
+
+            responses = await asyncio.gather(
+                *(_fetch_source(source) for source in sources),
+                return_exceptions=True
+            )
+
+        results = {}
+        for source, response in zip(sources, responses):
+            if isinstance(response, Exception):
+                logger.error(f"❌ Erro inesperado na fonte {source.key}: {response}")
+                response = None
+            results[source] = response
+
+        return results
+
+
+def _run_sync(coro_factory: Callable, default: Any) -> Any:
+    """Roda a corrotina em um event loop novo (em thread auxiliar se já houver um rodando)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro_factory())
+
+    result: Dict[str, Any] = {}
+
+    def _runner():
+        result["data"] = asyncio.run(coro_factory())
+
+    thread = threading.Thread(target=_runner, daemon=True)
+    thread.start()
+    thread.join()
+
+    return result.get("data", default)
+
+
+async def _fetch_all_leagues(
+    endpoint: str,
+    leagues: Optional[List[str]],
+    home: str,
+    sport_id: int,
+    stats: Optional[Dict[str, int]],
+    on_result: Optional[Callable[[str, Optional[Dict]], None]] = None,
+    use_cache: bool = True
+) -> Dict[str, Optional[Dict]]:
+    async with AsyncRapidAPIClient(api_key=RAPIDAPI_KEY, api_host=RAPIDAPI_HOST) as client:
+        try:
+            return await client.get_all_leagues_data(endpoint, leagues, home, sport_id, on_result, use_cache)
+        finally:
+            if stats is not None:
+                merge_request_stats(stats, client.stats)
+
+
+def fetch_all_leagues(
+    endpoint: str = "next-matchs",
+    leagues: Optional[List[str]] = None,
+    home: str = "bet365",
+    sport_id: int = 1,
+    stats: Optional[Dict[str, int]] = None,
+    on_result: Optional[Callable[[str, Optional[Dict]], None]] = None,
+    use_cache: bool = True
+) -> Dict[str, Optional[Dict]]:
+    """
+    Versão síncrona de AsyncRapidAPIClient.get_all_leagues_data
+
+    Pode ser chamada de código síncrono (scraper, coletor, threads do scheduler).
+    Se já houver um event loop rodando nesta thread, executa em uma thread auxiliar.
+
+    Args:
+        endpoint: Endpoint a chamar ('last-updated', 'next-matchs', 'matchs')
+        leagues: Ligas a buscar (None = todas)
+        home: Casa de apostas
+        sport_id: ID do esporte
+        stats: Dicionário onde somar os contadores de requisições (opcional)
+        on_result: Chamado com (liga, dados) assim que cada liga chega (opcional)
+        use_cache: False = ignora o cache de respostas
+
+    Returns:
+        Dicionário com {liga: dados} para cada liga
+    """
+    return _run_sync(
+        lambda: _fetch_all_leagues(endpoint, leagues, home, sport_id, stats, on_result, use_cache),
+        {league: None for league in (leagues or AsyncRapidAPIClient.AVAILABLE_LEAGUES)}
+    )
+
+
+async def _fetch_sources(
+    endpoint: str,
+    sources: List[Source],
+    stats: Optional[Dict[str, int]],
+    on_result: Optional[Callable[[Source, Optional[Dict]], None]],
+    max_workers: int
+) -> Dict[Source, Optional[Dict]]:
+    async with AsyncRapidAPIClient(api_key=RAPIDAPI_KEY, api_host=RAPIDAPI_HOST, max_concurrency=max_workers) as client:
+        try:
+            return await client.get_sources_data(endpoint, sources, on_result)
+        finally:
+            if stats is not None:
+                merge_request_stats(stats, client.stats)
+
+
+def fetch_sources(
+    endpoint: str,
+    sources: List[Source],
+    stats: Optional[Dict[str, int]] = None,
+    on_result: Optional[Callable[[Source, Optional[Dict]], None]] = None,
+    max_workers: int = SOURCE_MAX_WORKERS
+) -> Dict[Source, Optional[Dict]]:
+    """
+    Versão síncrona de AsyncRapidAPIClient.get_sources_data
+
+    Args:
+        endpoint: Endpoint a chamar ('last-updated', 'next-matchs', 'matchs')
+        sources: Células (liga × casa × esporte) a buscar
+        stats: Dicionário onde somar os contadores de requisições (opcional)
+        on_result: Chamado com (célula, dados) assim que cada célula chega (opcional)
+        max_workers: Requisições simultâneas / threads do on_result
+
+    Returns:
+        Dicionário com {célula: dados}
+    """
+    return _run_sync(
+        lambda: _fetch_sources(endpoint, sources, stats, on_result, max_workers),
+        {source: None for source in sources}
+    )
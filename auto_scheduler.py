@@ -5,6 +5,7 @@ Executa auto_sync.py automaticamente a cada intervalo definido
 Uso:
     python auto_scheduler.py           # Executa a cada 30 minutos
     python auto_scheduler.py --interval 15  # Executa a cada 15 minutos
+    python auto_scheduler.py --adaptive     # Só quando o calendário indica novidade
 """
 
 import schedule
@@ -14,6 +15,7 @@ from datetime import datetime, timedelta
 import logging
 
 from auto_sync import run_full_sync
+from poll_planner import get_poll_planner, NEXT_MATCHES, RESULTS
 
 # Configurar logging
 logging.basicConfig(
@@ -23,8 +25,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def scheduled_sync():
-    """Função que será executada periodicamente"""
+def scheduled_sync(leagues: list = None):
+    """
+    Função que será executada periodicamente
+    
+    Args:
+        leagues: Ligas a sincronizar (None = todas)
+    """
     local_time = datetime.now()
     site_time = local_time + timedelta(hours=4)
     
@@ -35,7 +42,7 @@ def scheduled_sync():
     logger.info("="*80 + "\n")
     
     try:
-        stats = run_full_sync()
+        stats = run_full_sync(leagues)
         
         logger.info("\n✅ Sincronização automática concluída com sucesso!")
         logger.info(f"   Novos jogos: {stats['scraper'].get('matches_new', 0)}")
@@ -74,6 +81,37 @@ def run_scheduler(interval_minutes: int = 30):
         time.sleep(60)  # Verifica a cada minuto
 
 
+def run_adaptive_scheduler():
+    """
+    Inicia o agendador adaptativo: verifica a cada minuto quais ligas têm
+    coleta no prazo (ver poll_planner) e sincroniza só essas; minutos sem
+    nada no prazo não fazem nenhuma requisição
+    """
+    planner = get_poll_planner()
+    
+    logger.info("\n" + "="*80)
+    logger.info("🤖 AGENDADOR AUTOMÁTICO INICIADO (adaptativo)")
+    logger.info(f"   Verificação: a cada minuto, só ligas com novidade esperada")
+    logger.info(f"   Correlação de horário: Local + 4h = Site Bet365")
+    logger.info("="*80 + "\n")
+    
+    while True:
+        try:
+            next_due, results_due = planner.due()
+            leagues = sorted(set(next_due) | set(results_due))
+            if leagues:
+                scheduled_sync(leagues)
+                # run_full_sync busca próximas partidas e resultados das mesmas ligas
+                planner.mark_fetched(NEXT_MATCHES, leagues)
+                planner.mark_fetched(RESULTS, leagues)
+            else:
+                logger.info(f"⏭️  Nada no prazo; próxima coleta útil em {planner.seconds_until_next():.0f}s")
+        except Exception as e:
+            logger.error(f"\n❌ Erro no agendador adaptativo: {e}")
+        
+        time.sleep(60)  # Verifica a cada minuto
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description='Agendador automático de sincronização'
@@ -84,11 +122,19 @@ if __name__ == "__main__":
         default=30,
         help='Intervalo entre sincronizações em minutos (padrão: 30)'
     )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Sincroniza cada liga só quando o calendário indica novidade (ignora --interval)'
+    )
     
     args = parser.parse_args()
     
     try:
-        run_scheduler(interval_minutes=args.interval)
+        if args.adaptive:
+            run_adaptive_scheduler()
+        else:
+            run_scheduler(interval_minutes=args.interval)
     except KeyboardInterrupt:
         logger.info("\n\n🛑 Agendador interrompido pelo usuário")
         logger.info("   Até a próxima! 👋")
@@ -1,7 +1,7 @@
 """
 Sistema de Sincronização Automática
 Executa todas as tarefas de atualização em sequência:
-1. Atualiza status das partidas (usando offset +4h)
+1. Atualiza status das partidas (pelo início em UTC, matches.kickoff_at)
 2. Coleta novos jogos via scraper
 3. Coleta resultados de jogos finalizados
 4. Atualiza status novamente após coleta
@@ -11,13 +11,13 @@ Se no seu PC é 12:22, no site são 16:22
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 
 from database_rapidapi import get_db
-from models_rapidapi import Match
+from match_time import site_now
+from match_status import refresh_match_statuses
 from scraper_rapidapi import RapidAPIScraper
 from results_collector import ResultsCollector
 from config import RAPIDAPI_LEAGUES
@@ -32,97 +32,28 @@ logger = logging.getLogger(__name__)
 
 def update_match_statuses(db: Session) -> Dict[str, int]:
     """
-    Atualiza status de todas as partidas baseado no horário do site (+4h)
+    Aplica as transições de status vencidas pelo início (kickoff_at, UTC)
+    
+    Poucos UPDATEs em lote (match_status.refresh_match_statuses) que só
+    alcançam partidas em aberto; o custo não cresce com a tabela.
     
     Returns:
-        Dicionário com contadores de status
+        Partidas que mudaram para cada status
     """
     logger.info("🕐 Atualizando status das partidas...")
-    
-    # Horário do site (local + 4h)
-    site_time = datetime.now() + timedelta(hours=4)
     logger.info(f"   Horário local: {datetime.now().strftime('%H:%M:%S')}")
-    logger.info(f"   Horário do site: {site_time.strftime('%H:%M:%S')}")
-    
-    # Busca todas as partidas sem resultado
-    matches = db.query(Match).filter(
-        Match.result == None
-    ).all()
-    
-    scheduled = 0
-    live = 0
-    expired = 0
-    finished = 0
-    
-    for match in matches:
-        try:
-            # Parse horário da partida
-            if not match.scheduled_time:
-                continue
-            
-            # Formato: "HH:MM" ou "H:MM"
-            time_parts = match.scheduled_time.split(':')
-            if len(time_parts) != 2:
-                continue
-            
-            hour = int(time_parts[0])
-            minute = int(time_parts[1])
-            
-            # Cria datetime da partida no horário do site
-            match_datetime = site_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # Se o horário da partida já passou hoje, pode ser amanhã
-            if match_datetime < site_time:
-                # Verifica se a diferença é maior que 12 horas (provavelmente é amanhã)
-                time_diff = (site_time - match_datetime).total_seconds() / 60
-                if time_diff > 720:  # 12 horas
-                    match_datetime = match_datetime + timedelta(days=1)
-            
-            # Calcula diferença em minutos
-            time_diff_minutes = (match_datetime - site_time).total_seconds() / 60
-            
-            # Define status baseado na diferença
-            old_status = match.status
-            
-            if time_diff_minutes > 120:  # Mais de 2h no futuro
-                match.status = "scheduled"
-                scheduled += 1
-            elif time_diff_minutes > -30:  # Entre 2h antes e 30min depois
-                match.status = "live"
-                live += 1
-            else:  # Mais de 30min atrás
-                if match.goals_home is not None and match.goals_away is not None:
-                    match.status = "finished"
-                    finished += 1
-                else:
-                    match.status = "expired"
-                    expired += 1
-            
-            # Log mudanças
-            if old_status != match.status:
-                logger.debug(
-                    f"   {match.team_home} vs {match.team_away} ({match.scheduled_time}): "
-                    f"{old_status} → {match.status}"
-                )
-                
-        except Exception as e:
-            logger.error(f"❌ Erro ao processar partida {match.id}: {e}")
-            continue
+    logger.info(f"   Horário do site: {site_now().strftime('%H:%M:%S')}")
     
+    changes = refresh_match_statuses(db)
     db.commit()
     
     logger.info(f"   ✅ Status atualizados:")
-    logger.info(f"      📅 Agendados: {scheduled}")
-    logger.info(f"      🔴 Ao vivo: {live}")
-    logger.info(f"      ⏰ Expirados: {expired}")
-    logger.info(f"      ✅ Finalizados: {finished}")
+    logger.info(f"      📅 Agendados: {changes['scheduled']}")
+    logger.info(f"      🔴 Ao vivo: {changes['live']}")
+    logger.info(f"      ⏰ Expirados: {changes['expired']}")
+    logger.info(f"      ✅ Finalizados: {changes['finished']}")
     
-    return {
-        "scheduled": scheduled,
-        "live": live,
-        "expired": expired,
-        "finished": finished
-    }
+    return changes
 
 
 def run_full_sync(leagues: list = None) -> Dict:
@@ -146,7 +77,7 @@ def run_full_sync(leagues: list = None) -> Dict:
     logger.info("🔄 INICIANDO SINCRONIZAÇÃO AUTOMÁTICA")
     logger.info(f"   Ligas: {', '.join(leagues)}")
     logger.info(f"   Horário local: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-    logger.info(f"   Horário do site: {(datetime.now() + timedelta(hours=4)).strftime('%d/%m/%Y %H:%M:%S')}")
+    logger.info(f"   Horário do site: {site_now().strftime('%d/%m/%Y %H:%M:%S')}")
     logger.info("="*80 + "\n")
     
     stats = {}
@@ -0,0 +1,259 @@
+"""
+Reprocessa o arquivo bruto da RapidAPI (raw_archive) e grava no bet365_rapidapi.db
+Não faz nenhuma requisição: útil após mudanças de schema ou para mapear mercados
+novos do odds_json em um intervalo de datas.
+
+Cada segmento diário é lido e normalizado em um processo separado; o processo
+principal junta os resultados em ordem cronológica e grava em lote.
+
+Uso:
+    python backfill_archive.py 2026-01-01 2026-01-31
+    python backfill_archive.py 2026-01-01 2026-01-31 --workers 8
+    python backfill_archive.py 2026-01-15 2026-01-15 --endpoint matchs
+"""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from raw_archive import RawArchive, get_raw_archive
+from match_time import SITE_TIME_OFFSET, kickoff_at
+from match_status import initial_status
+from models_rapidapi import Match
+from database_rapidapi import init_db, get_db
+
+logger = logging.getLogger(__name__)
+
+# Endpoints que viram partidas no banco
+ENDPOINTS = {
+    "next-matchs": "/next-matchs",
+    "matchs": "/matchs"
+}
+
+# Campos de resultado (não são sobrescritos por uma foto posterior de /next-matchs)
+RESULT_FIELDS = ("goals_home", "goals_away", "total_goals", "result")
+
+# Linhas por lote de INSERT/UPDATE
+BATCH_SIZE = 500
+
+_parsers = None
+
+
+def _get_parsers():
+    """Scraper e coletor usados só pelas funções de parse (um par por processo)"""
+    global _parsers
+    if _parsers is None:
+        from scraper_rapidapi import RapidAPIScraper
+        from results_collector import ResultsCollector
+        _parsers = (RapidAPIScraper(), ResultsCollector())
+    return _parsers
+
+
+def parse_segment(path: str, endpoints: Tuple[str, ...]) -> Dict[str, Dict]:
+    """
+    Normaliza as partidas de um segmento diário (executado no pool de processos)
+
+    Args:
+        path: Caminho do segmento .jsonl.gz
+        endpoints: Caminhos a reprocessar (ex: ('/next-matchs', '/matchs'))
+
+    Returns:
+        {external_id: colunas do Match} com a versão mais recente de cada partida no dia
+    """
+    scraper, collector = _get_parsers()
+    rows: Dict[str, Dict] = {}
+
+    for record in RawArchive.read_segment(Path(path)):
+        endpoint = record.get("endpoint")
+        payload = record.get("payload") or {}
+        if endpoint not in endpoints or not payload.get("status"):
+            continue
+
+        league = record.get("league") or payload.get("league")
+        fetched_at = datetime.fromisoformat(record["fetched_at"])
+
+        for match_data in payload.get("matchs", []):
+            external_id = match_data.get("id")
+            if not external_id:
+                continue
+
+            row = scraper._extract_match_data(match_data, league)
+            # Horário do site (local + 4h) no momento da coleta original
+            row["scraped_at"] = fetched_at + SITE_TIME_OFFSET
+            row["kickoff_at"] = kickoff_at(row["hour"], row["minute"], row["scraped_at"])
+            row["status"] = initial_status(row["kickoff_at"])
+
+            if endpoint == "/matchs":
+                score_ft = match_data.get("resultadoFt") or match_data.get("resultado")
+                goals_home, goals_away = collector._parse_score(score_ft)
+                if goals_home is None or goals_away is None:
+                    continue
+                row.update({
+                    "goals_home": goals_home,
+                    "goals_away": goals_away,
+                    "total_goals": goals_home + goals_away,
+                    "result": collector._determine_result(goals_home, goals_away),
+                    "status": "finished"
+                })
+
+            _merge_row(rows, external_id, row)
+
+    return rows
+
+
+def _merge_row(rows: Dict[str, Dict], external_id: str, row: Dict):
+    """Junta uma versão mais nova da partida sem perder um resultado já conhecido"""
+    previous = rows.get(external_id)
+    if previous is None:
+        rows[external_id] = row
+        return
+
+    finished = previous.get("status") == "finished"
+    previous.update({k: v for k, v in row.items() if k != "scraped_at"})
+    if finished and row.get("status") != "finished":
+        previous["status"] = "finished"
+
+
+def _merge_segment(target: Dict[str, Dict], rows: Dict[str, Dict]):
+    for external_id, row in rows.items():
+        if external_id in target:
+            _merge_row(target, external_id, row)
+        else:
+            target[external_id] = row
+
+
+def write_rows(rows: Dict[str, Dict]) -> Tuple[int, int]:
+    """
+    Grava as partidas em lote: INSERT das novas, UPDATE das existentes
+
+    Partidas já finalizadas no banco não voltam para "scheduled".
+
+    Returns:
+        Tupla (novas, atualizadas)
+    """
+    external_ids = list(rows)
+    new_count = 0
+    updated_count = 0
+
+    with get_db() as db:
+        for i in range(0, len(external_ids), BATCH_SIZE):
+            chunk = external_ids[i:i + BATCH_SIZE]
+            existing = {
+                external_id: (match_id, status)
+                for match_id, external_id, status in db.query(
+                    Match.id, Match.external_id, Match.status
+                ).filter(Match.external_id.in_(chunk))
+            }
+
+            inserts = []
+            updates = []
+            for external_id in chunk:
+                row = rows[external_id]
+                if external_id not in existing:
+                    inserts.append(row)
+                    continue
+
+                match_id, status = existing[external_id]
+                update = {k: v for k, v in row.items() if k != "scraped_at"}
+                update["id"] = match_id
+                if status == "finished" and row.get("status") != "finished":
+                    update.pop("status", None)
+                    for field in RESULT_FIELDS:
+                        update.pop(field, None)
+                updates.append(update)
+
+            if inserts:
+                db.bulk_insert_mappings(Match, inserts)
+            if updates:
+                db.bulk_update_mappings(Match, updates)
+            db.commit()
+
+            new_count += len(inserts)
+            updated_count += len(updates)
+
+    return new_count, updated_count
+
+
+def run_backfill(
+    start: date,
+    end: date,
+    endpoints: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    archive: Optional[RawArchive] = None
+) -> Dict:
+    """
+    Reprocessa um intervalo de datas do arquivo bruto
+
+    Args:
+        start: Primeiro dia (inclusive)
+        end: Último dia (inclusive)
+        endpoints: Nomes dos endpoints ('next-matchs', 'matchs'; None = ambos)
+        workers: Processos para o parse (None = número de CPUs)
+        archive: Arquivo bruto (None = RAW_ARCHIVE_DIR)
+
+    Returns:
+        Estatísticas do backfill
+    """
+    archive = archive or get_raw_archive()
+    paths = tuple(ENDPOINTS[name] for name in (endpoints or ENDPOINTS))
+    segments = archive.list_segments(start, end)
+
+    logger.info(f"📦 Backfill {start} → {end}: {len(segments)} segmentos ({', '.join(paths)})")
+
+    started = time.perf_counter()
+    rows: Dict[str, Dict] = {}
+
+    if segments:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map preserva a ordem: segmentos mais novos sobrescrevem os antigos
+            for segment, segment_rows in zip(segments, pool.map(parse_segment, map(str, segments), [paths] * len(segments))):
+                logger.info(f"   {segment.name}: {len(segment_rows)} partidas")
+                _merge_segment(rows, segment_rows)
+
+    parsed_at = time.perf_counter()
+    new_count, updated_count = write_rows(rows)
+    finished_at = time.perf_counter()
+
+    stats = {
+        "segments": len(segments),
+        "matches": len(rows),
+        "matches_new": new_count,
+        "matches_updated": updated_count,
+        "parse_seconds": round(parsed_at - started, 2),
+        "write_seconds": round(finished_at - parsed_at, 2)
+    }
+
+    logger.info(
+        f"✅ Backfill concluído: {stats['matches']} partidas ({new_count} novas, {updated_count} atualizadas) "
+        f"| parse {stats['parse_seconds']}s | gravação {stats['write_seconds']}s"
+    )
+
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocessa o arquivo bruto da RapidAPI sem gastar cota")
+    parser.add_argument("start", type=date.fromisoformat, help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("end", type=date.fromisoformat, nargs="?", help="Último dia (padrão: start)")
+    parser.add_argument("--endpoint", choices=["all", *ENDPOINTS], default="all")
+    parser.add_argument("--workers", type=int, default=None, help="Processos de parse (padrão: CPUs)")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    init_db()
+    run_backfill(
+        args.start,
+        args.end or args.start,
+        endpoints=None if args.endpoint == "all" else [args.endpoint],
+        workers=args.workers
+    )
@@ -0,0 +1,272 @@
+"""
+Benchmark de latência da API sob carga concorrente (p50/p95/p99)
+Sobe o web_api com uvicorn (um processo, como em produção) sobre um SQLite
+temporário com partidas sintéticas (check_query_plans.seed_database) e
+dispara clientes concorrentes por N segundos:
+
+- pesadas: /api/analytics/overview, /api/stats, /api/export/csv, /api/matches
+- leves: /api/matches/{id} e /api/predictions/stats (sem banco)
+
+As leves mostram o quanto as pesadas seguram o event loop: uma sessão
+síncrona dentro de um handler async trava todas as outras requisições do
+processo enquanto a consulta roda.
+
+--app-dir aponta para outra cópia do repositório (ex.: git worktree de um
+commit anterior) para medir antes/depois com a mesma carga. O resultado vai
+para benchmark_results/api_AAAAMMDD_HHMMSS.json.
+
+Uso:
+    python benchmark_api.py
+    python benchmark_api.py --matches 100000 --seconds 30 --heavy 8 --light 16
+    git worktree add /tmp/antes <commit> && python benchmark_api.py --app-dir /tmp/antes
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+BASE_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BASE_DIR / "benchmark_results"
+
+HEAVY_ENDPOINTS = [
+    "/api/analytics/overview",
+    "/api/stats",
+    "/api/export/csv?limit=1000",
+    "/api/matches?status=finished&limit=500",
+]
+LIGHT_ENDPOINTS = [
+    "/api/matches/{id}",
+    "/api/predictions/stats",
+]
+
+# Roda com cwd=--app-dir: importa o database/seed daquela cópia do código
+SEED_SCRIPT = (
+    "import sys\n"
+    "from database_rapidapi import init_db\n"
+    "from check_query_plans import seed_database\n"
+    "init_db()\n"
+    "seed_database(int(sys.argv[1]))\n"
+)
+
+
+def _server_env(workdir: Path) -> Dict[str, str]:
+    """Banco temporário e API externa desligada (o scheduler não coleta nada)"""
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir / 'api.db'}",
+        RAPIDAPI_LIMITER_DB=str(workdir / "limiter.db"),
+        RAPIDAPI_BASE_URL="http://127.0.0.1:9",
+        RAPIDAPI_MAX_RETRIES="0",
+        RAPIDAPI_CACHE_ENABLED="False",
+        RAW_ARCHIVE_ENABLED="False",
+        SCHEDULER_ADAPTIVE="False",
+        PYTHONUNBUFFERED="1"
+    )
+
+
+def _git_commit(app_dir: Path) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=app_dir, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista já ordenada"""
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples: List[float], errors: int, seconds: float) -> Dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / seconds, 1),
+        "p50_ms": round(_percentile(ordered, 50), 1),
+        "p95_ms": round(_percentile(ordered, 95), 1),
+        "p99_ms": round(_percentile(ordered, 99), 1),
+        "max_ms": round(ordered[-1], 1)
+    }
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout: float) -> None:
+    """Espera o startup do web_api (init_db, validação inicial) terminar"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn encerrou na inicialização (código {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"{base_url}/", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"API não respondeu em {timeout:.0f}s")
+
+
+async def _client(session: aiohttp.ClientSession, base_url: str, endpoints: List[str],
+                  results: Dict[str, Dict], deadline: float, rng: random.Random, matches: int):
+    """Um cliente: requisições em sequência, alternando entre os endpoints"""
+    i = rng.randrange(len(endpoints))
+    while time.perf_counter() < deadline:
+        endpoint = endpoints[i % len(endpoints)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with session.get(base_url + endpoint.format(id=rng.randint(1, matches))) as resp:
+                await resp.read()
+                ok = resp.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+
+        if ok:
+            results[endpoint]["samples"].append((time.perf_counter() - start) * 1000)
+        else:
+            results[endpoint]["errors"] += 1
+
+
+async def run_load(base_url: str, seconds: float, heavy: int, light: int,
+                   matches: int, seed: int = 42) -> Dict[str, Dict]:
+    """Dispara os clientes pesados e leves juntos; {endpoint: {"samples", "errors"}}"""
+    results = {endpoint: {"samples": [], "errors": 0} for endpoint in HEAVY_ENDPOINTS + LIGHT_ENDPOINTS}
+    rng = random.Random(seed)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), timeout=timeout) as session:
+        # Aquecimento: cache do SQLite e primeira importação/compilação das consultas
+        for endpoint in HEAVY_ENDPOINTS + LIGHT_ENDPOINTS:
+            async with session.get(base_url + endpoint.format(id=1)) as resp:
+                await resp.read()
+
+        deadline = time.perf_counter() + seconds
+        clients = [
+            _client(session, base_url, HEAVY_ENDPOINTS, results, deadline, random.Random(rng.random()), matches)
+            for _ in range(heavy)
+        ] + [
+            _client(session, base_url, LIGHT_ENDPOINTS, results, deadline, random.Random(rng.random()), matches)
+            for _ in range(light)
+        ]
+        await asyncio.gather(*clients)
+    return results
+
+
+def run_benchmark(app_dir: Path, matches: int = 50_000, seconds: float = 20, heavy: int = 4,
+                  light: int = 16, port: int = 8791, workdir: Optional[Path] = None,
+                  keep_db: bool = False) -> Dict:
+    app_dir = app_dir.resolve()
+    own_workdir = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="bench_api_")) if own_workdir else workdir
+    workdir.mkdir(parents=True, exist_ok=True)
+    env = _server_env(workdir)
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"🗄️ Criando banco com {matches} partidas em {workdir}...")
+    subprocess.run([sys.executable, "-c", SEED_SCRIPT, str(matches)], cwd=app_dir, env=env, check=True)
+
+    log_file = open(workdir / "server.log", "w", encoding="utf-8")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "web_api:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=app_dir, env=env, stdout=log_file, stderr=subprocess.STDOUT
+    )
+    try:
+        _wait_ready(base_url, proc, timeout=180)
+        print(f"🚀 Carga: {heavy} clientes pesados + {light} leves por {seconds:.0f}s...")
+        results = asyncio.run(run_load(base_url, seconds, heavy, light, matches))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log_file.close()
+        if own_workdir and not keep_db:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _group(endpoints: List[str]) -> Dict:
+        samples = [value for endpoint in endpoints for value in results[endpoint]["samples"]]
+        return summarize(samples, sum(results[endpoint]["errors"] for endpoint in endpoints), seconds)
+
+    return {
+        "_git_commit": _git_commit(app_dir),
+        "_generated_at": datetime.now().isoformat(timespec="seconds"),
+        "app_dir": str(app_dir),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"matches": matches, "seconds": seconds, "heavy_clients": heavy, "light_clients": light},
+        "heavy": _group(HEAVY_ENDPOINTS),
+        "light": _group(LIGHT_ENDPOINTS),
+        "endpoints": {
+            endpoint: summarize(result["samples"], result["errors"], seconds)
+            for endpoint, result in results.items()
+        }
+    }
+
+
+def print_summary(report: Dict):
+    print(f"\n📊 {report['config']['matches']} partidas | commit {report['_git_commit']}")
+    print(f"{'grupo/endpoint':<42} | {'req':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'erros':>5}")
+    print("-" * 90)
+    rows = [("PESADAS", report["heavy"]), ("LEVES", report["light"])] + list(report["endpoints"].items())
+    for name, summary in rows:
+        if not summary["requests"]:
+            print(f"{name:<42} | {0:>6} | {'-':>8} | {'-':>8} | {'-':>8} | {summary['errors']:>5}")
+            continue
+        print(
+            f"{name:<42} | {summary['requests']:>6} | {summary['p50_ms']:>8} | "
+            f"{summary['p95_ms']:>8} | {summary['p99_ms']:>8} | {summary['errors']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de latência (p99) da API sob carga concorrente")
+    parser.add_argument("--app-dir", type=Path, default=BASE_DIR, help="Cópia do repositório a medir")
+    parser.add_argument("--matches", type=int, default=50_000, help="Partidas sintéticas no banco")
+    parser.add_argument("--seconds", type=float, default=20, help="Duração da carga")
+    parser.add_argument("--heavy", type=int, default=4, help="Clientes nos endpoints pesados")
+    parser.add_argument("--light", type=int, default=16, help="Clientes nos endpoints leves")
+    parser.add_argument("--port", type=int, default=8791, help="Porta do uvicorn")
+    parser.add_argument("--output", type=Path, default=None, help="Arquivo JSON de saída")
+    parser.add_argument("--workdir", type=Path, default=None, help="Pasta do banco temporário")
+    parser.add_argument("--keep-db", action="store_true", help="Não apaga o banco temporário")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.app_dir,
+        matches=args.matches,
+        seconds=args.seconds,
+        heavy=args.heavy,
+        light=args.light,
+        port=args.port,
+        workdir=args.workdir,
+        keep_db=args.keep_db
+    )
+
+    output = args.output or RESULTS_DIR / f"api_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print_summary(report)
+    print(f"\n📄 Resultados: {output}")
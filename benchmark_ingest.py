@@ -0,0 +1,428 @@
+"""
+Benchmark de ingestão (offline) do scraper e do coletor de resultados
+Mede como RapidAPIScraper.scrape_league e ResultsCollector.collect_league_results
+escalam conforme o banco cresce (padrão: 10k, 100k e 1M partidas já gravadas).
+
+Os payloads são sintetizados a partir dos fixtures rapidapi_*.json (os mesmos
+do mock_rapidapi_server.py) e entregues por um cliente falso: nenhuma
+requisição é feita. O banco é um SQLite temporário, nunca o bet365_rapidapi.db.
+
+Para cada tamanho:
+- parse: prepare_league_payload (sem banco), partidas/s
+- upsert_new / upsert_update: scrape_league com partidas novas / odds alteradas
+- results: collect_league_results aplicando placares das partidas pendentes
+- db_file: crescimento do arquivo do banco durante a rodada
+
+O resultado vai para benchmark_results/ingest_AAAAMMDD_HHMMSS.json para
+comparar execuções ao longo do tempo.
+
+Uso:
+    python benchmark_ingest.py
+    python benchmark_ingest.py --sizes 10000 100000 --payload 200 --cycles 10
+    python benchmark_ingest.py --output benchmark_results/antes.json --keep-db
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Benchmark offline: sem arquivo bruto nem cache de respostas em disco
+os.environ.setdefault("RAW_ARCHIVE_ENABLED", "False")
+os.environ.setdefault("RAPIDAPI_CACHE_ENABLED", "False")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from models_rapidapi import Base, Match
+from scraper_rapidapi import RapidAPIScraper
+from results_collector import ResultsCollector
+from mock_rapidapi_server import load_templates, load_result_template
+
+BASE_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BASE_DIR / "benchmark_results"
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+LEAGUE = "euro"
+
+# Faixas de IDs (external_id) para não colidir entre seed e rodadas
+SEED_ID_BASE = 10_000_000
+BENCH_ID_BASE = 90_000_000
+
+SEED_BATCH = 5000
+
+logger = logging.getLogger(__name__)
+
+
+class FixtureClient:
+    """Substitui o RapidAPIClient: devolve os payloads preparados pelo benchmark"""
+
+    def __init__(self):
+        self.next_matches: Optional[Dict] = None
+        self.matches: Optional[Dict] = None
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+
+    def get_next_matches(self, league: str = LEAGUE, **kwargs) -> Optional[Dict]:
+        self.stats["requests"] += 1
+        return self.next_matches
+
+    def get_matches(self, league: str = LEAGUE, **kwargs) -> Optional[Dict]:
+        self.stats["requests"] += 1
+        return self.matches
+
+
+class PayloadFactory:
+    """Gera partidas e resultados realistas a partir dos fixtures"""
+
+    def __init__(self, seed: int = 42):
+        self.templates = load_templates()[LEAGUE]
+        self.result_template = load_result_template()
+        self.seed = seed
+        self.kickoff = datetime.now()
+
+    def match(self, match_id: int, version: int = 0) -> Dict:
+        """Partida de /next-matchs; version muda as odds (simula nova coleta)"""
+        template = self.templates[match_id % len(self.templates)]
+        kickoff = self.kickoff + timedelta(minutes=match_id % 1440)
+
+        odds = template.get("odds", {})
+        if version:
+            rng = random.Random(f"{self.seed}:{match_id}:{version}")
+            odds = {
+                key: f"{float(value) * (1 + rng.uniform(-0.05, 0.05)):.2f}"
+                for key, value in odds.items()
+            }
+
+        return {
+            "id": str(match_id),
+            "hora": f"{kickoff.hour:02d}",
+            "minuto": f"{kickoff.minute:02d}",
+            "competition": LEAGUE,
+            "timeA": template.get("timeA"),
+            "timeB": template.get("timeB"),
+            "horario": f"{kickoff.hour:02d}.{kickoff.minute:02d}",
+            "odds": dict(odds)
+        }
+
+    def result(self, match_id: int) -> Dict:
+        """Resultado de /matchs para a partida"""
+        rng = random.Random(f"{self.seed}:{match_id}:result")
+        goals_home, goals_away = rng.randint(0, 4), rng.randint(0, 3)
+        match = self.match(match_id)
+
+        result = dict(self.result_template)
+        result.update({
+            "id": match["id"],
+            "hora": match["hora"],
+            "minuto": match["minuto"],
+            "horario": match["horario"],
+            "timeA": match["timeA"],
+            "timeB": match["timeB"],
+            "odds": match["odds"],
+            "resultado": f"{goals_home}-{goals_away}",
+            "resultadoFt": f"{goals_home}-{goals_away}",
+            "resultadoHt": f"{min(goals_home, 1)}-{min(goals_away, 1)}"
+        })
+        return result
+
+    def next_matches_payload(self, ids: range, version: int = 0) -> Dict:
+        matchs = [self.match(match_id, version) for match_id in ids]
+        return {"status": True, "returned_matchs": len(matchs), "league": LEAGUE, "matchs": matchs}
+
+    def results_payload(self, ids: range) -> Dict:
+        matchs = [self.result(match_id) for match_id in ids]
+        return {"status": True, "returned_matchs": len(matchs), "league": LEAGUE, "matchs": matchs}
+
+
+def seed_matches(
+    session_factory: Callable[[], Session],
+    scraper: RapidAPIScraper,
+    factory: PayloadFactory,
+    start: int,
+    end: int
+) -> float:
+    """
+    Grava partidas históricas [start, end) direto via INSERT em lote
+
+    ~90% finalizadas (com placar) e ~10% ainda agendadas, como um banco real.
+
+    Returns:
+        Segundos gastos
+    """
+    started = time.perf_counter()
+    base_rows = [
+        scraper._extract_match_data(factory.match(index), LEAGUE)
+        for index in range(len(factory.templates))
+    ]
+    now = datetime.now()
+
+    db = session_factory()
+    try:
+        for batch_start in range(start, end, SEED_BATCH):
+            rows = []
+            for index in range(batch_start, min(end, batch_start + SEED_BATCH)):
+                row = dict(base_rows[index % len(base_rows)])
+                row["external_id"] = str(SEED_ID_BASE + index)
+                row["scraped_at"] = now - timedelta(minutes=end - index)
+                if index % 10:
+                    goals_home, goals_away = index % 4, index % 3
+                    row.update({
+                        "goals_home": goals_home,
+                        "goals_away": goals_away,
+                        "total_goals": goals_home + goals_away,
+                        "result": "home" if goals_home > goals_away else ("away" if goals_away > goals_home else "draw"),
+                        "status": "finished"
+                    })
+                rows.append(row)
+            db.execute(insert(Match), rows)
+            db.commit()
+    finally:
+        db.close()
+
+    return time.perf_counter() - started
+
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+def _timing(count: int, seconds: float, calls: int, **extra) -> Dict:
+    return {
+        "rows": count,
+        "calls": calls,
+        "seconds": round(seconds, 4),
+        "ms_per_call": round(seconds / calls * 1000, 2) if calls else None,
+        "rows_per_sec": _rate(count, seconds),
+        **extra
+    }
+
+
+def bench_level(
+    session_factory: Callable[[], Session],
+    db_path: Path,
+    scraper: RapidAPIScraper,
+    collector: ResultsCollector,
+    factory: PayloadFactory,
+    existing: int,
+    payload_size: int,
+    cycles: int,
+    id_base: int
+) -> Dict:
+    """
+    Mede parse, upsert e aplicação de resultados com o banco no tamanho atual
+
+    Cada ciclo usa um payload de payload_size partidas de IDs novos.
+    """
+    client = FixtureClient()
+    scraper.client = client
+    collector.client = client
+
+    file_before = db_path.stat().st_size
+    batches = [range(id_base + c * payload_size, id_base + (c + 1) * payload_size) for c in range(cycles)]
+
+    # Parse (sem banco)
+    payloads = [factory.next_matches_payload(ids) for ids in batches]
+    started = time.perf_counter()
+    for payload in payloads:
+        scraper.prepare_league_payload(LEAGUE, payload)
+    parse_seconds = time.perf_counter() - started
+
+    def _run(payload_for: Callable[[range], Dict], call: Callable[[Session], tuple]) -> tuple:
+        seconds = 0.0
+        totals = None
+        for ids in batches:
+            client.next_matches = client.matches = payload_for(ids)
+            db = session_factory()
+            try:
+                started = time.perf_counter()
+                result = call(db)
+                seconds += time.perf_counter() - started
+            finally:
+                db.close()
+            totals = result if totals is None else tuple(a + b for a, b in zip(totals, result))
+        return seconds, totals
+
+    # Partidas novas
+    new_seconds, (_, new_count, _, _) = _run(
+        factory.next_matches_payload,
+        lambda db: scraper.scrape_league(LEAGUE, db)
+    )
+
+    # Mesmas partidas com odds alteradas (fingerprint muda -> UPDATE + histórico)
+    update_seconds, (_, _, updated_count, _) = _run(
+        lambda ids: factory.next_matches_payload(ids, version=1),
+        lambda db: scraper.scrape_league(LEAGUE, db)
+    )
+
+    # Placares das partidas pendentes
+    results_seconds, (results_found, results_applied) = _run(
+        factory.results_payload,
+        lambda db: collector.collect_league_results(LEAGUE, db)
+    )
+
+    file_after = db_path.stat().st_size
+    ingested = new_count
+
+    return {
+        "existing_matches": existing,
+        "parse": _timing(payload_size * cycles, parse_seconds, cycles),
+        "upsert_new": _timing(new_count, new_seconds, cycles),
+        "upsert_update": _timing(updated_count, update_seconds, cycles),
+        "results": _timing(results_applied, results_seconds, cycles, found=results_found),
+        "db_file": {
+            "bytes_before": file_before,
+            "bytes_after": file_after,
+            "growth_bytes": file_after - file_before,
+            "bytes_per_new_match": round((file_after - file_before) / ingested, 1) if ingested else None
+        }
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(
+    sizes: List[int],
+    payload_size: int = 100,
+    cycles: int = 5,
+    workdir: Optional[Path] = None,
+    keep_db: bool = False,
+    seed: int = 42
+) -> Dict:
+    """
+    Executa o benchmark para cada tamanho de banco (em ordem crescente)
+
+    O mesmo banco temporário cresce de um tamanho para o próximo.
+
+    Returns:
+        Resultados (também gravados em JSON pelo __main__)
+    """
+    sizes = sorted(sizes)
+    # Só a pasta criada aqui é apagada no fim; numa --workdir do usuário, só o banco
+    own_workdir = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="bench_ingest_")) if own_workdir else Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    db_path = workdir / "bench_rapidapi.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    scraper = RapidAPIScraper()
+    collector = ResultsCollector()
+    factory = PayloadFactory(seed)
+
+    report = {
+        "benchmark": "ingest",
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": {"sizes": sizes, "payload_size": payload_size, "cycles": cycles, "league": LEAGUE, "seed": seed},
+        "levels": []
+    }
+
+    seeded = 0
+    try:
+        for level, size in enumerate(sizes):
+            logger.info(f"🌱 Semeando banco até {size} partidas...")
+            seed_seconds = seed_matches(session_factory, scraper, factory, seeded, size)
+            seeded = size
+
+            logger.info(f"⏱️  Medindo com {size} partidas no banco...")
+            result = bench_level(
+                session_factory, db_path, scraper, collector, factory,
+                existing=size, payload_size=payload_size, cycles=cycles,
+                id_base=BENCH_ID_BASE + level * payload_size * cycles
+            )
+            result["seed_seconds"] = round(seed_seconds, 2)
+            report["levels"].append(result)
+
+            logger.info(
+                f"   parse {result['parse']['rows_per_sec']}/s | novas {result['upsert_new']['rows_per_sec']}/s | "
+                f"atualizadas {result['upsert_update']['rows_per_sec']}/s | resultados {result['results']['rows_per_sec']}/s | "
+                f"+{result['db_file']['growth_bytes'] / 1024:.0f} KB"
+            )
+    finally:
+        engine.dispose()
+        if keep_db:
+            logger.info(f"💾 Banco mantido em {db_path}")
+        elif own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    report["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return report
+
+
+def print_summary(report: Dict):
+    header = f"{'partidas':>10} | {'parse/s':>10} | {'novas/s':>9} | {'atualiz./s':>10} | {'result./s':>9} | {'ms/ciclo':>8} | {'KB':>7}"
+    print("\n" + header)
+    print("-" * len(header))
+    for level in report["levels"]:
+        print(
+            f"{level['existing_matches']:>10} | {level['parse']['rows_per_sec']:>10} | "
+            f"{level['upsert_new']['rows_per_sec']:>9} | {level['upsert_update']['rows_per_sec']:>10} | "
+            f"{level['results']['rows_per_sec']:>9} | {level['upsert_new']['ms_per_call']:>8} | "
+            f"{level['db_file']['growth_bytes'] / 1024:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline da ingestão (scraper + resultados)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Partidas já gravadas no banco")
+    parser.add_argument("--payload", type=int, default=100, help="Partidas por payload de liga")
+    parser.add_argument("--cycles", type=int, default=5, help="Payloads medidos por tamanho")
+    parser.add_argument("--output", type=Path, default=None, help="Arquivo JSON de saída")
+    parser.add_argument("--workdir", type=Path, default=None, help="Pasta do banco temporário")
+    parser.add_argument("--keep-db", action="store_true", help="Não apaga o banco temporário")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos payloads sintéticos")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    # Logs por liga do scraper/coletor poluem a medição
+    for name in ("scraper_rapidapi", "results_collector", "incremental_sync"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = run_benchmark(
+        args.sizes,
+        payload_size=args.payload,
+        cycles=args.cycles,
+        workdir=args.workdir,
+        keep_db=args.keep_db,
+        seed=args.seed
+    )
+
+    output = args.output or RESULTS_DIR / f"ingest_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print_summary(report)
+    print(f"\n📄 Resultados: {output}")
@@ -0,0 +1,323 @@
+"""
+Benchmark de concorrência do SQLite: perfil padrão x perfil ajustado
+Simula o uso real do bet365_rapidapi.db por vários processos ao mesmo tempo
+(web_api + scheduler, subprocesso do /api/scraper/start, auto_scheduler):
+processos escritores gravam lotes de partidas (bulk_upsert + commit) enquanto
+processos leitores repetem as consultas da API.
+
+Cada perfil roda em um SQLite temporário novo (nunca o bet365_rapidapi.db):
+- padrao: SQLITE_TUNED=False (journal DELETE, synchronous FULL, sem busy_timeout
+  além dos 5s do driver sqlite3)
+- ajustado: SQLITE_TUNED=True (SQLITE_PRAGMAS do database_rapidapi)
+
+Mede latência de commit (p50/p99/máx), transações/s, erros "database is locked"
+e latência das leituras. O resultado vai para benchmark_results/sqlite_*.json.
+
+Uso:
+    python benchmark_sqlite.py
+    python benchmark_sqlite.py --writers 4 --readers 8 --seconds 30
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmark_ingest import RESULTS_DIR, _git_commit
+
+PROFILES = {"padrao": "False", "ajustado": "True"}
+LEAGUES = ["express", "copa", "super", "euro", "premier"]
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 2)
+
+
+def _match_row(match_id: int, now: datetime, rng: random.Random) -> Dict:
+    kickoff = now + timedelta(minutes=rng.randint(1, 60))
+    return {
+        "external_id": str(match_id),
+        "league": rng.choice(LEAGUES),
+        "team_home": f"Time {rng.randint(1, 40)}",
+        "team_away": f"Time {rng.randint(1, 40)}",
+        "hour": f"{kickoff.hour:02d}",
+        "minute": f"{kickoff.minute:02d}",
+        "scheduled_time": f"{kickoff.hour:02d}.{kickoff.minute:02d}",
+        "odd_home": round(rng.uniform(1.2, 6), 2),
+        "odd_draw": round(rng.uniform(2.5, 5), 2),
+        "odd_away": round(rng.uniform(1.2, 6), 2),
+        "status": "scheduled",
+        "scraped_at": now
+    }
+
+
+def _seed(existing: int):
+    """Cria as tabelas e grava as partidas iniciais (processo filho, com o perfil da rodada)"""
+    from sqlalchemy import insert
+    from database_rapidapi import engine
+    from models_rapidapi import Base, Match
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    now = datetime.now()
+    with engine.begin() as conn:
+        for start in range(0, existing, 5000):
+            conn.execute(insert(Match), [
+                _match_row(match_id, now, rng) for match_id in range(start, min(existing, start + 5000))
+            ])
+    engine.dispose()
+
+
+def _writer(worker: int, seconds: float, batch: int, existing: int, queue):
+    """Lê e grava lotes de partidas (metade novas, metade atualizadas) até o tempo acabar"""
+    from sqlalchemy.exc import OperationalError
+    from database_rapidapi import SessionLocal, bulk_upsert
+    from models_rapidapi import Match
+
+    rng = random.Random(worker)
+    next_id = 10_000_000 * (worker + 1)
+    latencies, locked, other_errors = [], 0, 0
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        now = datetime.now()
+        rows = [_match_row(rng.randrange(existing), now, rng) for _ in range(batch // 2)]
+        rows += [_match_row(next_id + i, now, rng) for i in range(batch - len(rows))]
+        next_id += batch
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            # Como write_league_payload: lê os fingerprints e grava na mesma transação
+            db.query(Match.external_id, Match.fingerprint).filter(
+                Match.external_id.in_([row["external_id"] for row in rows])
+            ).all()
+            bulk_upsert(db, Match, rows, "external_id", keep_on_update=("scraped_at",))
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            db.rollback()
+            if "locked" in str(e) or "busy" in str(e):
+                locked += 1
+            else:
+                other_errors += 1
+        finally:
+            db.close()
+
+        time.sleep(0.01)
+
+    queue.put({"role": "writer", "latencies": latencies, "locked": locked, "errors": other_errors})
+
+
+def _reader(worker: int, seconds: float, queue):
+    """Repete as leituras típicas da API (pendentes por liga, últimas partidas, estatísticas)"""
+    from sqlalchemy import func
+    from sqlalchemy.exc import OperationalError
+    from database_rapidapi import SessionLocal
+    from models_rapidapi import Match
+
+    latencies, locked, other_errors = [], 0, 0
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.query(Match.league, func.count(Match.id)).filter(Match.result.is_(None)).group_by(Match.league).all()
+            db.query(Match.id, Match.team_home, Match.team_away, Match.odd_home).order_by(
+                Match.scraped_at.desc()
+            ).limit(100).all()
+            # Agregado com varredura completa (como /api/stats e /api/analytics)
+            db.query(Match.status, func.count(Match.id), func.avg(Match.odd_home)).group_by(Match.status).all()
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            db.rollback()
+            if "locked" in str(e) or "busy" in str(e):
+                locked += 1
+            else:
+                other_errors += 1
+        finally:
+            db.close()
+
+        time.sleep(0.005)
+
+    queue.put({"role": "reader", "latencies": latencies, "locked": locked, "errors": other_errors})
+
+
+def bench_profile(
+    name: str,
+    workdir: Path,
+    writers: int,
+    readers: int,
+    seconds: float,
+    batch: int,
+    existing: int
+) -> Dict:
+    """Roda escritores e leitores concorrentes em um banco novo com o perfil indicado"""
+    db_path = workdir / f"bench_sqlite_{name}.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    # Processos filhos (spawn) herdam o ambiente: cada um cria seu engine com o perfil
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["SQLITE_TUNED"] = PROFILES[name]
+
+    ctx = multiprocessing.get_context("spawn")
+    seeder = ctx.Process(target=_seed, args=(existing,))
+    seeder.start()
+    seeder.join()
+
+    queue = ctx.Queue()
+    processes = [ctx.Process(target=_writer, args=(i, seconds, batch, existing, queue)) for i in range(writers)]
+    processes += [ctx.Process(target=_reader, args=(i, seconds, queue)) for i in range(readers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    def _summary(role: str) -> Dict:
+        latencies = [ms for r in results if r["role"] == role for ms in r["latencies"]]
+        locked = sum(r["locked"] for r in results if r["role"] == role)
+        return {
+            "ok": len(latencies),
+            "per_sec": round(len(latencies) / seconds, 1),
+            "locked_errors": locked,
+            "other_errors": sum(r["errors"] for r in results if r["role"] == role),
+            "locked_pct": round(100 * locked / (len(latencies) + locked), 2) if latencies or locked else 0.0,
+            "p50_ms": _percentile(latencies, 50),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": round(max(latencies), 2) if latencies else None
+        }
+
+    with sqlite3.connect(db_path) as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    return {"profile": name, "journal_mode": journal_mode, "writes": _summary("writer"), "reads": _summary("reader")}
+
+
+def run_benchmark(
+    writers: int = 3,
+    readers: int = 4,
+    seconds: float = 20,
+    batch: int = 50,
+    existing: int = 20_000,
+    workdir: Optional[Path] = None,
+    keep_db: bool = False
+) -> Dict:
+    """
+    Executa os dois perfis com a mesma carga
+
+    Returns:
+        Resultados (também gravados em JSON pelo __main__)
+    """
+    # Só a pasta criada aqui é apagada no fim; numa --workdir do usuário, só os bancos
+    own_workdir = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="bench_sqlite_")) if own_workdir else Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        "benchmark": "sqlite",
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": {
+            "writers": writers, "readers": readers, "seconds": seconds,
+            "batch": batch, "existing": existing
+        },
+        "profiles": []
+    }
+
+    try:
+        for name in PROFILES:
+            logger.info(f"⏱️  Perfil {name}: {writers} escritores + {readers} leitores por {seconds:.0f}s...")
+            result = bench_profile(name, workdir, writers, readers, seconds, batch, existing)
+            report["profiles"].append(result)
+            logger.info(
+                f"   commits {result['writes']['per_sec']}/s | p99 {result['writes']['p99_ms']} ms | "
+                f"locked {result['writes']['locked_errors'] + result['reads']['locked_errors']}"
+            )
+    finally:
+        if keep_db:
+            logger.info(f"💾 Bancos mantidos em {workdir}")
+        elif own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            for name in PROFILES:
+                db_path = workdir / f"bench_sqlite_{name}.db"
+                for suffix in ("", "-wal", "-shm", "-journal"):
+                    Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    report["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return report
+
+
+def print_summary(report: Dict):
+    header = (
+        f"{'perfil':>9} | {'journal':>7} | {'commits/s':>9} | {'p50 ms':>7} | {'p99 ms':>8} | "
+        f"{'máx ms':>8} | {'locked':>6} | {'leituras/s':>10} | {'leit. p99':>9}"
+    )
+    print("\n" + header)
+    print("-" * len(header))
+    for result in report["profiles"]:
+        writes, reads = result["writes"], result["reads"]
+        print(
+            f"{result['profile']:>9} | {result['journal_mode']:>7} | {writes['per_sec']:>9} | "
+            f"{writes['p50_ms']!s:>7} | {writes['p99_ms']!s:>8} | {writes['max_ms']!s:>8} | "
+            f"{writes['locked_errors'] + reads['locked_errors']:>6} | {reads['per_sec']:>10} | {reads['p99_ms']!s:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência do SQLite (perfil padrão x ajustado)")
+    parser.add_argument("--writers", type=int, default=3, help="Processos gravando ao mesmo tempo")
+    parser.add_argument("--readers", type=int, default=4, help="Processos lendo ao mesmo tempo")
+    parser.add_argument("--seconds", type=float, default=20, help="Duração de cada perfil")
+    parser.add_argument("--batch", type=int, default=50, help="Partidas por commit")
+    parser.add_argument("--existing", type=int, default=20_000, help="Partidas já gravadas no banco")
+    parser.add_argument("--output", type=Path, default=None, help="Arquivo JSON de saída")
+    parser.add_argument("--workdir", type=Path, default=None, help="Pasta dos bancos temporários")
+    parser.add_argument("--keep-db", action="store_true", help="Não apaga os bancos temporários")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    report = run_benchmark(
+        writers=args.writers,
+        readers=args.readers,
+        seconds=args.seconds,
+        batch=args.batch,
+        existing=args.existing,
+        workdir=args.workdir,
+        keep_db=args.keep_db
+    )
+
+    output = args.output or RESULTS_DIR / f"sqlite_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print_summary(report)
+    print(f"\n📄 Resultados: {output}")
@@ -0,0 +1,310 @@
+"""
+Confere o plano (EXPLAIN QUERY PLAN) das consultas quentes da API
+Cada consulta abaixo reproduz a de um endpoint/script. O check falha (saída 1)
+se alguma cair em varredura completa da tabela matches:
+
+- "SCAN matches" sem índice: sempre falha
+- "SCAN matches USING [COVERING] INDEX" de um índice não parcial: só é aceito
+  quando marcado (allow_index_scan): agregados sobre a tabela toda, onde varrer
+  um índice estreito é o melhor possível, e ORDER BY + LIMIT pelo próprio
+  índice, que para no LIMIT
+- "SCAN matches" sem índice em consulta ORDER BY id + LIMIT (ordered_limit): só
+  é aceito se o plano não ordena à parte (sem "TEMP B-TREE FOR ORDER BY"), ou
+  seja, percorre a tabela na ordem do rowid e para no LIMIT. Com a maioria das
+  linhas atendendo o filtro, o planejador empata isso com a varredura do
+  índice parcial e escolhe um ou outro pela ordem de criação dos índices
+- SEARCH (busca por índice) e varredura de índice parcial: ok
+
+Por padrão roda em um SQLite temporário com partidas sintéticas e ANALYZE
+(o planejador decide com estatísticas, como em produção). --current-db usa
+o banco configurado (DATABASE_URL).
+
+Uso:
+    python check_query_plans.py
+    python check_query_plans.py --current-db
+    python check_query_plans.py --matches 50000
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+LEAGUES = ["express", "copa", "super", "euro", "premier"]
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    statement: object
+    allow_index_scan: bool = False
+    ordered_limit: bool = False
+
+
+def build_checks() -> List[PlanCheck]:
+    """Consultas dos endpoints (mesmos filtros/ordenação do web_api e scripts)"""
+    from sqlalchemy import select, update, func, desc, or_, and_
+    from sqlalchemy.sql import case
+    from models_rapidapi import Match
+    from match_status import OPEN_STATUSES
+    from match_time import utc_now
+
+    now = utc_now()
+
+    unscored = or_(Match.goals_home.is_(None), Match.goals_away.is_(None))
+    scored = and_(Match.goals_home.isnot(None), Match.goals_away.isnot(None))
+
+    return [
+        PlanCheck(
+            "validate_predictions (com resultado)",
+            select(Match).where(Match.result.isnot(None), Match.status == "finished")
+        ),
+        PlanCheck(
+            "/api/analytics/overview (acerto do vencedor)",
+            select(
+                func.count(Match.id),
+                func.sum(case((case(
+                    (and_(Match.odd_home <= Match.odd_draw, Match.odd_home <= Match.odd_away), "home"),
+                    (Match.odd_away <= Match.odd_draw, "away"),
+                    else_="draw"
+                ) == Match.result, 1), else_=0))
+            ).where(Match.result.isnot(None), Match.status == "finished")
+        ),
+        PlanCheck(
+            "/api/analytics/overview (finalizadas)",
+            select(func.count()).select_from(Match).where(Match.status == "finished")
+        ),
+        PlanCheck(
+            "/api/analytics/overview (por liga)",
+            select(
+                Match.league,
+                func.count(Match.id),
+                func.sum(case((Match.status == "finished", 1), else_=0))
+            ).group_by(Match.league),
+            allow_index_scan=True
+        ),
+        PlanCheck(
+            "/api/matches?status=scheduled",
+            select(Match).where(unscored).order_by(Match.id.desc()).limit(2000)
+        ),
+        PlanCheck(
+            "/api/matches?status=finished",
+            select(Match).where(scored).order_by(Match.id.desc()).limit(2000),
+            ordered_limit=True
+        ),
+        PlanCheck(
+            "/api/matches?league=&status=scheduled",
+            select(Match).where(Match.league == "euro", unscored).order_by(Match.id.desc()).limit(2000)
+        ),
+        PlanCheck(
+            "/api/predict",
+            select(Match).where(Match.hour == "21", Match.minute == "05").limit(1)
+        ),
+        PlanCheck(
+            "predict_match.py",
+            select(Match).where(
+                Match.hour == "21", Match.minute == "05", Match.status.in_(OPEN_STATUSES)
+            ).limit(1)
+        ),
+        PlanCheck(
+            "/api/recommendations, predict.py",
+            select(Match).where(Match.kickoff_at > now, Match.result.is_(None)).order_by(Match.kickoff_at).limit(50)
+        ),
+        PlanCheck(
+            "/api/stats (por liga e status)",
+            select(Match.league, Match.status, func.count(Match.id)).group_by(Match.league, Match.status),
+            allow_index_scan=True
+        ),
+        PlanCheck(
+            "/api/analytics/timeline",
+            select(func.date(Match.match_date).label("date"), func.count(Match.id)).group_by(
+                func.date(Match.match_date)
+            ).order_by("date"),
+            allow_index_scan=True
+        ),
+        PlanCheck(
+            "/api/export/csv",
+            select(Match).order_by(desc(Match.match_date)).limit(1000),
+            allow_index_scan=True
+        ),
+        PlanCheck(
+            "/api/export/csv?league=",
+            select(Match).where(Match.league == "euro").order_by(desc(Match.match_date)).limit(1000)
+        ),
+        PlanCheck(
+            "results_collector.pending_result_leagues",
+            select(Match.league, func.count(Match.id)).where(
+                Match.result.is_(None),
+                Match.league.in_(LEAGUES),
+                Match.kickoff_at.between(now - timedelta(hours=6), now)
+            ).group_by(Match.league)
+        ),
+        PlanCheck(
+            "poll_planner (próximas partidas)",
+            select(Match.league, func.count(Match.id), func.min(Match.kickoff_at)).where(
+                Match.league.in_(LEAGUES),
+                Match.kickoff_at > now
+            ).group_by(Match.league)
+        ),
+        PlanCheck(
+            "web_api.update_match_status_by_time",
+            select(Match).where(
+                Match.status.in_(["live", "expired"]),
+                Match.kickoff_at < now - timedelta(hours=2),
+                Match.result.is_(None)
+            ).order_by(Match.kickoff_at.desc())
+        ),
+        PlanCheck(
+            "match_status.refresh_match_statuses (live)",
+            update(Match).where(
+                Match.status == "scheduled",
+                Match.kickoff_at.between(now - timedelta(minutes=30), now + timedelta(hours=2))
+            ).values(status="live")
+        ),
+        PlanCheck(
+            "match_status.refresh_match_statuses (expired)",
+            update(Match).where(
+                Match.status.in_(["scheduled", "live"]),
+                Match.kickoff_at < now - timedelta(minutes=30),
+                unscored
+            ).values(status="expired")
+        ),
+        PlanCheck(
+            "clean_old_matches.py",
+            select(Match).where(Match.kickoff_at < now - timedelta(minutes=30)).order_by(Match.kickoff_at)
+        ),
+    ]
+
+
+def _partial_indexes() -> set:
+    from models_rapidapi import Match
+
+    return {
+        index.name for index in Match.__table__.indexes
+        if index.dialect_options["sqlite"].get("where") is not None
+    }
+
+
+def evaluate_plan(details: List[str], allow_index_scan: bool, partial: set, ordered_limit: bool = False) -> List[str]:
+    """Linhas do plano que configuram varredura completa de matches"""
+    sorts_apart = any("TEMP B-TREE FOR ORDER BY" in detail for detail in details)
+    problems = []
+    for detail in details:
+        match = re.match(r"SCAN (matches)\b(?: USING (?:COVERING )?INDEX (\w+))?", detail)
+        if match is None:
+            continue
+        index = match.group(2)
+        if index is None:
+            if not ordered_limit or sorts_apart:
+                problems.append(detail)
+        elif index not in partial and not allow_index_scan:
+            problems.append(detail)
+    return problems
+
+
+def seed_database(count: int, seed: int = 42):
+    """Partidas sintéticas (~90% finalizadas, como em produção) + ANALYZE"""
+    from sqlalchemy import insert, text
+    from database_rapidapi import engine
+    from models_rapidapi import Match
+
+    rng = random.Random(seed)
+    # Uma partida a cada 3 minutos; só as ~100 últimas ainda não começaram
+    start = datetime.utcnow() - timedelta(minutes=3 * (count - 100))
+    rows = []
+    for i in range(count):
+        kickoff = start + timedelta(minutes=3 * i)
+        finished = i < count * 0.9
+        goals_home, goals_away = (rng.randint(0, 4), rng.randint(0, 3)) if finished else (None, None)
+        rows.append({
+            "external_id": str(i),
+            "league": LEAGUES[i % len(LEAGUES)],
+            "team_home": f"Time {rng.randint(1, 40)}",
+            "team_away": f"Time {rng.randint(1, 40)}",
+            "hour": f"{kickoff.hour:02d}",
+            "minute": f"{kickoff.minute:02d}",
+            "scheduled_time": f"{kickoff.hour:02d}.{kickoff.minute:02d}",
+            "goals_home": goals_home,
+            "goals_away": goals_away,
+            "total_goals": goals_home + goals_away if finished else None,
+            "result": (("home" if goals_home > goals_away else "away" if goals_away > goals_home else "draw")
+                       if finished else None),
+            "odd_home": round(rng.uniform(1.2, 6), 2),
+            "odd_draw": round(rng.uniform(2.5, 5), 2),
+            "odd_away": round(rng.uniform(1.2, 6), 2),
+            "status": "finished" if finished else "scheduled",
+            "match_date": kickoff,
+            "kickoff_at": kickoff,
+            "scraped_at": kickoff - timedelta(minutes=30)
+        })
+
+    with engine.begin() as conn:
+        for i in range(0, len(rows), 2000):
+            conn.execute(insert(Match), rows[i:i + 2000])
+        conn.execute(text("ANALYZE"))
+
+
+def run_checks() -> Dict[str, Dict]:
+    """Roda EXPLAIN QUERY PLAN em cada consulta; {nome: {"plan", "problems"}}"""
+    from database_rapidapi import engine
+
+    partial = _partial_indexes()
+    results = {}
+    with engine.connect() as conn:
+        for check in build_checks():
+            sql = str(check.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            details = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+            results[check.name] = {
+                "plan": details,
+                "problems": evaluate_plan(details, check.allow_index_scan, partial, check.ordered_limit)
+            }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Confere os planos das consultas quentes (sem varredura completa)")
+    parser.add_argument("--current-db", action="store_true", help="Usa o banco configurado em vez de um temporário")
+    parser.add_argument("--matches", type=int, default=20_000, help="Partidas sintéticas no banco temporário")
+    args = parser.parse_args()
+
+    workdir = None
+    if not args.current_db:
+        # Antes de importar database_rapidapi: o engine lê DATABASE_URL na importação
+        workdir = Path(tempfile.mkdtemp(prefix="check_plans_"))
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'check_plans.db'}"
+
+    try:
+        from database_rapidapi import engine, init_db
+
+        if engine.dialect.name != "sqlite":
+            print("⚠️ EXPLAIN QUERY PLAN só é conferido no SQLite")
+            return 0
+
+        if workdir is not None:
+            init_db()
+            seed_database(args.matches)
+
+        results = run_checks()
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    failed = 0
+    for name, result in results.items():
+        ok = not result["problems"]
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {name}")
+        for detail in result["plan"]:
+            print(f"      {detail}")
+
+    print(f"\n{len(results) - failed}/{len(results)} consultas sem varredura completa")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
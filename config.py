@@ -16,6 +16,18 @@ LOGS_DIR.mkdir(exist_ok=True)
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bet365_virtual.db")
 
+# Pool de conexões (web_api usa várias threads; SQLite file = QueuePool, :memory: = StaticPool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))  # Conexões mantidas abertas
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))  # Conexões extras em picos
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # Segundos esperando conexão livre
+
+# SQLite: perfil aplicado a cada conexão (WAL, synchronous, busy_timeout, cache, mmap, temp_store)
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "True").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL é seguro com WAL (perde no máx. o último commit numa queda de energia)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 10000))  # Espera pelo lock antes de "database is locked"
+SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", 64))  # Cache de páginas por conexão
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", 256))  # Leitura via mmap (0 = desliga)
+
 # API
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", 8000))
@@ -39,7 +51,86 @@ BET365_RESULTS_URL = os.getenv("BET365_RESULTS_URL", "https://extra.bet365.com/r
 # RapidAPI Configuration (Futebol Virtual Bet365)
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "af63b68123msh7d090c49720fb63p1b3fe2jsn8898d9df2786")
 RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST", "futebol-virtual-bet3651.p.rapidapi.com")
+RAPIDAPI_BASE_URL = os.getenv("RAPIDAPI_BASE_URL", f"https://{RAPIDAPI_HOST}")  # http://127.0.0.1:8765 = mock_rapidapi_server.py
 RAPIDAPI_LEAGUES = ["express", "copa", "super", "euro", "premier"]  # Todas as ligas disponíveis
+SITE_TIME_OFFSET_HOURS = float(os.getenv("SITE_TIME_OFFSET_HOURS", 4))  # Horário do site = local + N horas (hora/minuto da API)
+
+# RapidAPI - Conexões HTTP (sessão keep-alive compartilhada pelo processo)
+RAPIDAPI_POOL_CONNECTIONS = int(os.getenv("RAPIDAPI_POOL_CONNECTIONS", 4))  # Pools de conexão (1 por host)
+RAPIDAPI_POOL_MAXSIZE = int(os.getenv("RAPIDAPI_POOL_MAXSIZE", 10))  # Conexões mantidas por host
+RAPIDAPI_CONNECT_TIMEOUT = float(os.getenv("RAPIDAPI_CONNECT_TIMEOUT", 5))  # Segundos para abrir conexão
+RAPIDAPI_READ_TIMEOUT = float(os.getenv("RAPIDAPI_READ_TIMEOUT", 30))  # Segundos aguardando resposta
+RAPIDAPI_MAX_CONCURRENCY = int(os.getenv("RAPIDAPI_MAX_CONCURRENCY", 5))  # Ligas buscadas em paralelo (cliente async)
+
+# Fontes: matriz liga × casa de apostas × esporte ("casa:esporte:liga1,liga2;casa:esporte:ligas")
+# Vazio = bet365, esporte 1, RAPIDAPI_LEAGUES. A casa principal cria as partidas;
+# as demais só anexam odds (match_prices) às partidas já conhecidas
+SOURCE_MATRIX = os.getenv("SOURCE_MATRIX", "")
+SOURCE_PRIMARY_BOOKMAKER = os.getenv("SOURCE_PRIMARY_BOOKMAKER", "bet365")
+SOURCE_MAX_WORKERS = int(os.getenv("SOURCE_MAX_WORKERS", RAPIDAPI_MAX_CONCURRENCY))  # Células buscadas/processadas em paralelo
+
+# RapidAPI - Limite de requisições e cota (compartilhados entre processos via SQLite)
+RAPIDAPI_RATE_LIMITER_ENABLED = os.getenv("RAPIDAPI_RATE_LIMITER_ENABLED", "True").lower() == "true"
+RAPIDAPI_LIMITER_DB = Path(os.getenv("RAPIDAPI_LIMITER_DB", str(BASE_DIR / "rapidapi_quota.db")))
+RAPIDAPI_RATE_LIMIT_PER_MINUTE = float(os.getenv("RAPIDAPI_RATE_LIMIT_PER_MINUTE", 60))  # Reposição do token bucket
+RAPIDAPI_BURST = int(os.getenv("RAPIDAPI_BURST", 10))  # Requisições seguidas permitidas
+RAPIDAPI_DAILY_QUOTA = int(os.getenv("RAPIDAPI_DAILY_QUOTA", 0))  # 0 = sem limite
+RAPIDAPI_MONTHLY_QUOTA = int(os.getenv("RAPIDAPI_MONTHLY_QUOTA", 0))  # 0 = sem limite
+RAPIDAPI_QUOTA_RESERVE_PCT = float(os.getenv("RAPIDAPI_QUOTA_RESERVE_PCT", 20))  # % da cota reservada para resultados
+RAPIDAPI_LIMITER_MAX_WAIT = float(os.getenv("RAPIDAPI_LIMITER_MAX_WAIT", 30))  # Segundos aguardando token
+
+# RapidAPI - Retentativas e circuit breaker por liga
+RAPIDAPI_MAX_RETRIES = int(os.getenv("RAPIDAPI_MAX_RETRIES", 2))  # Retentativas após a primeira falha
+RAPIDAPI_BACKOFF_BASE = float(os.getenv("RAPIDAPI_BACKOFF_BASE", 0.5))  # Segundos (dobra a cada tentativa, com jitter)
+RAPIDAPI_BACKOFF_MAX = float(os.getenv("RAPIDAPI_BACKOFF_MAX", 10))  # Espera máxima entre tentativas
+RAPIDAPI_BREAKER_THRESHOLD = int(os.getenv("RAPIDAPI_BREAKER_THRESHOLD", 3))  # Falhas seguidas para abrir o circuito
+RAPIDAPI_BREAKER_RECOVERY = float(os.getenv("RAPIDAPI_BREAKER_RECOVERY", 300))  # Segundos até testar a liga de novo
+
+# RapidAPI - Cache de respostas em disco (compartilhado entre processos)
+RAPIDAPI_CACHE_ENABLED = os.getenv("RAPIDAPI_CACHE_ENABLED", "True").lower() == "true"
+RAPIDAPI_CACHE_DB = Path(os.getenv("RAPIDAPI_CACHE_DB", str(BASE_DIR / "rapidapi_cache.db")))
+RAPIDAPI_CACHE_TTL = {  # Segundos em que a resposta é considerada fresca (0 = sem cache)
+    "/last-updated": float(os.getenv("RAPIDAPI_CACHE_TTL_LAST_UPDATED", 10)),
+    "/next-matchs": float(os.getenv("RAPIDAPI_CACHE_TTL_NEXT_MATCHS", 30)),
+    "/matchs": float(os.getenv("RAPIDAPI_CACHE_TTL_MATCHS", 30))
+}
+RAPIDAPI_CACHE_STALE = float(os.getenv("RAPIDAPI_CACHE_STALE", 60))  # Janela stale-while-revalidate (s)
+
+# Arquivo bruto das respostas da RapidAPI (JSONL diário comprimido, só acrescenta)
+RAW_ARCHIVE_ENABLED = os.getenv("RAW_ARCHIVE_ENABLED", "True").lower() == "true"
+RAW_ARCHIVE_DIR = Path(os.getenv("RAW_ARCHIVE_DIR", str(BASE_DIR / "raw_archive")))
+
+# Histórico de odds (grava só os mercados cuja odd mudou)
+ODDS_HISTORY_ENABLED = os.getenv("ODDS_HISTORY_ENABLED", "True").lower() == "true"
+ODDS_HISTORY_MAX_POINTS = int(os.getenv("ODDS_HISTORY_MAX_POINTS", 200))  # Pontos por mercado na API
+
+# odds_json compacto (códigos de mercado + odds empacotadas, ver odds_codec.py)
+ODDS_JSON_COMPRESS = os.getenv("ODDS_JSON_COMPRESS", "True").lower() == "true"  # zlib quando reduz o tamanho
+
+# Escritor único do banco (fila limitada + commit em lote por processo)
+DB_WRITER_QUEUE_SIZE = int(os.getenv("DB_WRITER_QUEUE_SIZE", 100))  # Jobs na fila antes de bloquear os coletores
+DB_WRITER_BATCH_SIZE = int(os.getenv("DB_WRITER_BATCH_SIZE", 20))  # Máximo de jobs por commit
+DB_WRITER_MAX_DELAY = float(os.getenv("DB_WRITER_MAX_DELAY", 0.2))  # Segundos esperando o lote encher
+
+# Modo incremental: consulta /last-updated antes e pula ligas sem novidades
+SCRAPER_INCREMENTAL = os.getenv("SCRAPER_INCREMENTAL", "False").lower() == "true"
+
+# Resultados de partidas que o scraper nunca gravou: insere com placar (senão só ignora)
+RESULTS_INSERT_UNKNOWN = os.getenv("RESULTS_INSERT_UNKNOWN", "False").lower() == "true"
+
+# Resultados: só consulta /matchs das ligas com partida já iniciada e ainda sem placar
+RESULTS_ONLY_PENDING = os.getenv("RESULTS_ONLY_PENDING", "True").lower() == "true"
+RESULTS_PENDING_LOOKBACK_HOURS = float(os.getenv("RESULTS_PENDING_LOOKBACK_HOURS", 6))  # Partidas mais antigas não contam como pendentes
+
+# Agendamento adaptativo: cada liga é consultada quando o calendário indica novidade
+# (resultados logo após o fim esperado, próximas partidas antes da lista acabar)
+SCHEDULER_ADAPTIVE = os.getenv("SCHEDULER_ADAPTIVE", "True").lower() == "true"
+VIRTUAL_MATCH_MINUTES = float(os.getenv("VIRTUAL_MATCH_MINUTES", 3))  # Início -> apito final
+RESULTS_FETCH_DELAY_SECONDS = float(os.getenv("RESULTS_FETCH_DELAY_SECONDS", 30))  # Após o apito final
+RESULTS_RETRY_SECONDS = float(os.getenv("RESULTS_RETRY_SECONDS", 60))  # Enquanto o placar não sai
+NEXT_MATCHES_LEAD_SECONDS = float(os.getenv("NEXT_MATCHES_LEAD_SECONDS", 60))  # Antes do último início conhecido
+NEXT_MATCHES_MIN_INTERVAL_SECONDS = float(os.getenv("NEXT_MATCHES_MIN_INTERVAL_SECONDS", 60))
+NEXT_MATCHES_MAX_INTERVAL_SECONDS = float(os.getenv("NEXT_MATCHES_MAX_INTERVAL_SECONDS", 900))  # Atualiza odds ao menos nesse ritmo
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
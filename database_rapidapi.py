@@ -2,33 +2,241 @@
 Configuração do banco de dados para o novo modelo (RapidAPI)
 """
 
-from sqlalchemy import create_engine
+import json
+import sqlite3
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Generator, Iterable, List, Optional
 
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    SQLITE_TUNED,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_MB,
+    SQLITE_MMAP_SIZE_MB
+)
 from models_rapidapi import Base
+from odds_codec import encode_odds
+
+MIGRATIONS_CONFIG = Path(__file__).resolve().parent / "alembic.ini"
 
 # Usar banco de dados separado para RapidAPI
 RAPIDAPI_DATABASE_URL = DATABASE_URL.replace("bet365_virtual.db", "bet365_rapidapi.db")
 
+_url = make_url(RAPIDAPI_DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+_IS_SQLITE_MEMORY = IS_SQLITE and _url.database in (None, "", ":memory:")
+
+# Perfil aplicado a cada conexão SQLite nova (ver _apply_sqlite_profile)
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),  # Leitores não bloqueiam o escritor (e vice-versa)
+    ("synchronous", SQLITE_SYNCHRONOUS),  # NORMAL: fsync só no checkpoint do WAL
+    ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),  # Espera o lock em vez de falhar na hora
+    ("cache_size", -SQLITE_CACHE_SIZE_MB * 1024),  # Negativo = KiB
+    ("mmap_size", SQLITE_MMAP_SIZE_MB * 1024 * 1024),
+    ("temp_store", "MEMORY"),  # Ordenações/índices temporários sem arquivo
+)
+
+
+def _engine_options(queue_pool=QueuePool) -> Dict[str, Any]:
+    """
+    Pool de conexões escolhido pelo tipo de banco
+    
+    - SQLite em memória: StaticPool (uma conexão só, senão cada uma vê um banco vazio)
+    - SQLite em arquivo / PostgreSQL: QueuePool com DB_POOL_SIZE conexões fixas
+      + DB_MAX_OVERFLOW extras (threads do FastAPI, scheduler e escritor único)
+    
+    Args:
+        queue_pool: Classe do pool com fila (AsyncAdaptedQueuePool no engine async)
+    """
+    if _IS_SQLITE_MEMORY:
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    
+    options = {
+        "poolclass": queue_pool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT
+    }
+    if IS_SQLITE:
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options["pool_pre_ping"] = True
+    return options
+
+
 # Criar engine
 engine = create_engine(
     RAPIDAPI_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in RAPIDAPI_DATABASE_URL else {},
-    echo=False  # True para debug SQL
+    echo=False,  # True para debug SQL
+    **_engine_options()
 )
 
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_profile(dbapi_connection, connection_record):
+    """Aplica SQLITE_PRAGMAS em cada conexão nova (a maioria dos PRAGMAs vale só para a conexão)"""
+    if not IS_SQLITE or not SQLITE_TUNED:
+        return
+    
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def get_sqlite_settings() -> Dict[str, Any]:
+    """Valores efetivos dos PRAGMAs do perfil em uma conexão do pool (vazio se não for SQLite)"""
+    if not IS_SQLITE:
+        return {}
+    
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name, _ in SQLITE_PRAGMAS
+        }
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Drivers asyncio por banco (engine dos endpoints do web_api)
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg"
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine asyncio do mesmo banco (criado no primeiro uso)
+    
+    Mesma URL, pool e perfil do SQLite do engine síncrono, com o driver de
+    ASYNC_DRIVERS: scripts e threads que só usam get_db() não precisam do
+    aiosqlite/asyncpg instalado. SQLite em memória não é compartilhado entre
+    os dois engines (cada um abre o seu banco).
+    """
+    global _async_engine
+    
+    if _async_engine is None:
+        backend = _url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"Banco sem driver asyncio configurado: {backend}")
+        
+        _async_engine = create_async_engine(
+            _url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"),
+            echo=False,
+            **_engine_options(AsyncAdaptedQueuePool)
+        )
+        event.listen(_async_engine.sync_engine, "connect", _apply_sqlite_profile)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """Fecha as conexões do engine asyncio (shutdown da API)"""
+    global _async_engine, _async_session_factory
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
+def migrate_odds_json(batch_size: int = 1000) -> int:
+    """
+    Converte o odds_json antigo (texto JSON) para a coluna compacta odds_packed
+    
+    Bancos criados antes do formato compacto têm a coluna matches.odds_json;
+    cada linha é recodificada (odds_codec.encode_odds) e o texto é apagado.
+    Idempotente: linhas já convertidas não são lidas de novo. O espaço só volta
+    para o sistema de arquivos após um VACUUM (ver migrate_odds_encoding.py).
+    
+    Args:
+        batch_size: Linhas por transação
+    
+    Returns:
+        Número de linhas convertidas
+    """
+    columns = {col["name"] for col in inspect(engine).get_columns("matches")}
+    if "odds_json" not in columns:
+        return 0
+    
+    converted = 0
+    while True:
+        with engine.begin() as conn:
+            legacy = conn.execute(text(
+                "SELECT id, odds_json FROM matches WHERE odds_json IS NOT NULL LIMIT :limit"
+            ), {"limit": batch_size}).fetchall()
+            if not legacy:
+                return converted
+            
+            rows = []
+            for match_id, raw in legacy:
+                odds = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+                rows.append({
+                    "match_id": match_id,
+                    "packed": encode_odds(odds) if isinstance(odds, dict) else None
+                })
+            
+            # Linha regravada depois da atualização já tem odds_packed mais novo
+            conn.execute(text(
+                "UPDATE matches SET odds_packed = COALESCE(odds_packed, :packed), odds_json = NULL WHERE id = :match_id"
+            ), rows)
+            converted += len(rows)
+
+
+def upgrade_schema() -> Optional[str]:
+    """
+    Cria ou atualiza o schema (as migrações do Alembic são o único caminho)
+    
+    - Banco novo (sem a tabela matches): create_all() com os modelos atuais
+      e "alembic stamp head"
+    - Banco existente: "alembic upgrade head"; sem alembic_version é um banco
+      do schema original e recebe todas as revisões desde a 0000
+    
+    Returns:
+        Revisão atual do banco após a atualização
+    """
+    from alembic import command
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    
+    config = Config(str(MIGRATIONS_CONFIG))
+    config.set_main_option("script_location", str(MIGRATIONS_CONFIG.parent / "migrations"))
+    config.attributes["configure_logger"] = False
+    
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        if inspect(conn).has_table("matches"):
+            command.upgrade(config, "head")
+        else:
+            Base.metadata.create_all(bind=conn)
+            command.stamp(config, "head")
+        return MigrationContext.configure(conn).get_current_revision()
+
 
 def init_db():
     """
-    Inicializa o banco de dados criando todas as tabelas
+    Inicializa o banco de dados: cria ou migra o schema e converte o odds_json antigo
     """
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    converted = migrate_odds_json()
+    if converted:
+        print(f"🔧 odds_json convertido para o formato compacto: {converted} partidas")
     print("✅ Banco de dados inicializado!")
 
 
@@ -52,6 +260,37 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+@asynccontextmanager
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Versão asyncio do get_db (endpoints async do FastAPI)
+    
+    A consulta roda no driver asyncio sem travar o event loop. As sessões
+    não expiram os objetos no commit (expire_on_commit=False): atributos
+    já carregados seguem legíveis depois do bloco, sem lazy load implícito.
+    
+    Usage:
+        async with get_async_db() as db:
+            matches = (await db.scalars(select(Match).limit(10))).all()
+    """
+    global _async_session_factory
+    
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    
+    db = _async_session_factory()
+    try:
+        yield db
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise e
+    finally:
+        await db.close()
+
+
 def get_db_session() -> Session:
     """
     Retorna sessão do banco de dados (para uso com dependency injection)
@@ -65,3 +304,74 @@ def get_db_session() -> Session:
             db.close()
     """
     return SessionLocal()
+
+
+# INSERT ... ON CONFLICT nativo por dialeto
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert
+}
+
+# Limite de parâmetros por statement (SQLite < 3.32 aceita só 999)
+_MAX_PARAMS = {
+    "sqlite": 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999,
+    "postgresql": 65535
+}
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: List[Dict],
+    conflict_column: str,
+    keep_on_update: Iterable[str] = ()
+):
+    """
+    Insere ou atualiza várias linhas de uma vez
+    
+    SQLite e PostgreSQL usam INSERT ... ON CONFLICT DO UPDATE (um statement por
+    lote); outros bancos fazem uma busca IN seguida de bulk insert/update.
+    Não faz commit.
+    
+    Args:
+        db: Sessão do banco
+        model: Modelo ORM (ex: Match)
+        rows: Linhas com as mesmas chaves (colunas do modelo)
+        conflict_column: Coluna única usada para achar a linha existente
+        keep_on_update: Colunas que mantêm o valor atual quando a linha já existe
+    """
+    if not rows:
+        return
+    
+    # Chave repetida no mesmo lote: vale a última (PostgreSQL recusa duplicadas)
+    rows = list({row[conflict_column]: row for row in rows}.values())
+    
+    keep = set(keep_on_update) | {conflict_column}
+    dialect = db.get_bind().dialect.name
+    make_insert = _UPSERT_INSERTS.get(dialect)
+    
+    if make_insert is not None:
+        table = model.__table__
+        batch_size = max(1, _MAX_PARAMS[dialect] // len(rows[0]))
+        for i in range(0, len(rows), batch_size):
+            stmt = make_insert(table).values(rows[i:i + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[conflict_column]],
+                set_={key: stmt.excluded[key] for key in rows[0] if key not in keep}
+            )
+            db.execute(stmt)
+        return
+    
+    key_attr = getattr(model, conflict_column)
+    existing = dict(
+        db.query(key_attr, model.id).filter(key_attr.in_([row[conflict_column] for row in rows]))
+    )
+    inserts = [row for row in rows if row[conflict_column] not in existing]
+    updates = [
+        {**{k: v for k, v in row.items() if k not in keep}, "id": existing[row[conflict_column]]}
+        for row in rows if row[conflict_column] in existing
+    ]
+    if inserts:
+        db.bulk_insert_mappings(model, inserts)
+    if updates:
+        db.bulk_update_mappings(model, updates)
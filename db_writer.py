@@ -0,0 +1,279 @@
+"""
+Escritor único do banco (por processo) com fila limitada e commits em lote
+Scraper, coletor de resultados e endpoints de escrita enviam "jobs" (funções
+que recebem a sessão) para uma fila; uma única thread drena a fila e faz um
+commit a cada DB_WRITER_BATCH_SIZE jobs ou DB_WRITER_MAX_DELAY segundos.
+
+Com um só escritor, as threads do processo não disputam o lock do SQLite
+entre si. Entre processos (ex: web_api e main_rapidapi.py continuous, cada um
+com o seu escritor) cada lote abre a transação com BEGIN IMMEDIATE: pega o
+lock de escrita antes de rodar os jobs, esperando até o busy_timeout, em vez
+de ler, tentar gravar e levar "database is locked" porque o outro processo
+gravou no meio. O tempo de espera pelo lock entra em get_stats().
+
+Fila cheia = submit() bloqueia (backpressure nos coletores). Profundidade da
+fila e latência dos lotes ficam em get_stats() (GET /api/scraper/status).
+"""
+
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database_rapidapi import SessionLocal
+from config import (
+    DB_WRITER_QUEUE_SIZE,
+    DB_WRITER_BATCH_SIZE,
+    DB_WRITER_MAX_DELAY
+)
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[Session], Any]
+
+
+class BatchedWriter:
+    """Thread única que executa jobs de escrita em lotes (um commit por lote)"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue: int = DB_WRITER_QUEUE_SIZE,
+        batch_size: int = DB_WRITER_BATCH_SIZE,
+        max_delay: float = DB_WRITER_MAX_DELAY
+    ):
+        """
+        Args:
+            session_factory: Fábrica de sessões do banco
+            max_queue: Jobs aguardando na fila antes de submit() bloquear
+            batch_size: Máximo de jobs por commit
+            max_delay: Segundos máximos esperando o lote encher
+        """
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+
+        self._queue: "queue.Queue[Tuple[Job, Future, str, float]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=200)  # Duração dos últimos lotes (s)
+        self._waits = deque(maxlen=200)  # Tempo dos últimos jobs na fila (s)
+        self._lock_waits = deque(maxlen=200)  # Espera pelo lock de escrita dos últimos lotes (s)
+        self._stats = {
+            "jobs": 0,
+            "batches": 0,
+            "failed_jobs": 0,
+            "retried_batches": 0,
+            "max_queue_depth": 0,
+            "max_batch_seconds": 0.0,
+            "lock_timeouts": 0,
+            "max_lock_wait_seconds": 0.0,
+            "last_batch_size": 0,
+            "last_batch_at": None
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, job: Job, label: str = "", timeout: Optional[float] = None) -> Future:
+        """
+        Enfileira um job de escrita
+
+        O job recebe a sessão e não deve fazer commit (o escritor faz, por lote).
+        Se a fila estiver cheia, bloqueia até abrir espaço (ou timeout).
+
+        Args:
+            job: Função (sessão) -> resultado
+            label: Nome do job para os logs
+            timeout: Segundos máximos aguardando espaço na fila
+
+        Returns:
+            Future com o retorno do job
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Jobs do escritor não podem enfileirar outros jobs")
+
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((job, future, label, time.monotonic()), timeout=timeout)
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            if depth > self._stats["max_queue_depth"]:
+                self._stats["max_queue_depth"] = depth
+
+        return future
+
+    def run(self, job: Job, label: str = "", timeout: Optional[float] = None) -> Any:
+        """Enfileira um job e aguarda o resultado (exceções do job são relançadas)"""
+        return self.submit(job, label).result(timeout=timeout)
+
+    def _next_batch(self) -> List[Tuple[Job, Future, str, float]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _begin(self, db: Session):
+        """
+        Abre a transação já com o lock de escrita (SQLite: BEGIN IMMEDIATE)
+
+        Espera o lock até o busy_timeout; se outro processo não o soltar a
+        tempo, levanta OperationalError antes de qualquer job rodar.
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            return
+
+        started = time.monotonic()
+        try:
+            db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+        except OperationalError:
+            with self._stats_lock:
+                self._stats["lock_timeouts"] += 1
+            raise
+        finally:
+            waited = time.monotonic() - started
+            with self._stats_lock:
+                self._lock_waits.append(waited)
+                self._stats["max_lock_wait_seconds"] = max(self._stats["max_lock_wait_seconds"], waited)
+
+    def _execute(self, batch: List[Tuple[Job, Future, str, float]]) -> bool:
+        """
+        Executa os jobs em uma transação
+
+        Returns:
+            False se um job falhou (o lote é refeito um a um); True se houve
+            commit ou se o lock não foi obtido (os jobs recebem o erro)
+        """
+        db = self.session_factory()
+        try:
+            self._begin(db)
+        except OperationalError as e:
+            db.close()
+            # Refazer um a um não adianta: o lock continua com o outro processo
+            logger.error(f"❌ Escritor: lock do banco não liberado, {len(batch)} jobs falharam: {e}")
+            with self._stats_lock:
+                self._stats["failed_jobs"] += len(batch)
+            for _, future, _, _ in batch:
+                future.set_exception(e)
+            return True
+
+        try:
+            results = [job(db) for job, _, _, _ in batch]
+            db.commit()
+        except Exception:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+        for (_, future, _, _), result in zip(batch, results):
+            future.set_result(result)
+        return True
+
+    def _execute_one(self, item: Tuple[Job, Future, str, float]):
+        job, future, label, _ = item
+        db = self.session_factory()
+        try:
+            self._begin(db)
+            result = job(db)
+            db.commit()
+            future.set_result(result)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Escritor: job {label or job} falhou: {e}")
+            with self._stats_lock:
+                self._stats["failed_jobs"] += 1
+            future.set_exception(e)
+        finally:
+            db.close()
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            started = time.monotonic()
+
+            # Descarta jobs cujo chamador já desistiu
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            if not self._execute(batch):
+                # Um job falhou: refaz um a um para não perder os outros
+                with self._stats_lock:
+                    self._stats["retried_batches"] += 1
+                for item in batch:
+                    self._execute_one(item)
+
+            finished = time.monotonic()
+            with self._stats_lock:
+                self._stats["jobs"] += len(batch)
+                self._stats["batches"] += 1
+                self._stats["last_batch_size"] = len(batch)
+                self._stats["last_batch_at"] = time.time()
+                self._stats["max_batch_seconds"] = max(self._stats["max_batch_seconds"], finished - started)
+                self._latencies.append(finished - started)
+                self._waits.extend(started - item[3] for item in batch)
+
+    def get_stats(self) -> Dict:
+        """Profundidade da fila e latência dos lotes (para monitorar backpressure)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            latencies = list(self._latencies)
+            waits = list(self._waits)
+            lock_waits = list(self._lock_waits)
+
+        def _ms(values: List[float], fn) -> Optional[float]:
+            return round(fn(values) * 1000, 1) if values else None
+
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "batch_size_limit": self.batch_size,
+            "max_delay_seconds": self.max_delay,
+            "running": self._thread is not None and self._thread.is_alive(),
+            **stats,
+            "max_batch_seconds": round(stats["max_batch_seconds"], 3),
+            "max_lock_wait_seconds": round(stats["max_lock_wait_seconds"], 3),
+            "avg_batch_ms": _ms(latencies, lambda v: sum(v) / len(v)),
+            "last_batch_ms": _ms(latencies, lambda v: v[-1]),
+            "avg_queue_wait_ms": _ms(waits, lambda v: sum(v) / len(v)),
+            "avg_lock_wait_ms": _ms(lock_waits, lambda v: sum(v) / len(v)),
+            "last_lock_wait_ms": _ms(lock_waits, lambda v: v[-1])
+        }
+
+
+_db_writer: Optional[BatchedWriter] = None
+_db_writer_lock = threading.Lock()
+
+
+def get_db_writer() -> BatchedWriter:
+    """Retorna o escritor único do processo"""
+    global _db_writer
+
+    with _db_writer_lock:
+        if _db_writer is None:
+            _db_writer = BatchedWriter()
+        return _db_writer
@@ -0,0 +1,176 @@
+"""
+Modo incremental de coleta
+Consulta o endpoint leve /last-updated antes da coleta pesada e pula as ligas
+cujo valor não mudou desde a última coleta bem-sucedida.
+
+Também guarda o hash do último payload gravado por liga, para a ingestão
+pular o parse e as escritas quando a resposta é idêntica à anterior.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from rapid_api_client import RapidAPIClient
+from async_rapid_api_client import fetch_all_leagues
+from models_rapidapi import LeagueSyncState
+
+logger = logging.getLogger(__name__)
+
+
+def _get_state(db: Session, league: str, endpoint: str) -> Optional[LeagueSyncState]:
+    return db.query(LeagueSyncState).filter(
+        LeagueSyncState.league == league,
+        LeagueSyncState.endpoint == endpoint
+    ).first()
+
+
+def fetch_last_updated(
+    leagues: List[str],
+    client: Optional[RapidAPIClient] = None,
+    stats: Optional[Dict[str, int]] = None
+) -> Dict[str, Optional[Dict]]:
+    """
+    Consulta /last-updated das ligas (sem tocar no banco)
+
+    Sempre vai à API, sem o cache de respostas: um valor em cache (TTL + janela
+    stale) faria uma liga alterada parecer igual e ser pulada.
+
+    Args:
+        leagues: Ligas candidatas
+        client: Cliente síncrono (None = consulta todas as ligas em paralelo)
+        stats: Dicionário onde somar os contadores de requisições (modo paralelo)
+
+    Returns:
+        {liga: resposta} (None se a consulta falhou)
+    """
+    if client is None:
+        return fetch_all_leagues("last-updated", leagues, stats=stats, use_cache=False)
+    return {league: client.get_last_updated(league=league, use_cache=False) for league in leagues}
+
+
+def check_league_changes(
+    endpoint: str,
+    leagues: List[str],
+    db: Session,
+    client: Optional[RapidAPIClient] = None,
+    stats: Optional[Dict[str, int]] = None,
+    responses: Optional[Dict[str, Optional[Dict]]] = None
+) -> Tuple[List[str], List[str], Dict[str, str]]:
+    """
+    Separa as ligas que mudaram das que estão iguais desde a última coleta
+
+    Não faz commit (roda como job do escritor único, ver db_writer.py).
+
+    Args:
+        endpoint: Endpoint pesado que será coletado ('next-matchs' ou 'matchs')
+        leagues: Ligas candidatas
+        db: Sessão do banco
+        client: Cliente síncrono (None = consulta todas as ligas em paralelo)
+        stats: Dicionário onde somar os contadores de requisições (modo paralelo)
+        responses: Respostas de /last-updated já obtidas com fetch_last_updated
+            (None = consulta agora)
+
+    Returns:
+        Tupla (ligas_alteradas, ligas_sem_mudanca, {liga: last_updated})
+        Ligas cuja consulta a /last-updated falhou são tratadas como alteradas.
+    """
+    if responses is None:
+        responses = fetch_last_updated(leagues, client, stats)
+
+    now = datetime.utcnow()
+    changed = []
+    unchanged = []
+    markers = {}
+
+    for league in leagues:
+        response = responses.get(league)
+        last_updated = response.get("last_updated") if response and response.get("status") else None
+
+        if last_updated is None:
+            logger.warning(f"⚠️ /last-updated indisponível para {league}, coletando mesmo assim")
+            changed.append(league)
+            continue
+
+        markers[league] = str(last_updated)
+        state = _get_state(db, league, endpoint)
+
+        if state is None:
+            state = LeagueSyncState(league=league, endpoint=endpoint)
+            db.add(state)
+        state.checked_at = now
+
+        if state.last_updated == markers[league]:
+            unchanged.append(league)
+        else:
+            changed.append(league)
+
+    db.flush()
+
+    if unchanged:
+        logger.info(f"⏭️  Sem novidades em /{endpoint}: {', '.join(unchanged)}")
+
+    return changed, unchanged, markers
+
+
+def mark_league_synced(
+    endpoint: str,
+    league: str,
+    last_updated: Optional[str],
+    db: Session
+):
+    """
+    Registra o last_updated de uma liga após uma coleta bem-sucedida
+
+    Args:
+        endpoint: Endpoint coletado ('next-matchs' ou 'matchs')
+        league: Liga coletada
+        last_updated: Valor de /last-updated obtido antes da coleta (None = não registra)
+        db: Sessão do banco
+    """
+    if last_updated is None:
+        return
+
+    state = _get_state(db, league, endpoint)
+    if state is None:
+        state = LeagueSyncState(league=league, endpoint=endpoint)
+        db.add(state)
+
+    state.last_updated = last_updated
+    state.synced_at = datetime.utcnow()
+
+
+def payload_hash(data: Dict) -> str:
+    """
+    Hash do conteúdo de uma resposta da API
+
+    Serializa com chaves ordenadas, então respostas iguais geram o mesmo hash
+    independentemente da ordem dos campos no JSON.
+    """
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def is_payload_unchanged(endpoint: str, league: str, digest: str, db: Session) -> bool:
+    """Retorna True se o último payload gravado da liga tem o mesmo hash"""
+    state = _get_state(db, league, endpoint)
+    return state is not None and state.payload_hash == digest
+
+
+def store_payload_hash(endpoint: str, league: str, digest: Optional[str], db: Session):
+    """
+    Registra o hash do payload gravado (None = esquece, força a próxima ingestão)
+
+    Não faz commit: deve ir na mesma transação das partidas gravadas.
+    """
+    state = _get_state(db, league, endpoint)
+    if state is None:
+        if digest is None:
+            return
+        state = LeagueSyncState(league=league, endpoint=endpoint)
+        db.add(state)
+
+    state.payload_hash = digest
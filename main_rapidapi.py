@@ -12,7 +12,9 @@ from database_rapidapi import init_db, get_db
 from scraper_rapidapi import run_rapidapi_scraper
 from results_collector import run_results_collector
 from models_rapidapi import Match, ScraperLog
-from config import SCRAPER_INTERVAL_MINUTES, RAPIDAPI_LEAGUES
+from match_status import OPEN_STATUSES
+from poll_planner import get_poll_planner, NEXT_MATCHES, RESULTS
+from config import SCRAPER_INTERVAL_MINUTES, RAPIDAPI_LEAGUES, SCHEDULER_ADAPTIVE
 
 # Configurar logging
 logging.basicConfig(
@@ -29,7 +31,7 @@ def show_statistics():
     with get_db() as db:
         total_matches = db.query(Match).count()
         finished_matches = db.query(Match).filter(Match.status == "finished").count()
-        scheduled_matches = db.query(Match).filter(Match.status == "scheduled").count()
+        scheduled_matches = db.query(Match).filter(Match.status.in_(OPEN_STATUSES)).count()
         total_logs = db.query(ScraperLog).count()
         
         # Partidas por liga
@@ -93,14 +95,70 @@ def run_once(leagues=None):
     return result
 
 
+def run_adaptive(leagues=None):
+    """
+    Executa coleta continuamente, guiada pelo calendário das partidas
+    Cada liga só é consultada quando pode haver novidade (ver poll_planner);
+    entre uma coleta e outra dorme até o próximo horário útil
+    
+    Args:
+        leagues: Lista de ligas (None = todas)
+    """
+    planner = get_poll_planner()
+    if leagues:
+        planner.leagues = list(leagues)
+    
+    logger.info("♾️  Modo: Execução contínua (agendamento adaptativo)\n")
+    logger.info("   Próximas partidas antes da lista acabar, resultados após o fim de cada partida")
+    logger.info("   Pressione Ctrl+C para parar\n")
+    
+    execution_count = 0
+    
+    try:
+        while True:
+            next_due, results_due = planner.due()
+            
+            if next_due or results_due:
+                execution_count += 1
+                logger.info(f"🔄 Execução #{execution_count}")
+                
+                if next_due:
+                    logger.info(f"📋 Próximas partidas: {', '.join(next_due)}")
+                    result_next = run_rapidapi_scraper(leagues=next_due)
+                    planner.mark_fetched(NEXT_MATCHES, next_due)
+                    logger.info(f"   Próximas: {result_next['matches_found']} ({result_next['matches_new']} novas)")
+                
+                if results_due:
+                    logger.info(f"📋 Resultados: {', '.join(results_due)}")
+                    result_hist = run_results_collector(leagues=results_due)
+                    planner.mark_fetched(RESULTS, results_due)
+                    logger.info(f"   Resultados: {result_hist['results_found']} ({result_hist['matches_updated']} atualizadas)")
+                
+                if execution_count % 5 == 0:  # Mostra stats a cada 5 execuções
+                    show_statistics()
+            
+            # Pelo menos 5s entre ciclos (o plano tem resolução de minutos)
+            wait = max(5.0, planner.seconds_until_next())
+            logger.info(f"⏸️  Próxima coleta útil em {wait:.0f}s\n")
+            time.sleep(wait)
+            
+    except KeyboardInterrupt:
+        logger.info("\n\n⏹️  Execução interrompida pelo usuário")
+        show_statistics()
+
+
 def run_continuous(leagues=None):
     """
     Executa coleta continuamente com intervalo configurado
     Coleta tanto próximas partidas quanto resultados históricos
+    (com SCHEDULER_ADAPTIVE usa o agendamento adaptativo)
     
     Args:
         leagues: Lista de ligas (None = todas)
     """
+    if SCHEDULER_ADAPTIVE:
+        return run_adaptive(leagues=leagues)
+    
     logger.info(f"♾️  Modo: Execução contínua (intervalo: {SCRAPER_INTERVAL_MINUTES} minutos)\n")
     logger.info("   Coleta próximas partidas + resultados históricos")
     logger.info("   Pressione Ctrl+C para parar\n")
@@ -0,0 +1,67 @@
+"""
+Status das partidas por horário: scheduled -> live -> expired/finished
+O status é derivado de kickoff_at (UTC) por poucos UPDATEs em lote, rodados
+pelo scheduler; /api/matches só lê a coluna status.
+
+Cada UPDATE só alcança partidas em status aberto (scheduled/live) por faixa
+de kickoff_at no índice ix_matches_status_kickoff_at. Partidas expiradas ou
+finalizadas nunca são relidas, então o custo acompanha as partidas em aberto
+(próximas horas), não o tamanho da tabela.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import and_, not_
+from sqlalchemy.orm import Session
+
+from models_rapidapi import Match
+from match_time import utc_now, kickoff_status, LIVE_WINDOW_BEFORE, LIVE_WINDOW_AFTER
+
+logger = logging.getLogger(__name__)
+
+MATCH_STATUSES = ("scheduled", "live", "expired", "finished")
+OPEN_STATUSES = ("scheduled", "live")
+
+
+def initial_status(kickoff: Optional[datetime]) -> str:
+    """Status de uma partida nova sem placar (na ingestão)"""
+    return kickoff_status(kickoff, utc_now())
+
+
+def refresh_match_statuses(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Aplica as transições de status vencidas (sem commit; serve como job do db_writer)
+
+    - scheduled -> live: início entre 2h à frente e 30min atrás
+    - scheduled/live -> finished: início há mais de 30min, com placar
+    - scheduled/live -> expired: início há mais de 30min, sem placar
+    - live -> scheduled: início remarcado para mais de 2h à frente
+
+    Args:
+        db: Sessão do banco
+        now: Horário UTC (None = agora)
+
+    Returns:
+        Partidas que mudaram para cada status
+    """
+    now = now or utc_now()
+    live_from = now - LIVE_WINDOW_AFTER
+    live_until = now + LIVE_WINDOW_BEFORE
+    has_score = and_(Match.goals_home.isnot(None), Match.goals_away.isnot(None))
+
+    def _move(target: str, *criteria) -> int:
+        return db.query(Match).filter(*criteria).update({Match.status: target}, synchronize_session=False)
+
+    ended = (Match.status.in_(OPEN_STATUSES), Match.kickoff_at < live_from)
+    changes = {
+        "live": _move("live", Match.status == "scheduled", Match.kickoff_at.between(live_from, live_until)),
+        "finished": _move("finished", *ended, has_score),
+        "expired": _move("expired", *ended, not_(has_score)),
+        "scheduled": _move("scheduled", Match.status == "live", Match.kickoff_at > live_until)
+    }
+
+    if any(changes.values()):
+        logger.debug(f"🕐 Status atualizados: {changes}")
+    return changes
@@ -0,0 +1,86 @@
+"""
+Horário das partidas: conversões entre horário do site e UTC
+A API informa só hora/minuto ("19.50") no horário do site, que é o horário
+local + SITE_TIME_OFFSET_HOURS (se no PC é 12:22, no site são 16:22).
+Match.kickoff_at guarda o início em UTC, calculado uma única vez na ingestão;
+as consultas de janela de tempo comparam kickoff_at com utc_now().
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config import SITE_TIME_OFFSET_HOURS
+
+SITE_TIME_OFFSET = timedelta(hours=SITE_TIME_OFFSET_HOURS)
+
+
+def site_now() -> datetime:
+    """Horário do site (local + SITE_TIME_OFFSET_HOURS)"""
+    return datetime.now() + SITE_TIME_OFFSET
+
+
+def utc_now() -> datetime:
+    """Agora em UTC (naive, como Match.kickoff_at)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def site_to_utc(value: datetime) -> datetime:
+    """Converte um horário do site (naive) para UTC (naive)"""
+    local = value - SITE_TIME_OFFSET
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_to_site(value: datetime) -> datetime:
+    """Converte um horário UTC (naive) para o horário do site (naive)"""
+    local = value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return local + SITE_TIME_OFFSET
+
+
+def site_kickoff(hour, minute, reference: datetime) -> Optional[datetime]:
+    """
+    Início da partida no horário do site a partir de hora/minuto
+
+    O dia é o que deixa o início mais perto de reference (horário do site da
+    coleta): /next-matchs traz partidas das próximas horas e /matchs das
+    últimas, então "23.58" coletado às 00:05 é de ontem e "00.02" coletado
+    às 23:50 é de amanhã.
+
+    Returns:
+        Datetime do início ou None se hora/minuto são inválidos
+    """
+    try:
+        kickoff = reference.replace(hour=int(hour), minute=int(minute), second=0, microsecond=0)
+    except (TypeError, ValueError):
+        return None
+
+    if kickoff - reference > timedelta(hours=12):
+        kickoff -= timedelta(days=1)
+    elif reference - kickoff > timedelta(hours=12):
+        kickoff += timedelta(days=1)
+    return kickoff
+
+
+def kickoff_at(hour, minute, scraped_at: datetime) -> Optional[datetime]:
+    """Início da partida em UTC (valor de Match.kickoff_at); scraped_at no horário do site"""
+    kickoff = site_kickoff(hour, minute, scraped_at)
+    return site_to_utc(kickoff) if kickoff is not None else None
+
+
+# Janelas de status a partir do início (partidas ainda sem placar)
+LIVE_WINDOW_BEFORE = timedelta(hours=2)  # A partir de 2h antes do início: "live"
+LIVE_WINDOW_AFTER = timedelta(minutes=30)  # Até 30min depois do início; depois: "expired"
+
+
+def kickoff_status(kickoff: Optional[datetime], now: datetime) -> str:
+    """
+    Status de uma partida sem placar: scheduled, live ou expired
+
+    Args:
+        kickoff: Match.kickoff_at (UTC); None = "scheduled"
+        now: utc_now()
+    """
+    if kickoff is None or kickoff - now > LIVE_WINDOW_BEFORE:
+        return "scheduled"
+    if now - kickoff < LIVE_WINDOW_AFTER:
+        return "live"
+    return "expired"
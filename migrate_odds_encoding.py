@@ -0,0 +1,94 @@
+"""
+Converte o odds_json das partidas para o formato compacto e mede o ganho
+O init_db() já converte as linhas antigas; este script faz o mesmo, roda
+VACUUM (SQLite) para devolver o espaço e mostra o tamanho antes/depois.
+
+Uso:
+    python migrate_odds_encoding.py
+    python migrate_odds_encoding.py --no-vacuum
+"""
+
+import argparse
+import os
+import time
+from typing import Dict
+
+from sqlalchemy import inspect, text
+
+from database_rapidapi import engine, upgrade_schema, migrate_odds_json
+
+
+def _odds_sizes() -> Dict[str, int]:
+    """Partidas com odds e bytes ocupados pelo odds_json (antigo + compacto)"""
+    columns = {col["name"] for col in inspect(engine).get_columns("matches")}
+    legacy = "COALESCE(SUM(LENGTH(odds_json)), 0)" if "odds_json" in columns else "0"
+    packed = "COALESCE(SUM(LENGTH(odds_packed)), 0)" if "odds_packed" in columns else "0"
+    with engine.connect() as conn:
+        matches, legacy_bytes, packed_bytes = conn.execute(text(
+            f"SELECT COUNT(*), {legacy}, {packed} FROM matches"
+        )).one()
+    return {"matches": matches, "odds_bytes": legacy_bytes + packed_bytes}
+
+
+def _file_size() -> int:
+    path = engine.url.database
+    if engine.dialect.name != "sqlite" or not path or not os.path.exists(path):
+        return 0
+    return os.path.getsize(path)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def run_migration(vacuum: bool = True) -> Dict:
+    """
+    Converte as linhas antigas e compara os tamanhos
+
+    Args:
+        vacuum: Roda VACUUM no final (SQLite; bloqueia o banco enquanto roda)
+
+    Returns:
+        Estatísticas da migração
+    """
+    before = _odds_sizes() if inspect(engine).has_table("matches") else {"matches": 0, "odds_bytes": 0}
+    file_before = _file_size()
+
+    started = time.perf_counter()
+    upgrade_schema()
+    converted = migrate_odds_json()
+
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+
+    after = _odds_sizes()
+    file_after = _file_size()
+
+    stats = {
+        "matches": after["matches"],
+        "converted": converted,
+        "odds_bytes_before": before["odds_bytes"],
+        "odds_bytes_after": after["odds_bytes"],
+        "file_bytes_before": file_before,
+        "file_bytes_after": file_after,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+    print(f"\n📦 odds_json: {_mb(stats['odds_bytes_before'])} → {_mb(stats['odds_bytes_after'])}", end="")
+    if stats["odds_bytes_before"]:
+        print(f" ({100 * (1 - stats['odds_bytes_after'] / stats['odds_bytes_before']):.0f}% menor)", end="")
+    print(f" em {stats['matches']} partidas")
+    if file_before:
+        print(f"💾 Arquivo do banco: {_mb(file_before)} → {_mb(file_after)}")
+    print(f"⏱️  {stats['seconds']}s")
+
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o odds_json para o formato compacto")
+    parser.add_argument("--no-vacuum", action="store_true", help="Não roda VACUUM no final")
+    args = parser.parse_args()
+
+    run_migration(vacuum=not args.no_vacuum)
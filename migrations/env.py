@@ -0,0 +1,59 @@
+"""
+Ambiente do Alembic: usa o engine do database_rapidapi (mesma URL, pool e
+PRAGMAs da aplicação) e os modelos de models_rapidapi como alvo
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from database_rapidapi import engine, IS_SQLITE
+from models_rapidapi import Base
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Gera o SQL das migrações sem conectar (alembic upgrade head --sql)"""
+    context.configure(
+        url=engine.url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=IS_SQLITE
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Aplica as migrações no banco configurado"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=IS_SQLITE  # SQLite não tem ALTER completo: migrações em lote
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
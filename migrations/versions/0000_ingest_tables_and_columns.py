@@ -0,0 +1,111 @@
+"""Tabelas e colunas da ingestão sobre o schema original
+
+Parte do schema da versão original (sem alembic_version) e chega ao que a
+0001 espera:
+
+- matches: sport_id, odds_packed (odds_json compacto; o texto antigo é
+  convertido pelo init_db, ver database_rapidapi.migrate_odds_json),
+  fingerprint e o índice parcial de pendentes (league, scraped_at)
+- scraper_logs: contadores de ligas/partidas sem mudança, resiliência e fontes
+- league_sync_state, odds_history e match_prices
+
+Bancos novos não passam por aqui: o init_db() cria o schema atual e marca a
+última revisão (stamp).
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+PENDING = "result IS NULL"
+
+SCRAPER_LOG_COLUMNS = [
+    sa.Column("matches_unchanged", sa.Integer(), nullable=True),
+    sa.Column("leagues_unchanged", sa.String(), nullable=True),
+    sa.Column("leagues_skipped", sa.Integer(), nullable=True),
+    sa.Column("retry_count", sa.Integer(), nullable=True),
+    sa.Column("failed_requests", sa.Integer(), nullable=True),
+    sa.Column("breaker_states", sa.JSON(), nullable=True),
+    sa.Column("source_stats", sa.JSON(), nullable=True),
+]
+
+
+def upgrade():
+    with op.batch_alter_table("matches") as batch:
+        batch.add_column(sa.Column("sport_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("odds_packed", sa.LargeBinary(), nullable=True))
+        batch.add_column(sa.Column("fingerprint", sa.String(), nullable=True))
+    op.create_index(
+        "ix_matches_pending_results", "matches", ["league", "scraped_at"],
+        sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING)
+    )
+
+    with op.batch_alter_table("scraper_logs") as batch:
+        for column in SCRAPER_LOG_COLUMNS:
+            batch.add_column(column.copy())
+
+    op.create_table(
+        "league_sync_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("league", sa.String(), nullable=True),
+        sa.Column("endpoint", sa.String(), nullable=True),
+        sa.Column("last_updated", sa.String(), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=True),
+        sa.Column("payload_hash", sa.String(), nullable=True),
+        sa.UniqueConstraint("league", "endpoint", name="uq_league_sync_state")
+    )
+    op.create_index("ix_league_sync_state_id", "league_sync_state", ["id"])
+    op.create_index("ix_league_sync_state_league", "league_sync_state", ["league"])
+
+    op.create_table(
+        "odds_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("match_id", sa.Integer(), sa.ForeignKey("matches.id"), nullable=False),
+        sa.Column("scraped_at", sa.DateTime(), nullable=False),
+        sa.Column("market", sa.String(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False)
+    )
+    op.create_index("ix_odds_history_match_time", "odds_history", ["match_id", "scraped_at"])
+    op.create_index("ix_odds_history_scraped_at", "odds_history", ["scraped_at"])
+
+    op.create_table(
+        "match_prices",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("match_id", sa.Integer(), sa.ForeignKey("matches.id"), nullable=False),
+        sa.Column("bookmaker", sa.String(), nullable=False),
+        sa.Column("external_id", sa.String(), nullable=True),
+        sa.Column("odd_home", sa.Float(), nullable=True),
+        sa.Column("odd_draw", sa.Float(), nullable=True),
+        sa.Column("odd_away", sa.Float(), nullable=True),
+        sa.Column("odds_packed", sa.LargeBinary(), nullable=True),
+        sa.Column("fingerprint", sa.String(), nullable=True),
+        sa.Column("scraped_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("match_id", "bookmaker", name="uq_match_prices_match_bookmaker")
+    )
+    op.create_index("ix_match_prices_match_id", "match_prices", ["match_id"])
+
+
+def downgrade():
+    op.drop_table("match_prices")
+    op.drop_table("odds_history")
+    op.drop_table("league_sync_state")
+
+    with op.batch_alter_table("scraper_logs") as batch:
+        for column in reversed(SCRAPER_LOG_COLUMNS):
+            batch.drop_column(column.name)
+
+    op.drop_index("ix_matches_pending_results", table_name="matches")
+    with op.batch_alter_table("matches") as batch:
+        batch.drop_column("fingerprint")
+        batch.drop_column("odds_packed")
+        batch.drop_column("sport_id")
@@ -0,0 +1,47 @@
+"""Índices compostos e parciais dos caminhos de consulta quentes
+
+Bancos antigos recebem os índices aqui; bancos novos já nascem com eles
+(create_all + stamp no init_db).
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+UNSCORED = "goals_home IS NULL OR goals_away IS NULL"
+SCORED = "goals_home IS NOT NULL AND goals_away IS NOT NULL"
+
+# (nome, colunas, predicado do índice parcial)
+INDEXES = [
+    ("ix_matches_status_result", ["status", "result"], None),
+    ("ix_matches_league_status", ["league", "status"], None),
+    ("ix_matches_status_match_date", ["status", "match_date"], None),
+    ("ix_matches_league_match_date", ["league", "match_date"], None),
+    ("ix_matches_match_date", ["match_date"], None),
+    ("ix_matches_hour_minute", ["hour", "minute"], None),
+    ("ix_matches_unscored", ["id"], UNSCORED),
+    ("ix_matches_scored", ["id"], SCORED),
+]
+
+
+def upgrade():
+    for name, columns, where in INDEXES:
+        partial = {"sqlite_where": sa.text(where), "postgresql_where": sa.text(where)} if where else {}
+        op.create_index(name, "matches", columns, **partial)
+
+    # Estatísticas para o planejador escolher os índices novos
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("ANALYZE matches")
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="matches")
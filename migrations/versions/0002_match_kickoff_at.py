@@ -0,0 +1,125 @@
+"""Início das partidas em UTC (matches.kickoff_at) com preenchimento das linhas antigas
+
+O kickoff_at é calculado na ingestão (match_time.kickoff_at); aqui as linhas
+gravadas antes da coluna recebem o valor a partir de hour/minute e scraped_at,
+com uma cópia congelada daquele cálculo (mudanças futuras em match_time.py
+não alteram o que esta revisão faz).
+O índice parcial de pendentes passa de (league, scraped_at) para
+(league, kickoff_at).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+from config import SITE_TIME_OFFSET_HOURS
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+PENDING = "result IS NULL"
+BATCH_SIZE = 1000
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Só as colunas usadas no preenchimento (com tipos, para o DateTime ser convertido)
+MATCHES = sa.table(
+    "matches",
+    sa.column("id", sa.Integer),
+    sa.column("hour", sa.String),
+    sa.column("minute", sa.String),
+    sa.column("scraped_at", sa.DateTime),
+    sa.column("kickoff_at", sa.DateTime)
+)
+
+
+def _kickoff_at(hour, minute, scraped_at: datetime) -> Optional[datetime]:
+    """
+    Início em UTC a partir de hora/minuto do site (match_time.kickoff_at desta revisão)
+
+    O dia é o que deixa o início mais perto de scraped_at (horário do site da
+    coleta); horário do site = local + SITE_TIME_OFFSET_HOURS.
+    """
+    try:
+        kickoff = scraped_at.replace(hour=int(hour), minute=int(minute), second=0, microsecond=0)
+    except (TypeError, ValueError):
+        return None
+
+    if kickoff - scraped_at > timedelta(hours=12):
+        kickoff -= timedelta(days=1)
+    elif scraped_at - kickoff > timedelta(hours=12):
+        kickoff += timedelta(days=1)
+
+    local = kickoff - timedelta(hours=SITE_TIME_OFFSET_HOURS)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _recreate_pending_index(columns):
+    op.drop_index("ix_matches_pending_results", table_name="matches")
+    op.create_index(
+        "ix_matches_pending_results", "matches", columns,
+        sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING)
+    )
+
+
+def _backfill(conn) -> int:
+    """Preenche kickoff_at em lotes (só linhas ainda sem valor)"""
+    filled = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(MATCHES.c.id, MATCHES.c.hour, MATCHES.c.minute, MATCHES.c.scraped_at).where(
+                MATCHES.c.kickoff_at.is_(None),
+                MATCHES.c.scraped_at.isnot(None),
+                MATCHES.c.id > last_id
+            ).order_by(MATCHES.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return filled
+
+        last_id = rows[-1].id
+        updates = []
+        for row in rows:
+            value = _kickoff_at(row.hour, row.minute, row.scraped_at)
+            if value is not None:
+                updates.append({"match_id": row.id, "value": value})
+
+        if updates:
+            conn.execute(
+                MATCHES.update().where(MATCHES.c.id == sa.bindparam("match_id")).values(
+                    kickoff_at=sa.bindparam("value")
+                ),
+                updates
+            )
+            filled += len(updates)
+
+
+def upgrade():
+    conn = op.get_bind()
+    op.add_column("matches", sa.Column("kickoff_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_matches_kickoff_at", "matches", ["kickoff_at"])
+    op.create_index("ix_matches_league_kickoff_at", "matches", ["league", "kickoff_at"])
+
+    filled = _backfill(conn)
+    logger.info(f"kickoff_at preenchido em {filled} partidas")
+    _recreate_pending_index(["league", "kickoff_at"])
+
+    if conn.dialect.name == "sqlite":
+        op.execute("ANALYZE matches")
+
+
+def downgrade():
+    _recreate_pending_index(["league", "scraped_at"])
+    op.drop_index("ix_matches_league_kickoff_at", table_name="matches")
+    op.drop_index("ix_matches_kickoff_at", table_name="matches")
+    with op.batch_alter_table("matches") as batch:
+        batch.drop_column("kickoff_at")
@@ -0,0 +1,27 @@
+"""Índice (status, kickoff_at) das transições de status em lote
+
+match_status.refresh_match_statuses só alcança partidas em status aberto
+(scheduled/live) por faixa de kickoff_at.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_matches_status_kickoff_at", "matches", ["status", "kickoff_at"])
+
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("ANALYZE matches")
+
+
+def downgrade():
+    op.drop_index("ix_matches_status_kickoff_at", table_name="matches")
@@ -0,0 +1,26 @@
+"""Remove o índice (status, match_date)
+
+/api/recommendations e predict.py buscam as próximas partidas por
+kickoff_at > agora AND result IS NULL (ix_matches_kickoff_at) desde que o
+status passou a ser gravado (scheduled vira live 2h antes do início);
+nenhuma consulta usa mais status = 'scheduled' ORDER BY match_date.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_matches_status_match_date", table_name="matches")
+
+
+def downgrade():
+    op.create_index("ix_matches_status_match_date", "matches", ["status", "match_date"])
@@ -0,0 +1,44 @@
+"""ON DELETE CASCADE nas chaves de match_prices e odds_history
+
+Apagar uma partida com odds de outra casa falhava (o ORM tentava
+match_id = NULL) e o histórico ficava órfão. Os modelos agora apagam os
+filhos em cascata; aqui a chave estrangeira do banco passa a fazer o mesmo.
+No SQLite a tabela é recriada (batch), pois não há ALTER de constraint.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLES = ("match_prices", "odds_history")
+
+# Nome das chaves sem nome (SQLite) dentro do batch
+NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _replace_match_fk(table: str, ondelete):
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys(table)
+    current = next(fk for fk in foreign_keys if fk["referred_table"] == "matches")
+    name = f"fk_{table}_match_id_matches"
+
+    with op.batch_alter_table(table, naming_convention=NAMING) as batch:
+        batch.drop_constraint(current["name"] or name, type_="foreignkey")
+        batch.create_foreign_key(name, "matches", ["match_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade():
+    for table in TABLES:
+        _replace_match_fk(table, "CASCADE")
+
+
+def downgrade():
+    for table in TABLES:
+        _replace_match_fk(table, None)
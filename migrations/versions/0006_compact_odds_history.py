@@ -0,0 +1,94 @@
+"""odds_history compacto: código do mercado e só as mudanças
+
+- market: chave do odds_json (texto) -> código SmallInteger (odds_codec.MARKET_CODES,
+  lista append-only); ticks de mercados fora da lista são descartados
+- price passa a ser a odd que valia ATÉ scraped_at (a atual fica no
+  matches.odds_json), então o primeiro tick de cada mercado, que só repetia a
+  odd de abertura da partida, deixa de existir
+- sai o índice avulso de scraped_at (nenhuma consulta filtra só por ele)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from odds_codec import MARKET_CODES
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+CODES_TABLE = "odds_history_market_codes"
+
+
+def _create_codes_table():
+    codes = op.create_table(
+        CODES_TABLE,
+        sa.Column("code", sa.SmallInteger, primary_key=True),
+        sa.Column("name", sa.String, nullable=False, unique=True)
+    )
+    op.bulk_insert(codes, [{"code": code, "name": name} for code, name in enumerate(MARKET_CODES)])
+
+
+def _create_history_table(name: str, market_type, price_nullable: bool):
+    op.create_table(
+        name,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "match_id", sa.Integer,
+            sa.ForeignKey("matches.id", ondelete="CASCADE", name="fk_odds_history_match_id_matches"),
+            nullable=False
+        ),
+        sa.Column("scraped_at", sa.DateTime, nullable=False),
+        sa.Column("market", market_type, nullable=False),
+        sa.Column("price", sa.Float, nullable=price_nullable)
+    )
+
+
+def _swap_tables(new_name: str):
+    op.drop_table("odds_history")
+    op.rename_table(new_name, "odds_history")
+    op.drop_table(CODES_TABLE)
+
+
+def upgrade():
+    _create_codes_table()
+    _create_history_table("odds_history_new", sa.SmallInteger, price_nullable=True)
+
+    # Tick i (odd nova) vira (horário do tick i, odd do tick i-1); o tick 1 cai
+    op.execute(f"""
+        INSERT INTO odds_history_new (match_id, scraped_at, market, price)
+        SELECT match_id, scraped_at, code, previous FROM (
+            SELECT h.match_id, h.scraped_at, c.code,
+                   LAG(h.price) OVER (PARTITION BY h.match_id, h.market ORDER BY h.scraped_at, h.id) AS previous,
+                   ROW_NUMBER() OVER (PARTITION BY h.match_id, h.market ORDER BY h.scraped_at, h.id) AS tick
+            FROM odds_history h JOIN {CODES_TABLE} c ON c.name = h.market
+        ) ticks
+        WHERE tick > 1
+        ORDER BY scraped_at
+    """)
+
+    _swap_tables("odds_history_new")
+    op.create_index("ix_odds_history_match_time", "odds_history", ["match_id", "scraped_at"])
+
+
+def downgrade():
+    """Volta o schema (mercado em texto); os ticks continuam com a odd anterior"""
+    _create_codes_table()
+    _create_history_table("odds_history_old", sa.String, price_nullable=False)
+
+    op.execute(f"""
+        INSERT INTO odds_history_old (match_id, scraped_at, market, price)
+        SELECT h.match_id, h.scraped_at, c.name, h.price
+        FROM odds_history h JOIN {CODES_TABLE} c ON c.code = h.market
+        WHERE h.price IS NOT NULL
+        ORDER BY h.id
+    """)
+
+    _swap_tables("odds_history_old")
+    op.create_index("ix_odds_history_match_time", "odds_history", ["match_id", "scraped_at"])
+    op.create_index("ix_odds_history_scraped_at", "odds_history", ["scraped_at"])
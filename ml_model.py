@@ -16,6 +16,7 @@ from typing import Dict, List, Tuple
 
 from database_rapidapi import get_db
 from models_rapidapi import Match, PredictionModel, Prediction
+from odds_schema import ML_ODDS_COLUMNS
 
 logger = logging.getLogger(__name__)
 
@@ -48,20 +49,7 @@ class GoalsPredictionModel:
         df['league_encoded'] = self.label_encoder_league.fit_transform(df['league'])
         
         # Features baseadas em odds
-        features = [
-            'league_encoded',
-            'odd_home',
-            'odd_draw', 
-            'odd_away',
-            'odd_over_25',
-            'odd_under_25',
-            'odd_both_score_yes',
-            'odd_both_score_no',
-            'odd_exact_goals_0',
-            'odd_exact_goals_1',
-            'odd_exact_goals_2',
-            'odd_exact_goals_3',
-        ]
+        features = ['league_encoded'] + ML_ODDS_COLUMNS
         
         # Features derivadas (probabilidades implícitas)
         df['prob_home'] = 1 / df['odd_home']
@@ -127,17 +115,7 @@ class GoalsPredictionModel:
                     'league': m.league,
                     'team_home': m.team_home,
                     'team_away': m.team_away,
-                    'odd_home': m.odd_home,
-                    'odd_draw': m.odd_draw,
-                    'odd_away': m.odd_away,
-                    'odd_over_25': m.odd_over_25,
-                    'odd_under_25': m.odd_under_25,
-                    'odd_both_score_yes': m.odd_both_score_yes,
-                    'odd_both_score_no': m.odd_both_score_no,
-                    'odd_exact_goals_0': m.odd_exact_goals_0,
-                    'odd_exact_goals_1': m.odd_exact_goals_1,
-                    'odd_exact_goals_2': m.odd_exact_goals_2,
-                    'odd_exact_goals_3': m.odd_exact_goals_3,
+                    **{column: getattr(m, column) for column in ML_ODDS_COLUMNS},
                     'total_goals': m.total_goals,
                     'result': m.result
                 })
@@ -0,0 +1,276 @@
+"""
+Servidor local que imita a RapidAPI (Futebol Virtual Bet365) para testes offline
+Implementa /next-matchs, /matchs e /last-updated a partir dos JSONs de exemplo
+do repositório (rapidapi_*.json), sem gastar cota.
+
+- Latência configurável (média + jitter)
+- Taxa de erro configurável (HTTP 503 com Retry-After)
+- Tamanho do payload (partidas por liga em /next-matchs e /matchs)
+- Rollover dos IDs: a cada N segundos a partida mais antiga "termina",
+  vira resultado em /matchs e uma partida nova entra em /next-matchs
+
+Uso:
+    python mock_rapidapi_server.py                       # porta 8765
+    python mock_rapidapi_server.py --latency 300 --jitter 200 --error-rate 0.05
+    python mock_rapidapi_server.py --matches 50 --results 200 --rollover 10
+
+    # Em outro terminal, aponte o cliente para o servidor local:
+    RAPIDAPI_BASE_URL=http://127.0.0.1:8765 python main_rapidapi.py once
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from aiohttp import web
+
+from match_time import SITE_TIME_OFFSET
+
+BASE_DIR = Path(__file__).resolve().parent
+
+NEXT_MATCHES_FIXTURE = BASE_DIR / "rapidapi_all_leagues_next_matchs.json"
+NEXT_MATCHES_EURO_FIXTURE = BASE_DIR / "rapidapi_next_matchs_euro.json"
+RESULTS_FIXTURE = BASE_DIR / "rapidapi_matchs_euro.json"
+
+LEAGUES = ["express", "copa", "super", "euro", "premier"]
+
+logger = logging.getLogger(__name__)
+
+
+def load_templates() -> Dict[str, List[Dict]]:
+    """
+    Carrega partidas de exemplo por liga a partir dos fixtures
+
+    Returns:
+        {liga: [partida, ...]} (ligas sem fixture usam as partidas da euro)
+    """
+    templates: Dict[str, List[Dict]] = {}
+
+    if NEXT_MATCHES_FIXTURE.exists():
+        with open(NEXT_MATCHES_FIXTURE, encoding="utf-8") as f:
+            for league, payload in json.load(f).items():
+                if payload and payload.get("matchs"):
+                    templates[league] = payload["matchs"]
+
+    with open(NEXT_MATCHES_EURO_FIXTURE, encoding="utf-8") as f:
+        euro = json.load(f)["matchs"]
+    templates.setdefault("euro", euro)
+
+    for league in LEAGUES:
+        templates.setdefault(league, euro)
+
+    return templates
+
+
+def load_result_template() -> Dict:
+    """Carrega um resultado de exemplo (campos de /matchs além das odds)"""
+    with open(RESULTS_FIXTURE, encoding="utf-8") as f:
+        return json.load(f)["matchs"][0]
+
+
+class MockRapidAPI:
+    """Estado e geração das respostas do servidor falso"""
+
+    def __init__(
+        self,
+        matches: int = 5,
+        results: int = 20,
+        rollover: float = 60.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        odds_drift: float = 0.0,
+        seed: int = 42
+    ):
+        """
+        Args:
+            matches: Partidas por liga em /next-matchs
+            results: Resultados por liga em /matchs
+            rollover: Segundos entre partidas (rollover dos IDs); 0 = IDs fixos
+            latency_ms: Latência média (ms)
+            jitter_ms: Variação máxima (ms) somada à latência
+            error_rate: Fração de requisições que respondem HTTP 503
+            retry_after: Valor do header Retry-After nos erros (s)
+            odds_drift: Variação relativa máxima das odds entre rollovers (0 = odds fixas)
+            seed: Semente dos dados gerados (respostas reprodutíveis)
+        """
+        self.matches = matches
+        self.results = results
+        self.rollover = rollover
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.odds_drift = odds_drift
+        self.seed = seed
+
+        self.templates = load_templates()
+        self.result_template = load_result_template()
+        self.started_at = time.time()
+        self.stats = {"requests": 0, "errors": 0}
+
+    def current_slot(self) -> int:
+        """Índice da partida que está em andamento agora"""
+        if self.rollover <= 0:
+            return 0
+        return int((time.time() - self.started_at) // self.rollover)
+
+    def _kickoff(self, slot: int) -> datetime:
+        """Início no horário do site (local + SITE_TIME_OFFSET_HOURS), como a API real"""
+        interval = self.rollover if self.rollover > 0 else 60.0
+        return datetime.fromtimestamp(self.started_at + slot * interval) + SITE_TIME_OFFSET
+
+    def _match_id(self, league: str, slot: int) -> str:
+        return str(1_000_000 * (LEAGUES.index(league) + 1 if league in LEAGUES else 9) + slot)
+
+    def _build_match(self, league: str, slot: int) -> Dict:
+        """Partida de /next-matchs para o slot (odds estáveis dentro do mesmo rollover)"""
+        templates = self.templates.get(league) or self.templates["euro"]
+        template = templates[slot % len(templates)]
+        kickoff = self._kickoff(slot)
+
+        odds = dict(template.get("odds", {}))
+        if self.odds_drift > 0:
+            rng = random.Random(f"{self.seed}:{league}:{slot}:{self.current_slot()}")
+            for key, value in odds.items():
+                try:
+                    odds[key] = f"{float(value) * (1 + rng.uniform(-self.odds_drift, self.odds_drift)):.2f}"
+                except (TypeError, ValueError):
+                    continue
+
+        return {
+            "id": self._match_id(league, slot),
+            "hora": f"{kickoff.hour:02d}",
+            "minuto": f"{kickoff.minute:02d}",
+            "competition": league,
+            "timeA": template.get("timeA"),
+            "timeB": template.get("timeB"),
+            "horario": f"{kickoff.hour:02d}.{kickoff.minute:02d}",
+            "odds": odds
+        }
+
+    def _build_result(self, league: str, slot: int) -> Dict:
+        """Resultado de /matchs para um slot que já terminou"""
+        match = self._build_match(league, slot)
+        rng = random.Random(f"{self.seed}:{league}:{slot}:result")
+        goals_home, goals_away = rng.randint(0, 4), rng.randint(0, 3)
+        ht_home, ht_away = rng.randint(0, goals_home), rng.randint(0, goals_away)
+        score = f"{goals_home}-{goals_away}"
+
+        result = dict(self.result_template)
+        result.update({
+            "id": match["id"],
+            "hora": match["hora"],
+            "minuto": match["minuto"],
+            "horario": match["horario"],
+            "timeA": match["timeA"],
+            "timeB": match["timeB"],
+            "odds": match["odds"],
+            "resultado": score,
+            "resultadoFt": score,
+            "resultadoHt": f"{ht_home}-{ht_away}",
+            "created_at": self._kickoff(slot).strftime("%Y-%m-%d %H:%M:%S")
+        })
+        return result
+
+    def next_matches(self, league: str) -> Dict:
+        slot = self.current_slot()
+        matchs = [self._build_match(league, s) for s in range(slot + 1, slot + 1 + self.matches)]
+        return {"status": True, "returned_matchs": len(matchs), "league": league, "matchs": matchs}
+
+    def finished_matches(self, league: str) -> Dict:
+        slot = self.current_slot()
+        matchs = [self._build_result(league, s) for s in range(slot, slot - self.results, -1)]
+        return {"status": True, "returned_matchs": len(matchs), "league": league, "matchs": matchs}
+
+    def last_updated(self, league: str) -> Dict:
+        return {
+            "status": True,
+            "league": league,
+            "last_updated": self._kickoff(self.current_slot()).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    async def simulate_network(self) -> bool:
+        """Aplica latência e sorteia erro; retorna False se a requisição deve falhar"""
+        self.stats["requests"] += 1
+
+        delay_ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.error_rate > 0 and random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return False
+        return True
+
+
+def create_app(mock: MockRapidAPI) -> web.Application:
+    """Cria a aplicação aiohttp com os três endpoints da RapidAPI"""
+
+    def _handler(build):
+        async def handler(request: web.Request) -> web.Response:
+            form = await request.post()
+            league = form.get("league", "euro")
+
+            if not await mock.simulate_network():
+                return web.json_response(
+                    {"message": "Service Unavailable (mock)"},
+                    status=503,
+                    headers={"Retry-After": str(mock.retry_after)}
+                )
+
+            return web.json_response(build(league))
+        return handler
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response({**mock.stats, "current_slot": mock.current_slot()})
+
+    app = web.Application()
+    app.router.add_post("/next-matchs", _handler(mock.next_matches))
+    app.router.add_post("/matchs", _handler(mock.finished_matches))
+    app.router.add_post("/last-updated", _handler(mock.last_updated))
+    app.router.add_get("/_stats", stats)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita a RapidAPI do Futebol Virtual")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--matches", type=int, default=5, help="Partidas por liga em /next-matchs")
+    parser.add_argument("--results", type=int, default=20, help="Resultados por liga em /matchs")
+    parser.add_argument("--rollover", type=float, default=60.0, help="Segundos entre partidas (0 = IDs fixos)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência média em ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Jitter máximo em ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas HTTP 503 (0-1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After (s) enviado nos erros")
+    parser.add_argument("--odds-drift", type=float, default=0.0, help="Variação relativa das odds por rollover")
+    parser.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+
+    mock = MockRapidAPI(
+        matches=args.matches,
+        results=args.results,
+        rollover=args.rollover,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        odds_drift=args.odds_drift,
+        seed=args.seed
+    )
+
+    logger.info(f"🧪 Mock RapidAPI em http://{args.host}:{args.port}")
+    logger.info(f"   Use: RAPIDAPI_BASE_URL=http://{args.host}:{args.port}")
+
+    web.run_app(create_app(mock), host=args.host, port=args.port, print=None)
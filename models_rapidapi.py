@@ -3,11 +3,13 @@ Modelos de banco de dados expandidos para dados da RapidAPI
 Inclui todas as odds para análise de padrões e machine learning
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, UniqueConstraint, Index, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 
+from odds_codec import PackedOdds
+
 Base = declarative_base()
 
 
@@ -17,11 +19,48 @@ class Match(Base):
     Permite análise histórica e previsão de padrões
     """
     __tablename__ = "matches"
+    __table_args__ = (
+        # Partidas aguardando resultado (parcial: só linhas com result NULL, fica pequeno)
+        # results_collector.pending_result_leagues: league IN (...) AND kickoff_at BETWEEN ...
+        Index(
+            "ix_matches_pending_results", "league", "kickoff_at",
+            sqlite_where=text("result IS NULL"),
+            postgresql_where=text("result IS NULL")
+        ),
+        
+        # Índices dos caminhos de consulta quentes (migração 0001 do Alembic;
+        # check_query_plans.py confere que cada consulta usa o seu)
+        # validate_predictions, /api/analytics/overview: status = ? AND result IS NOT NULL
+        Index("ix_matches_status_result", "status", "result"),
+        # /api/analytics/overview: contagem por liga e status (varre só o índice)
+        Index("ix_matches_league_status", "league", "status"),
+        # /api/export/csv (com e sem liga) e /api/analytics/timeline: ORDER/GROUP BY match_date
+        Index("ix_matches_league_match_date", "league", "match_date"),
+        Index("ix_matches_match_date", "match_date"),
+        # match_status.refresh_match_statuses: status IN ('scheduled', 'live') AND kickoff_at < ...
+        Index("ix_matches_status_kickoff_at", "status", "kickoff_at"),
+        # poll_planner: league IN (...) AND kickoff_at > agora (próximas partidas por liga)
+        Index("ix_matches_league_kickoff_at", "league", "kickoff_at"),
+        # /api/predict, predict_match.py: hour = ? AND minute = ?
+        Index("ix_matches_hour_minute", "hour", "minute"),
+        # /api/matches?status=scheduled|finished ORDER BY id DESC (parciais, predicado igual ao da consulta)
+        Index(
+            "ix_matches_unscored", "id",
+            sqlite_where=text("goals_home IS NULL OR goals_away IS NULL"),
+            postgresql_where=text("goals_home IS NULL OR goals_away IS NULL")
+        ),
+        Index(
+            "ix_matches_scored", "id",
+            sqlite_where=text("goals_home IS NOT NULL AND goals_away IS NOT NULL"),
+            postgresql_where=text("goals_home IS NOT NULL AND goals_away IS NOT NULL")
+        ),
+    )
     
     # Identificação
     id = Column(Integer, primary_key=True, index=True)
     external_id = Column(String, unique=True, index=True)  # ID da RapidAPI
     league = Column(String, index=True)  # express, copa, super, euro, premier
+    sport_id = Column(Integer, default=1)  # sport_id da RapidAPI (1 = Futebol Virtual)
     
     # Times
     team_home = Column(String)
@@ -31,6 +70,9 @@ class Match(Base):
     hour = Column(String)
     minute = Column(String)
     scheduled_time = Column(String)  # "19.53"
+    # Início em UTC (match_time.kickoff_at, calculado na ingestão)
+    # ix_matches_kickoff_at: /api/recommendations e predict.py (kickoff_at > agora ORDER BY kickoff_at)
+    kickoff_at = Column(DateTime, nullable=True, index=True)
     
     # Resultado (preenchido após partida finalizar)
     goals_home = Column(Integer, nullable=True)
@@ -100,22 +142,81 @@ class Match(Base):
     odd_handicap_home = Column(Float, nullable=True)
     odd_handicap_away = Column(Float, nullable=True)
     
-    # JSON com TODAS as odds (backup completo para análises futuras)
-    odds_json = Column(JSON, nullable=True)
+    # TODAS as odds (backup completo para análises futuras), em formato compacto
+    # na coluna odds_packed; só é lida/decodificada quando acessada (deferred)
+    odds_json = deferred(Column("odds_packed", PackedOdds, key="odds_json", nullable=True))
     
     # Metadados
     scraped_at = Column(DateTime, default=datetime.utcnow, index=True)
     match_date = Column(DateTime, nullable=True)  # Data/hora real da partida
-    status = Column(String, default="scheduled")  # scheduled, live, finished
+    status = Column(String, default="scheduled")  # scheduled, live, expired, finished (match_status.py)
+    fingerprint = Column(String, nullable=True)  # Hash de horário + odds (pula regravação sem mudança)
     
     # Relacionamento
     scraper_log_id = Column(Integer, ForeignKey("scraper_logs.id"), nullable=True)
     scraper_log = relationship("ScraperLog", back_populates="matches")
     
+    # Odds das outras casas de apostas (uma linha por casa) e histórico das odds;
+    # apagados junto com a partida (clean_old_matches.py)
+    prices = relationship("MatchPrice", back_populates="match", cascade="all, delete-orphan")
+    odds_history = relationship("OddsHistory", cascade="all, delete-orphan")
+    
     def __repr__(self):
         return f"<Match {self.external_id}: {self.team_home} vs {self.team_away} ({self.league})>"
 
 
+class OddsHistory(Base):
+    """
+    Histórico das odds (append-only): uma linha por mercado cuja odd mudou
+    Fica fora da tabela matches para não inchar as consultas do dia a dia.
+    Guarda a odd que valia até scraped_at; a de agora é a do Match.odds_json
+    (ver odds_history.py).
+    """
+    __tablename__ = "odds_history"
+    __table_args__ = (
+        Index("ix_odds_history_match_time", "match_id", "scraped_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    scraped_at = Column(DateTime, nullable=False)  # Horário do site em que a odd mudou (como Match.scraped_at)
+    market = Column(SmallInteger, nullable=False)  # Código do mercado (odds_codec.MARKET_CODES)
+    price = Column(Float, nullable=True)  # Odd anterior à mudança (None = mercado ainda não existia)
+    
+    def __repr__(self):
+        return f"<OddsHistory {self.match_id} {self.market}={self.price} @ {self.scraped_at}>"
+
+
+class MatchPrice(Base):
+    """
+    Odds de uma casa de apostas (além da principal) para uma partida
+    A partida continua sendo uma linha só em matches (com as odds da casa
+    principal); cada outra casa ganha uma linha aqui.
+    """
+    __tablename__ = "match_prices"
+    __table_args__ = (UniqueConstraint("match_id", "bookmaker", name="uq_match_prices_match_bookmaker"),)
+    
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), nullable=False, index=True)
+    bookmaker = Column(String, nullable=False)  # Parâmetro "home" da RapidAPI
+    external_id = Column(String, nullable=True)  # ID da partida nessa casa
+    
+    # Resultado Final (as demais odds ficam no odds_json)
+    odd_home = Column(Float, nullable=True)
+    odd_draw = Column(Float, nullable=True)
+    odd_away = Column(Float, nullable=True)
+    odds_json = deferred(Column("odds_packed", PackedOdds, key="odds_json", nullable=True))
+    
+    fingerprint = Column(String, nullable=True)  # Hash das odds (pula regravação sem mudança)
+    scraped_at = Column(DateTime, nullable=True)  # Horário do site na primeira coleta
+    updated_at = Column(DateTime, nullable=True)  # Horário do site na última mudança
+    
+    match = relationship("Match", back_populates="prices")
+    
+    def __repr__(self):
+        return f"<MatchPrice {self.match_id} {self.bookmaker}: {self.odd_home}/{self.odd_draw}/{self.odd_away}>"
+
+
 class ScraperLog(Base):
     """
     Log de execuções do scraper
@@ -127,11 +228,20 @@ class ScraperLog(Base):
     matches_found = Column(Integer, default=0)
     matches_new = Column(Integer, default=0)
     matches_updated = Column(Integer, default=0)
+    matches_unchanged = Column(Integer, default=0)  # Partidas sem nenhuma mudança (não regravadas)
     leagues_scraped = Column(String, nullable=True)  # "express,copa,euro"
+    leagues_unchanged = Column(String, nullable=True)  # Ligas sem nenhuma partida alterada
+    leagues_skipped = Column(Integer, default=0)  # Ligas não consultadas (sem novidades / sem resultado pendente)
     error_message = Column(Text, nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow)
     finished_at = Column(DateTime, nullable=True)
-    scraper_mode = Column(String, default="rapidapi")  # rapidapi ou selenium
+    scraper_mode = Column(String, default="rapidapi")  # rapidapi, rapidapi_results ou selenium
+    
+    # Resiliência das requisições
+    retry_count = Column(Integer, default=0)  # Retentativas feitas no ciclo
+    failed_requests = Column(Integer, default=0)  # Requisições que falharam após as retentativas
+    breaker_states = Column(JSON, nullable=True)  # {liga: {state, consecutive_failures, ...}}
+    source_stats = Column(JSON, nullable=True)  # {célula: {found, new, updated, unchanged, ...}}
     
     # Relacionamento
     matches = relationship("Match", back_populates="scraper_log")
@@ -140,6 +250,27 @@ class ScraperLog(Base):
         return f"<ScraperLog {self.id}: {self.status} - {self.matches_found} matches>"
 
 
+class LeagueSyncState(Base):
+    """
+    Último valor de /last-updated processado por liga e endpoint
+    Usado pelo modo incremental para pular ligas sem novidades e pela
+    ingestão para pular payloads idênticos ao anterior
+    """
+    __tablename__ = "league_sync_state"
+    __table_args__ = (UniqueConstraint("league", "endpoint", name="uq_league_sync_state"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    league = Column(String, index=True)
+    endpoint = Column(String)  # next-matchs, matchs
+    last_updated = Column(String, nullable=True)  # Valor bruto retornado pela API
+    checked_at = Column(DateTime, nullable=True)  # Última consulta a /last-updated
+    synced_at = Column(DateTime, nullable=True)  # Última coleta completa
+    payload_hash = Column(String, nullable=True)  # SHA-1 do último payload gravado (pula ingestão idêntica)
+    
+    def __repr__(self):
+        return f"<LeagueSyncState {self.league}/{self.endpoint}: {self.last_updated}>"
+
+
 class PredictionModel(Base):
     """
     Modelo para armazenar previsões de machine learning
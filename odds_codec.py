@@ -0,0 +1,322 @@
+"""
+Codificação compacta do odds_json das partidas
+O dicionário completo de odds da API (~90 mercados com chaves longas, ~4 KB
+de JSON por partida) é gravado como:
+
+    cabeçalho (1 byte: versão + flags)
+    corpo (opcionalmente comprimido com zlib):
+        tamanho do bitmap (varint) + bitmap dos mercados presentes
+        odds dos mercados presentes, na ordem dos códigos, em uint32 (milésimos)
+        casas decimais de cada odd (2 bits por odd)
+        [extras] JSON com mercados fora do dicionário / valores em outro formato
+
+O código de cada mercado é sua posição em MARKET_CODES. A lista é
+append-only: mercados novos entram no fim (nunca remover ou reordenar,
+senão as linhas já gravadas passam a decodificar errado). Um mercado que
+ainda não está na lista continua sendo gravado, só que nos extras.
+
+As odds voltam exatamente como vieram da API: a string "2.30" volta "2.30"
+(milésimos + casas decimais). Valores que não são string decimal com até 3
+casas (números, "-", "1e3"...) vão para os extras e voltam com o tipo original.
+Linhas da versão 1 (odds gravadas como número) voltam como string com ao menos
+2 casas (2.3 -> "2.30"), o formato que a API usa.
+"""
+
+import json
+import re
+import struct
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from config import ODDS_JSON_COMPRESS
+
+# Append-only: a posição é o código gravado no banco
+MARKET_CODES: Tuple[str, ...] = (
+    # Resultado Final
+    "odd_resultado_final_casa",
+    "odd_resultado_final_empate",
+    "odd_resultado_final_fora",
+
+    # Over/Under
+    "odd_over_0.5",
+    "odd_under_0.5",
+    "odd_over_1.5",
+    "odd_under_1.5",
+    "odd_over_2.5",
+    "odd_under_2.5",
+    "odd_over_3.5",
+    "odd_under_3.5",
+
+    # Ambas Marcam
+    "odd_ambas_sim",
+    "odd_ambas_nao",
+
+    # Resultado Correto
+    "odd_resultado_correto_casa_1-0",
+    "odd_resultado_correto_empate_0-0",
+    "odd_resultado_correto_fora_1-0",
+    "odd_resultado_correto_casa_2-0",
+    "odd_resultado_correto_empate_1-1",
+    "odd_resultado_correto_fora_2-0",
+    "odd_resultado_correto_casa_2-1",
+    "odd_resultado_correto_empate_2-2",
+    "odd_resultado_correto_fora_2-1",
+    "odd_resultado_correto_casa_3-0",
+    "odd_resultado_correto_empate_out",
+    "odd_resultado_correto_fora_3-0",
+    "odd_resultado_correto_casa_3-1",
+    "odd_resultado_correto_fora_3-1",
+    "odd_resultado_correto_casa_3-2",
+    "odd_resultado_correto_fora_3-2",
+    "odd_resultado_correto_casa_4-0",
+    "odd_resultado_correto_fora_4-0",
+    "odd_resultado_correto_casa_out",
+    "odd_resultado_correto_fora_out",
+
+    # Resultado Correto (grupos)
+    "odd_resultado_correto_grupo_casa_1-0_2-0_2-1",
+    "odd_resultado_correto_grupo_empate_0-0",
+    "odd_resultado_correto_grupo_fora_1-0_2-0_2-1",
+    "odd_resultado_correto_grupo_casa_3-0_3-1_4-0",
+    "odd_resultado_correto_grupo_empate_1-1_2-2",
+    "odd_resultado_correto_grupo_fora_3-0_3-1_4-0",
+    "odd_resultado_correto_grupo_casa_out",
+    "odd_resultado_correto_grupo_empate_3-3_4-4",
+    "odd_resultado_correto_grupo_fora_out",
+
+    # Resultado + Ambas Marcam
+    "odd_resultado_ambos_times_marcam_sim_casa",
+    "odd_resultado_ambos_times_marcam_sim_fora",
+    "odd_resultado_ambos_times_marcam_sim_empate",
+    "odd_resultado_ambos_times_marcam_nao_casa",
+    "odd_resultado_ambos_times_marcam_nao_fora",
+    "odd_resultado_ambos_times_marcam_nao_empate",
+
+    # Dupla Hipótese
+    "odd_dupla_hipotese_casa_ou_empate",
+    "odd_dupla_hipotese_fora_ou_empate",
+    "odd_dupla_hipotese_casa_ou_fora",
+
+    # Total de Gols Exatos
+    "odd_total_gols_extatos_0",
+    "odd_total_gols_extatos_1",
+    "odd_total_gols_extatos_2",
+    "odd_total_gols_extatos_3",
+    "odd_total_gols_extatos_4",
+    "odd_total_gols_extatos_5",
+
+    # Intervalo
+    "odd_intervalo_resultado_casa",
+    "odd_intervalo_resultado_empate",
+    "odd_intervalo_resultado_fora",
+    "odd_resultado_correto_intervalo_casa_1-0",
+    "odd_resultado_correto_intervalo_fora_1-0",
+    "odd_resultado_correto_intervalo_empate_0-0",
+    "odd_resultado_correto_intervalo_casa_2-0",
+    "odd_resultado_correto_intervalo_fora_2-0",
+    "odd_resultado_correto_intervalo_empate_1-1",
+    "odd_resultado_correto_intervalo_empate_out",
+
+    # Gols por Time
+    "odd_time_gols_casa_0",
+    "odd_time_gols_fora_0",
+    "odd_time_gols_casa_1",
+    "odd_time_gols_fora_1",
+    "odd_time_gols_casa_2",
+    "odd_time_gols_fora_2",
+    "odd_time_gols_casa_3",
+    "odd_time_gols_fora_3",
+    "odd_time_gols_casa_4",
+    "odd_time_gols_fora_4",
+    "odd_time_gols_casa_5",
+    "odd_time_gols_fora_5",
+
+    # Handicap (resultado)
+    "odd_handicap_resultado_casa_menos_2.0",
+    "odd_handicap_resultado_empate_mais_2.0",
+    "odd_handicap_resultado_fora_mais_2.0",
+    "odd_handicap_resultado_casa_menos_1.0",
+    "odd_handicap_resultado_empate_mais_1.0",
+    "odd_handicap_resultado_fora_mais_1.0",
+    "odd_handicap_resultado_casa_mais_1.0",
+    "odd_handicap_resultado_empate_menos_1.0",
+    "odd_handicap_resultado_fora_menos_1.0",
+    "odd_handicap_resultado_casa_mais_2.0",
+    "odd_handicap_resultado_empate_menos_2.0",
+    "odd_handicap_resultado_fora_menos_2.0",
+
+    # Handicap Asiático
+    "odd_handicap_asiatico_casa",
+    "odd_handicap_asiatico_fora",
+)
+
+MARKET_INDEX: Dict[str, int] = {market: code for code, market in enumerate(MARKET_CODES)}
+
+FORMAT_VERSION = 2
+LEGACY_VERSION = 1  # Odds em número (uint32 em milésimos ou float64), sem casas decimais
+
+# Flags do cabeçalho (4 bits baixos; a versão fica nos 4 bits altos)
+FLAG_ZLIB = 0x01
+FLAG_FLOAT64 = 0x02  # Só na versão 1
+FLAG_EXTRAS = 0x04
+
+_MILLI_MAX = 2 ** 32 - 1
+
+# Odd gravada em milésimos: string decimal com até 3 casas
+_PRICE = re.compile(r"(0|[1-9][0-9]*)(?:\.([0-9]{1,3}))?")
+
+# Bits ligados de cada byte do bitmap (decodificação sem laço por bit)
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256))
+
+
+def _to_milli(value: Any) -> Optional[Tuple[int, int]]:
+    """"2.30" -> (2300, 2); None se o valor não volta idêntico dos milésimos"""
+    if not isinstance(value, str):
+        return None
+    match = _PRICE.fullmatch(value)
+    if match is None:
+        return None
+    whole, fraction = match.group(1), match.group(2) or ""
+    milli = int(whole) * 1000 + int(fraction.ljust(3, "0"))
+    return (milli, len(fraction)) if milli <= _MILLI_MAX else None
+
+
+def _format_milli(milli: int, places: int) -> str:
+    """(2300, 2) -> "2.30" (inverso de _to_milli)"""
+    whole, fraction = divmod(milli, 1000)
+    if not places:
+        return str(whole)
+    return f"{whole}.{str(fraction).zfill(3)[:places]}"
+
+
+def _format_legacy(price: float) -> str:
+    """Odd numérica da versão 1 -> string com ao menos 2 casas (2.3 -> "2.30")"""
+    text = f"{price:.2f}"
+    return text if float(text) == price else repr(price)
+
+
+def _write_varint(value: int, out: bytearray):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_odds(odds: Dict[str, Any], compress: bool = ODDS_JSON_COMPRESS) -> bytes:
+    """
+    odds_json da API -> bytes compactos
+
+    Args:
+        odds: {mercado: odd} como veio da API
+        compress: Tenta zlib (só usa se ficar menor)
+    """
+    coded = []
+    extras = {}
+    for market, value in odds.items():
+        code = MARKET_INDEX.get(market)
+        price = _to_milli(value) if code is not None else None
+        if price is None:
+            extras[market] = value
+        else:
+            coded.append((code,) + price)
+    coded.sort()
+
+    flags = 0
+    bitmap = bytearray((coded[-1][0] // 8 + 1) if coded else 0)
+    places = bytearray((len(coded) + 3) // 4)
+    for index, (code, _, decimals) in enumerate(coded):
+        bitmap[code // 8] |= 1 << (code % 8)
+        places[index // 4] |= decimals << (2 * (index % 4))
+
+    body = bytearray()
+    _write_varint(len(bitmap), body)
+    body += bitmap
+    body += struct.pack(f"<{len(coded)}I", *(milli for _, milli, _ in coded))
+    body += places
+    if extras:
+        flags |= FLAG_EXTRAS
+        body += json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    body = bytes(body)
+    if compress:
+        compressed = zlib.compress(body, 6)
+        if len(compressed) < len(body):
+            flags |= FLAG_ZLIB
+            body = compressed
+
+    return bytes([(FORMAT_VERSION << 4) | flags]) + body
+
+
+def decode_odds(data: bytes) -> Dict[str, Any]:
+    """bytes compactos -> {mercado: odd} (odds como a API mandou, ex: "2.30")"""
+    header = data[0]
+    version, flags = header >> 4, header & 0x0F
+    if version not in (FORMAT_VERSION, LEGACY_VERSION):
+        raise ValueError(f"Versão de odds_json desconhecida: {version}")
+
+    body = data[1:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    size, pos = _read_varint(body, 0)
+    bitmap = body[pos:pos + size]
+    pos += size
+
+    codes = [
+        index * 8 + bit
+        for index, byte in enumerate(bitmap)
+        for bit in _BYTE_BITS[byte]
+    ]
+
+    if version == LEGACY_VERSION:
+        if flags & FLAG_FLOAT64:
+            end = pos + 8 * len(codes)
+            numbers = struct.unpack_from(f"<{len(codes)}d", body, pos)
+        else:
+            end = pos + 4 * len(codes)
+            numbers = [m / 1000 for m in struct.unpack_from(f"<{len(codes)}I", body, pos)]
+        prices = [_format_legacy(number) for number in numbers]
+    else:
+        milli = struct.unpack_from(f"<{len(codes)}I", body, pos)
+        pos += 4 * len(codes)
+        end = pos + (len(codes) + 3) // 4
+        prices = [
+            _format_milli(m, (body[pos + index // 4] >> (2 * (index % 4))) & 0x03)
+            for index, m in enumerate(milli)
+        ]
+
+    odds = dict(zip(map(MARKET_CODES.__getitem__, codes), prices))
+    if flags & FLAG_EXTRAS:
+        odds.update(json.loads(body[end:].decode("utf-8")))
+    return odds
+
+
+class PackedOdds(TypeDecorator):
+    """Coluna com odds_json compacto (dict na aplicação, bytes no banco)"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return encode_odds(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decode_odds(bytes(value))
@@ -0,0 +1,171 @@
+"""
+Histórico de odds por partida (tabela odds_history, append-only)
+Cada linha é uma mudança de odd: código do mercado (odds_codec.MARKET_CODES),
+horário da coleta que trouxe a odd nova e a odd que valia ATÉ esse horário.
+A partida nova não grava nada: a odd atual já está em matches.odds_json e a
+de abertura sai da primeira mudança (ou é a atual, se o mercado nunca mudou).
+A API remonta a série a partir de Match.scraped_at e a reamostra para no
+máximo N pontos por mercado.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models_rapidapi import Match, OddsHistory
+from odds_codec import MARKET_CODES, MARKET_INDEX
+
+logger = logging.getLogger(__name__)
+
+
+def _to_price(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def diff_odds(old_odds: Optional[Dict], new_odds: Optional[Dict]) -> Dict[int, Optional[float]]:
+    """
+    Mercados cuja odd mudou, com a odd anterior
+
+    Só mercados de MARKET_CODES entram no histórico. Mercado que não existia
+    antes fica com odd anterior None; o que sumiu, com a odd que tinha.
+
+    Args:
+        old_odds: odds_json gravado (None = partida nova, nada a registrar)
+        new_odds: odds_json recebido
+
+    Returns:
+        {código do mercado: odd anterior}
+    """
+    if old_odds is None:
+        return {}
+
+    new_odds = new_odds or {}
+    changed = {}
+    for market in old_odds.keys() | new_odds.keys():
+        code = MARKET_INDEX.get(market)
+        if code is None:
+            continue
+        previous = _to_price(old_odds.get(market))
+        if previous != _to_price(new_odds.get(market)):
+            changed[code] = previous
+    return changed
+
+
+def record_odds_changes(
+    db: Session,
+    changes: Iterable[tuple]
+) -> int:
+    """
+    Acrescenta ticks ao histórico em um único INSERT (executemany)
+
+    Args:
+        db: Sessão do banco (não faz commit)
+        changes: Tuplas (match_id, scraped_at, {código do mercado: odd anterior})
+
+    Returns:
+        Número de ticks gravados
+    """
+    rows = [
+        {"match_id": match_id, "scraped_at": scraped_at, "market": code, "price": price}
+        for match_id, scraped_at, markets in changes
+        for code, price in markets.items()
+    ]
+    if rows:
+        db.execute(insert(OddsHistory), rows)
+    return len(rows)
+
+
+def downsample(points: List[tuple], max_points: int) -> List[tuple]:
+    """
+    Reduz uma série (timestamp, odd) a no máximo max_points pontos
+
+    Divide o intervalo em max_points janelas de tempo iguais e mantém o
+    último valor de cada janela (a odd é um degrau: vale até a próxima
+    mudança). O primeiro ponto é sempre mantido.
+    """
+    if max_points <= 0 or len(points) <= max_points:
+        return points
+
+    start = points[0][0].timestamp()
+    span = points[-1][0].timestamp() - start
+    if span <= 0:
+        return [points[0], points[-1]]
+
+    buckets: Dict[int, tuple] = {}
+    for point in points[1:]:
+        index = min(max_points - 2, int((point[0].timestamp() - start) / span * (max_points - 1)))
+        buckets[index] = point
+
+    return [points[0]] + [buckets[index] for index in sorted(buckets)]
+
+
+def get_odds_history(
+    db: Session,
+    match_id: int,
+    markets: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: int = 200
+) -> Dict[str, List[Dict]]:
+    """
+    Série de odds de uma partida, por mercado
+
+    Cada tick diz que a odd anterior valia até o seu horário; a série vai de
+    Match.scraped_at (odd de abertura) até a odd atual do odds_json.
+
+    Args:
+        db: Sessão do banco
+        match_id: ID da partida (Match.id)
+        markets: Mercados desejados (None = todos)
+        start: Início da janela (inclusive)
+        end: Fim da janela (inclusive)
+        max_points: Máximo de pontos por mercado (0 = sem reamostragem)
+
+    Returns:
+        {mercado: [{"t": iso, "price": odd}, ...]}
+    """
+    match = db.query(Match.scraped_at, Match.odds_json).filter(Match.id == match_id).first()
+    if match is None:
+        return {}
+    current = match.odds_json or {}
+
+    codes = None
+    if markets:
+        codes = [MARKET_INDEX[market] for market in markets if market in MARKET_INDEX]
+
+    query = db.query(OddsHistory.market, OddsHistory.scraped_at, OddsHistory.price).filter(
+        OddsHistory.match_id == match_id
+    )
+    if codes is not None:
+        query = query.filter(OddsHistory.market.in_(codes))
+
+    ticks: Dict[int, List[tuple]] = {}
+    for code, scraped_at, price in query.order_by(OddsHistory.scraped_at, OddsHistory.id):
+        ticks.setdefault(code, []).append((scraped_at, price))
+
+    if codes is None:
+        codes = sorted(ticks.keys() | {MARKET_INDEX[m] for m in current if m in MARKET_INDEX})
+
+    series = {}
+    for code in codes:
+        market = MARKET_CODES[code]
+        changes = ticks.get(code, [])
+
+        # Degraus: (início, odd que passou a valer); a última é a do odds_json
+        since = [match.scraped_at] + [t for t, _ in changes]
+        prices = [price for _, price in changes] + [_to_price(current.get(market))]
+        points = [
+            (t, price) for t, price in zip(since, prices)
+            if t is not None and price is not None
+            and (start is None or t >= start) and (end is None or t <= end)
+        ]
+        if points:
+            series[market] = [{"t": t.isoformat(), "price": price} for t, price in downsample(points, max_points)]
+
+    return series
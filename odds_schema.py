@@ -0,0 +1,188 @@
+"""
+Schema declarativo das odds da RapidAPI
+Uma linha por mercado: chave no odds_json da API -> coluna do Match -> tipo.
+
+O schema é compilado uma vez (código gerado, sem laço interpretado por campo)
+em um parser que processa a liga inteira de uma vez. Ingestão, coletor de
+resultados, features do ML e exportações usam as mesmas listas de colunas,
+então um mercado novo é uma linha em ODDS_FIELDS (+ a coluna no modelo).
+
+Tags:
+- "ml": feature do modelo de ML (ml_model.py / predict.py), nesta ordem
+- "dashboard": exportada para o dashboard estático (web_data_generator.py)
+- "export": coluna padrão do CSV (/api/export/csv)
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Any
+
+
+class OddsField(NamedTuple):
+    api_key: str
+    column: str
+    label: str
+    type: type = float
+    tags: Tuple[str, ...] = ()
+
+
+ODDS_FIELDS: Tuple[OddsField, ...] = (
+    # Resultado Final
+    OddsField("odd_resultado_final_casa", "odd_home", "Odds Casa", tags=("ml", "dashboard", "export")),
+    OddsField("odd_resultado_final_empate", "odd_draw", "Odds Empate", tags=("ml", "dashboard", "export")),
+    OddsField("odd_resultado_final_fora", "odd_away", "Odds Fora", tags=("ml", "dashboard", "export")),
+
+    # Over/Under
+    OddsField("odd_over_0.5", "odd_over_05", "Over 0.5"),
+    OddsField("odd_under_0.5", "odd_under_05", "Under 0.5"),
+    OddsField("odd_over_1.5", "odd_over_15", "Over 1.5"),
+    OddsField("odd_under_1.5", "odd_under_15", "Under 1.5"),
+    OddsField("odd_over_2.5", "odd_over_25", "Over 2.5", tags=("ml", "dashboard")),
+    OddsField("odd_under_2.5", "odd_under_25", "Under 2.5", tags=("ml", "dashboard")),
+    OddsField("odd_over_3.5", "odd_over_35", "Over 3.5"),
+    OddsField("odd_under_3.5", "odd_under_35", "Under 3.5"),
+
+    # Ambas Marcam
+    OddsField("odd_ambas_sim", "odd_both_score_yes", "Ambas Sim", tags=("ml", "dashboard")),
+    OddsField("odd_ambas_nao", "odd_both_score_no", "Ambas Não", tags=("ml", "dashboard")),
+
+    # Resultado Correto
+    OddsField("odd_resultado_correto_casa_1-0", "odd_correct_1_0_home", "Placar 1-0"),
+    OddsField("odd_resultado_correto_empate_0-0", "odd_correct_0_0", "Placar 0-0"),
+    OddsField("odd_resultado_correto_fora_1-0", "odd_correct_1_0_away", "Placar 0-1"),
+    OddsField("odd_resultado_correto_casa_2-0", "odd_correct_2_0_home", "Placar 2-0"),
+    OddsField("odd_resultado_correto_empate_1-1", "odd_correct_1_1", "Placar 1-1"),
+    OddsField("odd_resultado_correto_fora_2-0", "odd_correct_2_0_away", "Placar 0-2"),
+    OddsField("odd_resultado_correto_casa_2-1", "odd_correct_2_1_home", "Placar 2-1"),
+    OddsField("odd_resultado_correto_empate_2-2", "odd_correct_2_2", "Placar 2-2"),
+    OddsField("odd_resultado_correto_fora_2-1", "odd_correct_2_1_away", "Placar 1-2"),
+
+    # Dupla Hipótese
+    OddsField("odd_dupla_hipotese_casa_ou_empate", "odd_double_home_draw", "Casa ou Empate"),
+    OddsField("odd_dupla_hipotese_fora_ou_empate", "odd_double_away_draw", "Fora ou Empate"),
+    OddsField("odd_dupla_hipotese_casa_ou_fora", "odd_double_home_away", "Casa ou Fora"),
+
+    # Total de Gols Exatos
+    OddsField("odd_total_gols_extatos_0", "odd_exact_goals_0", "0 Gols", tags=("ml",)),
+    OddsField("odd_total_gols_extatos_1", "odd_exact_goals_1", "1 Gol", tags=("ml",)),
+    OddsField("odd_total_gols_extatos_2", "odd_exact_goals_2", "2 Gols", tags=("ml",)),
+    OddsField("odd_total_gols_extatos_3", "odd_exact_goals_3", "3 Gols", tags=("ml",)),
+    OddsField("odd_total_gols_extatos_4", "odd_exact_goals_4", "4 Gols"),
+    OddsField("odd_total_gols_extatos_5", "odd_exact_goals_5", "5+ Gols"),
+
+    # Intervalo
+    OddsField("odd_intervalo_resultado_casa", "odd_halftime_home", "Intervalo Casa"),
+    OddsField("odd_intervalo_resultado_empate", "odd_halftime_draw", "Intervalo Empate"),
+    OddsField("odd_intervalo_resultado_fora", "odd_halftime_away", "Intervalo Fora"),
+
+    # Gols por Time
+    OddsField("odd_time_gols_casa_0", "odd_home_goals_0", "Casa 0 Gols"),
+    OddsField("odd_time_gols_casa_1", "odd_home_goals_1", "Casa 1 Gol"),
+    OddsField("odd_time_gols_casa_2", "odd_home_goals_2", "Casa 2 Gols"),
+    OddsField("odd_time_gols_casa_3", "odd_home_goals_3", "Casa 3+ Gols"),
+    OddsField("odd_time_gols_fora_0", "odd_away_goals_0", "Fora 0 Gols"),
+    OddsField("odd_time_gols_fora_1", "odd_away_goals_1", "Fora 1 Gol"),
+    OddsField("odd_time_gols_fora_2", "odd_away_goals_2", "Fora 2 Gols"),
+    OddsField("odd_time_gols_fora_3", "odd_away_goals_3", "Fora 3+ Gols"),
+
+    # Handicap Asiático
+    OddsField("odd_handicap_asiatico_casa", "odd_handicap_home", "Handicap Casa"),
+    OddsField("odd_handicap_asiatico_fora", "odd_handicap_away", "Handicap Fora"),
+)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Odd da API (string) para float; vazio ou inválido vira None"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value in (None, "") else str(value)
+
+
+CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    float: _to_float,
+    int: _to_int,
+    str: _to_str
+}
+
+
+class CompiledOddsSchema:
+    """Parser gerado a partir de uma lista de OddsField"""
+
+    def __init__(self, fields: Tuple[OddsField, ...]):
+        self.fields = tuple(fields)
+        self.columns = tuple(field.column for field in self.fields)
+        self.api_keys = tuple(field.api_key for field in self.fields)
+        self.by_column = {field.column: field for field in self.fields}
+
+        namespace = {f"_c{i}": CONVERTERS[field.type] for i, field in enumerate(self.fields)}
+        entries = ", ".join(
+            f"{field.column!r}: _c{i}(get({field.api_key!r}))" for i, field in enumerate(self.fields)
+        )
+        items = ", ".join(f"_c{i}(get({field.api_key!r}))" for i, field in enumerate(self.fields))
+        source = (
+            "def parse(odds):\n"
+            "    get = odds.get\n"
+            f"    return {{{entries}}}\n"
+            "\n"
+            "def parse_batch(odds_list):\n"
+            "    rows = []\n"
+            "    append = rows.append\n"
+            "    for odds in odds_list:\n"
+            "        get = (odds or {}).get\n"
+            f"        append({{{entries}}})\n"
+            "    return rows\n"
+            "\n"
+            "def parse_columns(odds_list):\n"
+            f"    values = [({items},) for get in [(odds or {{}}).get for odds in odds_list]]\n"
+            "    return list(zip(*values))\n"
+        )
+        exec(compile(source, "<odds_schema>", "exec"), namespace)
+
+        self._parse = namespace["parse"]
+        self._parse_batch = namespace["parse_batch"]
+        self._parse_columns = namespace["parse_columns"]
+
+    def parse(self, odds: Optional[Dict]) -> Dict[str, Any]:
+        """odds_json de uma partida -> {coluna: valor}"""
+        return self._parse(odds or {})
+
+    def parse_batch(self, odds_list: List[Optional[Dict]]) -> List[Dict[str, Any]]:
+        """odds_json de uma liga inteira -> lista de {coluna: valor} (uma passada)"""
+        return self._parse_batch(odds_list)
+
+    def parse_columns(self, odds_list: List[Optional[Dict]]) -> Dict[str, List[Any]]:
+        """odds_json de várias partidas -> {coluna: [valores]} (para DataFrame/exportação)"""
+        columns = self._parse_columns(odds_list)
+        if not columns:
+            return {column: [] for column in self.columns}
+        return {column: list(values) for column, values in zip(self.columns, columns)}
+
+    def columns_tagged(self, tag: str) -> List[str]:
+        """Colunas com a tag, na ordem do schema"""
+        return [field.column for field in self.fields if tag in field.tags]
+
+    def label(self, column: str) -> str:
+        field = self.by_column.get(column)
+        return field.label if field else column
+
+
+ODDS_SCHEMA = CompiledOddsSchema(ODDS_FIELDS)
+
+# Listas derivadas (mesma ordem em todos os consumidores)
+ML_ODDS_COLUMNS = ODDS_SCHEMA.columns_tagged("ml")
+DASHBOARD_ODDS_COLUMNS = ODDS_SCHEMA.columns_tagged("dashboard")
+EXPORT_ODDS_COLUMNS = ODDS_SCHEMA.columns_tagged("export")
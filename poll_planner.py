@@ -0,0 +1,233 @@
+"""
+Agendamento adaptativo das coletas (por liga) a partir do calendário gravado
+As partidas virtuais têm horário conhecido (hour/minute), então dá para saber
+quando vale a pena consultar cada endpoint em vez de usar um intervalo fixo:
+
+- /matchs: logo depois do fim esperado (início + VIRTUAL_MATCH_MINUTES +
+  RESULTS_FETCH_DELAY_SECONDS) da partida pendente mais antiga; enquanto o
+  placar não sai, nova tentativa a cada RESULTS_RETRY_SECONDS
+- /next-matchs: pouco antes (NEXT_MATCHES_LEAD_SECONDS) do último início
+  conhecido, quando a lista visível está acabando; no mínimo a cada
+  NEXT_MATCHES_MAX_INTERVAL_SECONDS (odds mudam) e no máximo a cada
+  NEXT_MATCHES_MIN_INTERVAL_SECONDS
+
+Ciclos em que nenhuma liga está no prazo são pulados (sem requisição).
+Todos os horários são UTC, como Match.kickoff_at.
+"""
+
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models_rapidapi import Match
+from database_rapidapi import get_db
+from match_time import utc_now
+from config import (
+    RAPIDAPI_LEAGUES,
+    RESULTS_PENDING_LOOKBACK_HOURS,
+    VIRTUAL_MATCH_MINUTES,
+    RESULTS_FETCH_DELAY_SECONDS,
+    RESULTS_RETRY_SECONDS,
+    NEXT_MATCHES_LEAD_SECONDS,
+    NEXT_MATCHES_MIN_INTERVAL_SECONDS,
+    NEXT_MATCHES_MAX_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+NEXT_MATCHES = "next-matchs"
+RESULTS = "matchs"
+
+
+class PollPlanner:
+    """Calcula, por liga, o próximo momento útil de cada coleta"""
+
+    def __init__(
+        self,
+        leagues: Optional[List[str]] = None,
+        match_minutes: float = VIRTUAL_MATCH_MINUTES,
+        results_delay: float = RESULTS_FETCH_DELAY_SECONDS,
+        results_retry: float = RESULTS_RETRY_SECONDS,
+        next_lead: float = NEXT_MATCHES_LEAD_SECONDS,
+        next_min_interval: float = NEXT_MATCHES_MIN_INTERVAL_SECONDS,
+        next_max_interval: float = NEXT_MATCHES_MAX_INTERVAL_SECONDS,
+        lookback_hours: float = RESULTS_PENDING_LOOKBACK_HOURS
+    ):
+        """
+        Args:
+            leagues: Ligas planejadas (None = RAPIDAPI_LEAGUES)
+            match_minutes: Duração de uma partida virtual (início -> apito final)
+            results_delay: Segundos após o apito final até o placar aparecer em /matchs
+            results_retry: Segundos entre tentativas enquanto o placar não sai
+            next_lead: Segundos antes do último início conhecido para buscar /next-matchs
+            next_min_interval: Intervalo mínimo entre buscas de /next-matchs (s)
+            next_max_interval: Intervalo máximo entre buscas de /next-matchs (s)
+            lookback_hours: Partidas coletadas há mais tempo não entram no plano
+        """
+        self.leagues = list(leagues or RAPIDAPI_LEAGUES)
+        self.match_duration = timedelta(minutes=match_minutes)
+        self.results_delay = timedelta(seconds=results_delay)
+        self.results_retry = timedelta(seconds=results_retry)
+        self.next_lead = timedelta(seconds=next_lead)
+        self.next_min_interval = timedelta(seconds=next_min_interval)
+        self.next_max_interval = timedelta(seconds=next_max_interval)
+        self.lookback = timedelta(hours=lookback_hours)
+
+        self._lock = threading.Lock()
+        self._last_fetch: Dict[str, Dict[str, datetime]] = {NEXT_MATCHES: {}, RESULTS: {}}
+        self._plan: Dict[str, Dict] = {}
+        self._stats = {"cycles": 0, "skipped_cycles": 0, "next_fetches": 0, "results_fetches": 0}
+
+    def _schedule(self, db: Session, now: datetime) -> Dict[str, Dict]:
+        """Próximo início, último início conhecido e fim esperado pendente por liga"""
+        schedule = {
+            league: {"upcoming": 0, "last_kickoff": None, "next_kickoff": None, "pending": 0, "first_full_time": None}
+            for league in self.leagues
+        }
+
+        # Duas buscas por faixa de kickoff_at, agregadas por liga no banco
+        upcoming = db.query(
+            Match.league, func.count(Match.id), func.min(Match.kickoff_at), func.max(Match.kickoff_at)
+        ).filter(
+            Match.league.in_(self.leagues),
+            Match.kickoff_at > now
+        ).group_by(Match.league)
+        for league, count, next_kickoff, last_kickoff in upcoming:
+            schedule[league].update(upcoming=count, next_kickoff=next_kickoff, last_kickoff=last_kickoff)
+
+        pending = db.query(Match.league, func.count(Match.id), func.min(Match.kickoff_at)).filter(
+            Match.result.is_(None),
+            Match.league.in_(self.leagues),
+            Match.kickoff_at.between(now - self.lookback, now)
+        ).group_by(Match.league)
+        for league, count, first_kickoff in pending:
+            schedule[league].update(pending=count, first_full_time=first_kickoff + self.match_duration)
+
+        return schedule
+
+    def plan(self, db: Session, now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """
+        Próxima coleta útil de cada endpoint por liga
+
+        Args:
+            db: Sessão do banco (só leitura)
+            now: Horário UTC (None = agora)
+
+        Returns:
+            {liga: {"next_matches_at", "results_at", "upcoming", "pending", ...}}
+            (results_at None = nada aguardando resultado)
+        """
+        now = now or utc_now()
+        schedule = self._schedule(db, now)
+
+        with self._lock:
+            last_next = dict(self._last_fetch[NEXT_MATCHES])
+            last_results = dict(self._last_fetch[RESULTS])
+
+        plan = {}
+        for league, info in schedule.items():
+            # /next-matchs: antes da lista visível acabar, com limites de intervalo
+            fetched = last_next.get(league)
+            if fetched is None or info["last_kickoff"] is None:
+                next_at = now
+            else:
+                next_at = min(info["last_kickoff"] - self.next_lead, fetched + self.next_max_interval)
+            if fetched is not None:
+                next_at = max(next_at, fetched + self.next_min_interval)
+
+            # /matchs: depois do apito final esperado da pendente mais antiga
+            results_at = None
+            if info["first_full_time"] is not None:
+                results_at = info["first_full_time"] + self.results_delay
+                fetched = last_results.get(league)
+                if fetched is not None:
+                    results_at = max(results_at, fetched + self.results_retry)
+
+            plan[league] = {**info, "next_matches_at": next_at, "results_at": results_at}
+
+        with self._lock:
+            self._plan = plan
+        return plan
+
+    def due(self, now: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """
+        Ligas cuja coleta está no prazo agora
+
+        Returns:
+            Tupla (ligas_next_matchs, ligas_resultados); ambas vazias = ciclo pulado
+        """
+        now = now or utc_now()
+        with get_db() as db:
+            plan = self.plan(db, now)
+
+        next_due = [league for league, p in plan.items() if p["next_matches_at"] <= now]
+        results_due = [league for league, p in plan.items() if p["results_at"] is not None and p["results_at"] <= now]
+
+        with self._lock:
+            self._stats["cycles"] += 1
+            if not next_due and not results_due:
+                self._stats["skipped_cycles"] += 1
+
+        return next_due, results_due
+
+    def mark_fetched(self, endpoint: str, leagues: List[str], now: Optional[datetime] = None):
+        """Registra uma coleta feita (endpoint: 'next-matchs' ou 'matchs')"""
+        now = now or utc_now()
+        with self._lock:
+            for league in leagues:
+                self._last_fetch[endpoint][league] = now
+            key = "next_fetches" if endpoint == NEXT_MATCHES else "results_fetches"
+            self._stats[key] += 1
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        """Segundos até a próxima coleta no prazo (recalcula o plano; 0 = já no prazo)"""
+        now = now or utc_now()
+        with get_db() as db:
+            plan = self.plan(db, now)
+
+        times = [p["next_matches_at"] for p in plan.values()]
+        times += [p["results_at"] for p in plan.values() if p["results_at"] is not None]
+        if not times:
+            return self.next_max_interval.total_seconds()
+        return max(0.0, (min(times) - now).total_seconds())
+
+    def get_status(self) -> Dict:
+        """Plano atual por liga e contadores (para /api/scraper/status)"""
+        with self._lock:
+            plan = self._plan
+            stats = dict(self._stats)
+
+        def _iso(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat(timespec="seconds") if value else None
+
+        return {
+            **stats,
+            "leagues": {
+                league: {
+                    "next_matches_at": _iso(p["next_matches_at"]),
+                    "results_at": _iso(p["results_at"]),
+                    "upcoming": p["upcoming"],
+                    "pending": p["pending"],
+                    "last_kickoff": _iso(p["last_kickoff"])
+                }
+                for league, p in plan.items()
+            }
+        }
+
+
+_poll_planner: Optional[PollPlanner] = None
+_poll_planner_lock = threading.Lock()
+
+
+def get_poll_planner() -> PollPlanner:
+    """Retorna o planejador compartilhado do processo"""
+    global _poll_planner
+
+    with _poll_planner_lock:
+        if _poll_planner is None:
+            _poll_planner = PollPlanner()
+        return _poll_planner
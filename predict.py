@@ -7,6 +7,8 @@ import sys
 from ml_model import GoalsPredictionModel
 from database_rapidapi import get_db
 from models_rapidapi import Match
+from match_time import utc_now
+from odds_schema import ML_ODDS_COLUMNS
 
 # Configuração de logging
 logging.basicConfig(
@@ -29,11 +31,12 @@ def predict_upcoming_matches():
         logger.info("   Execute primeiro: python train_model.py")
         return
     
-    # Busca partidas agendadas
+    # Busca próximas partidas sem resultado (inclui as que já estão "live")
     with get_db() as db:
         upcoming = db.query(Match).filter(
-            Match.status == "scheduled"
-        ).order_by(Match.match_date).limit(10).all()
+            Match.kickoff_at > utc_now(),
+            Match.result.is_(None)
+        ).order_by(Match.kickoff_at).limit(10).all()
         
         if not upcoming:
             logger.info("ℹ️  Nenhuma partida agendada encontrada")
@@ -47,17 +50,7 @@ def predict_upcoming_matches():
             # Prepara dados da partida
             match_data = {
                 'league': match.league,
-                'odd_home': match.odd_home,
-                'odd_draw': match.odd_draw,
-                'odd_away': match.odd_away,
-                'odd_over_25': match.odd_over_25,
-                'odd_under_25': match.odd_under_25,
-                'odd_both_score_yes': match.odd_both_score_yes,
-                'odd_both_score_no': match.odd_both_score_no,
-                'odd_exact_goals_0': match.odd_exact_goals_0,
-                'odd_exact_goals_1': match.odd_exact_goals_1,
-                'odd_exact_goals_2': match.odd_exact_goals_2,
-                'odd_exact_goals_3': match.odd_exact_goals_3,
+                **{column: getattr(match, column) for column in ML_ODDS_COLUMNS},
             }
             
             # Faz predição
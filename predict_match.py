@@ -4,6 +4,7 @@ Predição para jogo específico baseado em odds
 
 from database_rapidapi import get_db
 from models_rapidapi import Match
+from match_status import OPEN_STATUSES
 
 def predict_match(hour, minute):
     """Faz predição para um jogo específico"""
@@ -12,7 +13,7 @@ def predict_match(hour, minute):
         match = db.query(Match).filter(
             Match.hour == str(hour),
             Match.minute == str(minute).zfill(2),
-            Match.status == "scheduled"
+            Match.status.in_(OPEN_STATUSES)
         ).first()
         
         if not match:
@@ -195,7 +196,7 @@ def predict_match(hour, minute):
         with get_db() as db2:
             liga_matches = db2.query(Match).filter(
                 Match.league == match.league,
-                Match.status == "scheduled"
+                Match.status.in_(OPEN_STATUSES)
             ).all()
             
             under_count = sum(1 for m in liga_matches if m.odd_under_25 and m.odd_over_25 and (1/m.odd_under_25) > (1/m.odd_over_25))
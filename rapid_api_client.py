@@ -7,31 +7,187 @@ Endpoints disponíveis:
 """
 
 import requests
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import threading
+import time
 import logging
 
+from rate_limiter import QuotaRateLimiter, get_rate_limiter
+from resilience import RetryPolicy, RETRYABLE_STATUS, get_circuit_breaker, new_request_stats
+from response_cache import ResponseCache, get_response_cache, FRESH, STALE
+from raw_archive import RawArchive, get_raw_archive
+from sources import source_key, DEFAULT_BOOKMAKER, DEFAULT_SPORT_ID
+from config import (
+    RAPIDAPI_BASE_URL,
+    RAPIDAPI_RATE_LIMITER_ENABLED,
+    RAPIDAPI_CACHE_ENABLED,
+    RAW_ARCHIVE_ENABLED,
+    RAPIDAPI_POOL_CONNECTIONS,
+    RAPIDAPI_POOL_MAXSIZE,
+    RAPIDAPI_CONNECT_TIMEOUT,
+    RAPIDAPI_READ_TIMEOUT
+)
+
 logger = logging.getLogger(__name__)
 
+# Sessão HTTP compartilhada por todos os clientes do processo
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session(
+    pool_connections: int = RAPIDAPI_POOL_CONNECTIONS,
+    pool_maxsize: int = RAPIDAPI_POOL_MAXSIZE
+) -> requests.Session:
+    """
+    Retorna a sessão HTTP keep-alive compartilhada pelo processo
+    
+    A sessão é criada na primeira chamada e reutilizada por todas as
+    instâncias de RapidAPIClient, evitando um handshake TCP+TLS por requisição.
+    
+    Args:
+        pool_connections: Número de pools de conexão (um por host)
+        pool_maxsize: Conexões mantidas abertas por host
+    
+    Returns:
+        Sessão requests compartilhada
+    """
+    global _shared_session
+    
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            _shared_session = session
+            logger.debug(f"🔌 Sessão HTTP criada (pool: {pool_connections}x{pool_maxsize})")
+        
+        return _shared_session
+
+
+def _parse_retry_after(value: Optional[str], default: float = 60.0) -> float:
+    """Converte o header Retry-After (segundos) em float"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def is_cacheable(result: Any) -> bool:
+    """Só respostas válidas da API (status != false) vão para o cache"""
+    return isinstance(result, dict) and result.get("status") is not False
+
+
+# Revalidações em andamento (evita buscar a mesma chave duas vezes)
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def revalidate_in_background(
+    api_key: str,
+    api_host: str,
+    endpoint: str,
+    data: Dict[str, Any],
+    method: str = "POST"
+):
+    """
+    Atualiza uma entrada do cache em uma thread separada (stale-while-revalidate)
+    
+    Usado tanto pelo cliente síncrono quanto pelo assíncrono.
+    """
+    key = ResponseCache.make_key(endpoint, data)
+    
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+    
+    def _runner():
+        try:
+            RapidAPIClient(api_key=api_key, api_host=api_host).refresh(endpoint, dict(data), method)
+        except Exception as e:
+            logger.error(f"❌ Erro ao revalidar cache de {endpoint}: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+    
+    threading.Thread(target=_runner, daemon=True).start()
+
+
+def close_shared_session():
+    """Fecha a sessão HTTP compartilhada (as conexões do pool são liberadas)"""
+    global _shared_session
+    
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
 
 class RapidAPIClient:
     """Cliente para API do Futebol Virtual Bet365 na RapidAPI"""
     
-    BASE_URL = "https://futebol-virtual-bet3651.p.rapidapi.com"
+    BASE_URL = RAPIDAPI_BASE_URL
     
     # Ligas disponíveis segundo a documentação
     AVAILABLE_LEAGUES = ["express", "copa", "super", "euro", "premier"]
     
-    def __init__(self, api_key: str, api_host: str = "futebol-virtual-bet3651.p.rapidapi.com"):
+    def __init__(
+        self,
+        api_key: str,
+        api_host: str = "futebol-virtual-bet3651.p.rapidapi.com",
+        connect_timeout: float = RAPIDAPI_CONNECT_TIMEOUT,
+        read_timeout: float = RAPIDAPI_READ_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[QuotaRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        archive: Optional[RawArchive] = None
+    ):
         """
         Inicializa o cliente da RapidAPI
         
         Args:
             api_key: Chave de API da RapidAPI (X-RapidAPI-Key)
             api_host: Host da API (X-RapidAPI-Host)
+            connect_timeout: Timeout (s) para abrir a conexão
+            read_timeout: Timeout (s) aguardando a resposta
+            session: Sessão HTTP (None = sessão keep-alive compartilhada do processo)
+            rate_limiter: Limitador de cota (None = limitador compartilhado entre processos,
+                se RAPIDAPI_RATE_LIMITER_ENABLED)
+            retry_policy: Política de retentativas (None = padrão do config)
+            cache: Cache de respostas (None = cache em disco compartilhado,
+                se RAPIDAPI_CACHE_ENABLED)
+            archive: Arquivo bruto das respostas (None = arquivo diário padrão,
+                se RAW_ARCHIVE_ENABLED)
         """
         self.api_key = api_key
         self.api_host = api_host
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.session = session if session is not None else get_shared_session()
+        
+        if rate_limiter is None and RAPIDAPI_RATE_LIMITER_ENABLED:
+            rate_limiter = get_rate_limiter()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        
+        if cache is None and RAPIDAPI_CACHE_ENABLED:
+            cache = get_response_cache()
+        self.cache = cache
+        
+        if archive is None and RAW_ARCHIVE_ENABLED:
+            archive = get_raw_archive()
+        self.archive = archive
+        
+        # Contadores de requisições/retentativas (registrados no ScraperLog)
+        self.stats = new_request_stats()
         
         self.headers = {
             "x-rapidapi-key": api_key,
@@ -39,35 +195,31 @@ class RapidAPIClient:
             "Content-Type": "application/x-www-form-urlencoded"
         }
     
-    def _make_request(
-        self, 
-        endpoint: str, 
+    def _send_once(
+        self,
+        endpoint: str,
         data: Dict[str, Any],
-        method: str = "POST"
-    ) -> Optional[Dict]:
+        method: str
+    ) -> Tuple[Optional[Dict], bool, Optional[float]]:
         """
-        Faz requisição à API
-        
-        Args:
-            endpoint: Endpoint da API (ex: '/last-updated')
-            data: Dados do body (form-data)
-            method: Método HTTP (POST)
+        Faz uma única tentativa de requisição
         
         Returns:
-            Resposta JSON ou None em caso de erro
+            Tupla (resposta_json, vale_tentar_de_novo, retry_after)
         """
         url = f"{self.BASE_URL}{endpoint}"
+        response = None
         
         try:
             logger.info(f"🌐 Requisição: {method} {endpoint}")
             logger.debug(f"   Payload: {data}")
             
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 headers=self.headers,
                 data=data,
-                timeout=30
+                timeout=self.timeout
             )
             
             response.raise_for_status()
@@ -75,35 +227,151 @@ class RapidAPIClient:
             result = response.json()
             logger.info(f"✓ Status: {response.status_code}")
             
-            return result
+            return result, False, None
             
         except requests.exceptions.HTTPError as e:
             logger.error(f"❌ Erro HTTP: {e}")
+            retry_after = None
             if response is not None:
+                if response.headers.get("Retry-After") is not None:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.report_throttled(retry_after if retry_after is not None else 60.0)
                 try:
                     logger.error(f"   Response: {response.text}")
                 except:
                     logger.error(f"   Response: (não disponível)")
-            return None
+            retryable = response is not None and response.status_code in RETRYABLE_STATUS
+            return None, retryable, retry_after
             
         except requests.exceptions.Timeout:
             logger.error(f"❌ Timeout na requisição para {endpoint}")
-            return None
+            return None, True, None
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Erro na requisição: {e}")
-            return None
+            return None, True, None
             
         except ValueError as e:
             logger.error(f"❌ Erro ao parsear JSON: {e}")
             logger.error(f"   Response text: {response.text if response else 'N/A'}")
+            return None, False, None
+    
+    def _make_request(
+        self, 
+        endpoint: str, 
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """
+        Faz requisição à API, passando antes pelo cache compartilhado
+        
+        Args:
+            endpoint: Endpoint da API (ex: '/last-updated')
+            data: Dados do body (form-data)
+            method: Método HTTP (POST)
+        
+        Returns:
+            Resposta JSON ou None em caso de erro
+        """
+        if self.cache is not None:
+            cached, freshness = self.cache.get(endpoint, data)
+            if freshness == FRESH:
+                return cached
+            if freshness == STALE:
+                # Serve a resposta antiga e atualiza em segundo plano
+                revalidate_in_background(self.api_key, self.api_host, endpoint, data, method)
+                return cached
+        
+        return self.refresh(endpoint, data, method)
+    
+    def refresh(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """
+        Busca na API ignorando o cache e grava a resposta no cache
+        
+        Args:
+            endpoint: Endpoint da API (ex: '/last-updated')
+            data: Dados do body (form-data)
+            method: Método HTTP (POST)
+        
+        Returns:
+            Resposta JSON ou None em caso de erro
+        """
+        result = self._fetch(endpoint, data, method)
+        
+        if result is not None and self.cache is not None and is_cacheable(result):
+            self.cache.set(endpoint, data, result)
+        
+        return result
+    
+    def _fetch(
+        self, 
+        endpoint: str, 
+        data: Dict[str, Any],
+        method: str = "POST"
+    ) -> Optional[Dict]:
+        """
+        Faz requisição à API com retentativas e circuit breaker por liga
+        
+        Args:
+            endpoint: Endpoint da API (ex: '/last-updated')
+            data: Dados do body (form-data)
+            method: Método HTTP (POST)
+        
+        Returns:
+            Resposta JSON ou None em caso de erro
+        """
+        # Circuit breaker por célula (liga, ou liga@casa/esporte fora do padrão)
+        league = source_key(str(data.get("league", "")), data.get("home", DEFAULT_BOOKMAKER), data.get("sport_id", DEFAULT_SPORT_ID))
+        breaker = get_circuit_breaker(league)
+        
+        # Liga fora do ar: falha rápido sem gastar timeout nem cota
+        if not breaker.allow_request():
+            logger.warning(f"⛔ Liga {league} com circuit breaker aberto, pulando {endpoint}")
+            self.stats["short_circuited"] += 1
             return None
+        
+        attempt = 0
+        while True:
+            # Token bucket + cota compartilhados com os outros processos
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(endpoint):
+                # Recusa por cota não indica problema na liga
+                breaker.release_probe()
+                return None
+            
+            self.stats["requests"] += 1
+            result, retryable, retry_after = self._send_once(endpoint, data, method)
+            
+            if result is not None:
+                breaker.record_success()
+                if self.archive is not None:
+                    self.archive.append(endpoint, data, result)
+                return result
+            
+            delay = self.retry_policy.compute_delay(attempt, retry_after) if retryable else None
+            if delay is None:
+                break
+            
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.info(f"🔁 Nova tentativa {attempt}/{self.retry_policy.max_retries} de {endpoint} [{league}] em {delay:.1f}s")
+            time.sleep(delay)
+        
+        self.stats["failures"] += 1
+        breaker.record_failure()
+        return None
     
     def get_last_updated(
         self, 
         league: str = "euro", 
         home: str = "bet365", 
-        sport_id: int = 1
+        sport_id: int = 1,
+        use_cache: bool = True
     ) -> Optional[Dict]:
         """
         Obtém última atualização da liga
@@ -112,6 +380,7 @@ class RapidAPIClient:
             league: Nome da liga ("express", "copa", "super", "euro", "premier")
             home: Casa de apostas (padrão: "bet365")
             sport_id: ID do esporte (1 = Futebol Virtual)
+            use_cache: False = sempre consulta a API (modo incremental compara com o valor atual)
         
         Returns:
             Dados da última atualização ou None
@@ -125,6 +394,8 @@ class RapidAPIClient:
             "sport_id": sport_id
         }
         
+        if not use_cache:
+            return self.refresh("/last-updated", data)
         return self._make_request("/last-updated", data)
     
     def get_next_matches(
@@ -0,0 +1,283 @@
+"""
+Limitador de requisições e controle de cota da RapidAPI compartilhado entre processos
+Token bucket + contagem diária/mensal persistidos em SQLite, de modo que o
+main_rapidapi.py continuous, o auto_scheduler.py, o scheduler da web_api e o
+subprocesso do /api/scraper/start respeitem o mesmo orçamento.
+
+Prioridades:
+- "high": coleta de resultados (/matchs)
+- "low": próximas partidas e /last-updated
+Quando a cota restante entra na reserva (RAPIDAPI_QUOTA_RESERVE_PCT), apenas
+requisições "high" são liberadas.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config import (
+    RAPIDAPI_RATE_LIMIT_PER_MINUTE,
+    RAPIDAPI_BURST,
+    RAPIDAPI_DAILY_QUOTA,
+    RAPIDAPI_MONTHLY_QUOTA,
+    RAPIDAPI_QUOTA_RESERVE_PCT,
+    RAPIDAPI_LIMITER_MAX_WAIT,
+    RAPIDAPI_LIMITER_DB
+)
+
+logger = logging.getLogger(__name__)
+
+# Prioridade de cada endpoint (resultados primeiro quando a cota está apertada)
+ENDPOINT_PRIORITY = {
+    "/matchs": "high",
+    "/next-matchs": "low",
+    "/last-updated": "low"
+}
+
+
+class QuotaRateLimiter:
+    """Token bucket + cota diária/mensal persistidos em SQLite (seguro entre processos)"""
+    
+    def __init__(
+        self,
+        db_path: Path = RAPIDAPI_LIMITER_DB,
+        rate_per_minute: float = RAPIDAPI_RATE_LIMIT_PER_MINUTE,
+        burst: int = RAPIDAPI_BURST,
+        daily_quota: int = RAPIDAPI_DAILY_QUOTA,
+        monthly_quota: int = RAPIDAPI_MONTHLY_QUOTA,
+        reserve_pct: float = RAPIDAPI_QUOTA_RESERVE_PCT,
+        max_wait: float = RAPIDAPI_LIMITER_MAX_WAIT
+    ):
+        """
+        Args:
+            db_path: Arquivo SQLite compartilhado
+            rate_per_minute: Reposição do bucket (requisições por minuto)
+            burst: Capacidade máxima do bucket
+            daily_quota: Cota diária (0 = sem limite)
+            monthly_quota: Cota mensal (0 = sem limite)
+            reserve_pct: % da cota reservada para requisições de alta prioridade
+            max_wait: Tempo máximo (s) aguardando token antes de desistir
+        """
+        self.db_path = str(db_path)
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.monthly_quota = monthly_quota
+        self.reserve_pct = reserve_pct
+        self.max_wait = max_wait
+        
+        self._init_lock = threading.Lock()
+        self._initialized = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        
+        if not self._initialized:
+            with self._init_lock:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS bucket ("
+                    " id INTEGER PRIMARY KEY CHECK (id = 1),"
+                    " tokens REAL NOT NULL,"
+                    " updated_at REAL NOT NULL,"
+                    " blocked_until REAL NOT NULL DEFAULT 0)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS usage ("
+                    " period TEXT PRIMARY KEY,"
+                    " count INTEGER NOT NULL DEFAULT 0)"
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO bucket (id, tokens, updated_at) VALUES (1, ?, ?)",
+                    (self.burst, time.time())
+                )
+                self._initialized = True
+        
+        return conn
+    
+    @staticmethod
+    def _periods(now: Optional[datetime] = None) -> Tuple[str, str]:
+        now = now or datetime.utcnow()
+        return f"day:{now:%Y-%m-%d}", f"month:{now:%Y-%m}"
+    
+    def _over_quota(self, used: int, quota: int, priority: str) -> bool:
+        if quota <= 0:
+            return False
+        if used >= quota:
+            return True
+        if priority != "high":
+            reserve = quota * self.reserve_pct / 100.0
+            return quota - used <= reserve
+        return False
+    
+    def try_acquire(self, endpoint: str) -> Tuple[bool, float, Optional[str]]:
+        """
+        Tenta consumir um token e uma unidade de cota
+        
+        Args:
+            endpoint: Endpoint da requisição (define a prioridade)
+        
+        Returns:
+            Tupla (liberado, segundos_para_tentar_de_novo, motivo_da_recusa)
+            Se motivo != None a requisição foi recusada por cota e não deve esperar.
+        """
+        priority = ENDPOINT_PRIORITY.get(endpoint, "low")
+        day_key, month_key = self._periods()
+        
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            
+            used = dict(conn.execute(
+                "SELECT period, count FROM usage WHERE period IN (?, ?)",
+                (day_key, month_key)
+            ).fetchall())
+            
+            if self._over_quota(used.get(day_key, 0), self.daily_quota, priority):
+                conn.execute("ROLLBACK")
+                return False, 0.0, f"cota diária ({self.daily_quota}) esgotada para prioridade {priority}"
+            if self._over_quota(used.get(month_key, 0), self.monthly_quota, priority):
+                conn.execute("ROLLBACK")
+                return False, 0.0, f"cota mensal ({self.monthly_quota}) esgotada para prioridade {priority}"
+            
+            tokens, updated_at, blocked_until = conn.execute(
+                "SELECT tokens, updated_at, blocked_until FROM bucket WHERE id = 1"
+            ).fetchone()
+            
+            now = time.time()
+            if blocked_until > now:
+                conn.execute("ROLLBACK")
+                return False, blocked_until - now, None
+            
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate_per_second)
+            if tokens < 1:
+                conn.execute(
+                    "UPDATE bucket SET tokens = ?, updated_at = ? WHERE id = 1",
+                    (tokens, now)
+                )
+                conn.execute("COMMIT")
+                wait = (1 - tokens) / self.rate_per_second if self.rate_per_second > 0 else self.max_wait
+                return False, wait, None
+            
+            conn.execute(
+                "UPDATE bucket SET tokens = ?, updated_at = ? WHERE id = 1",
+                (tokens - 1, now)
+            )
+            for period in (day_key, month_key):
+                conn.execute(
+                    "INSERT INTO usage (period, count) VALUES (?, 1) "
+                    "ON CONFLICT(period) DO UPDATE SET count = count + 1",
+                    (period,)
+                )
+            conn.execute("COMMIT")
+            return True, 0.0, None
+        
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def acquire(self, endpoint: str) -> bool:
+        """
+        Aguarda (até max_wait) um token para o endpoint
+        
+        Returns:
+            True se a requisição pode ser feita
+        """
+        deadline = time.monotonic() + self.max_wait
+        
+        while True:
+            granted, wait, reason = self.try_acquire(endpoint)
+            if granted:
+                return True
+            if reason:
+                logger.warning(f"🚫 Requisição {endpoint} bloqueada: {reason}")
+                return False
+            if time.monotonic() + wait > deadline:
+                logger.warning(f"⏳ Limite de requisições atingido, {endpoint} descartado após {self.max_wait:.0f}s")
+                return False
+            time.sleep(wait)
+    
+    async def acquire_async(self, endpoint: str) -> bool:
+        """
+        Versão assíncrona de acquire (não bloqueia o event loop enquanto espera)
+        
+        try_acquire abre o SQLite com BEGIN IMMEDIATE (até busy_timeout se o
+        arquivo estiver travado): roda em thread para não parar as outras ligas.
+        """
+        deadline = time.monotonic() + self.max_wait
+        
+        while True:
+            granted, wait, reason = await asyncio.to_thread(self.try_acquire, endpoint)
+            if granted:
+                return True
+            if reason:
+                logger.warning(f"🚫 Requisição {endpoint} bloqueada: {reason}")
+                return False
+            if time.monotonic() + wait > deadline:
+                logger.warning(f"⏳ Limite de requisições atingido, {endpoint} descartado após {self.max_wait:.0f}s")
+                return False
+            await asyncio.sleep(wait)
+    
+    def report_throttled(self, retry_after: float = 60.0):
+        """
+        Registra um HTTP 429: esvazia o bucket e bloqueia todos os processos
+        pelo tempo indicado
+        """
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE bucket SET tokens = 0, updated_at = ?, blocked_until = MAX(blocked_until, ?) WHERE id = 1",
+                (time.time(), time.time() + retry_after)
+            )
+        finally:
+            conn.close()
+        logger.warning(f"🐢 RapidAPI retornou 429, pausando requisições por {retry_after:.0f}s")
+    
+    def get_status(self) -> Dict:
+        """Retorna uso atual da cota e estado do bucket"""
+        day_key, month_key = self._periods()
+        
+        conn = self._connect()
+        try:
+            used = dict(conn.execute(
+                "SELECT period, count FROM usage WHERE period IN (?, ?)",
+                (day_key, month_key)
+            ).fetchall())
+            tokens, updated_at, blocked_until = conn.execute(
+                "SELECT tokens, updated_at, blocked_until FROM bucket WHERE id = 1"
+            ).fetchone()
+        finally:
+            conn.close()
+        
+        now = time.time()
+        return {
+            "tokens": round(min(self.burst, tokens + (now - updated_at) * self.rate_per_second), 2),
+            "burst": self.burst,
+            "blocked_for_seconds": round(max(0.0, blocked_until - now), 1),
+            "daily_used": used.get(day_key, 0),
+            "daily_quota": self.daily_quota,
+            "monthly_used": used.get(month_key, 0),
+            "monthly_quota": self.monthly_quota
+        }
+
+
+_rate_limiter: Optional[QuotaRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> QuotaRateLimiter:
+    """Retorna o limitador compartilhado do processo (estado persistido no SQLite)"""
+    global _rate_limiter
+    
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = QuotaRateLimiter()
+        return _rate_limiter
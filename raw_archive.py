@@ -0,0 +1,127 @@
+"""
+Arquivo bruto das respostas da RapidAPI
+Toda resposta recebida é acrescentada (append-only) a um segmento diário
+<RAW_ARCHIVE_DIR>/AAAA-MM-DD.jsonl.gz, uma linha JSON por resposta.
+
+Cada linha é gravada como um membro gzip independente em uma única escrita
+O_APPEND, então vários processos podem acrescentar ao mesmo segmento sem
+lock; o gzip lê os membros concatenados como um arquivo só.
+
+Com o arquivo, mudanças de schema ou mercados novos do odds_json podem ser
+reprocessados sem gastar cota (ver backfill_archive.py).
+"""
+
+import gzip
+import json
+import os
+import threading
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any
+
+from config import RAW_ARCHIVE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class RawArchive:
+    """Segmentos diários JSONL comprimidos com as respostas brutas da API"""
+
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory: Path = RAW_ARCHIVE_DIR):
+        """
+        Args:
+            directory: Pasta dos segmentos (criada se não existir)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def segment_path(self, day: date) -> Path:
+        """Caminho do segmento de um dia"""
+        return self.directory / f"{day:%Y-%m-%d}{self.SUFFIX}"
+
+    def append(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        payload: Dict,
+        fetched_at: Optional[datetime] = None
+    ):
+        """
+        Acrescenta uma resposta ao segmento do dia
+
+        Args:
+            endpoint: Endpoint da API (ex: '/next-matchs')
+            data: Body da requisição (liga, casa, sport_id)
+            payload: Resposta JSON da API
+            fetched_at: Momento da resposta (None = agora, horário local)
+        """
+        fetched_at = fetched_at or datetime.now()
+        record = {
+            "fetched_at": fetched_at.isoformat(timespec="seconds"),
+            "endpoint": endpoint,
+            "league": data.get("league"),
+            "home": data.get("home"),
+            "sport_id": data.get("sport_id"),
+            "payload": payload
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        chunk = gzip.compress(line.encode("utf-8"))
+
+        try:
+            fd = os.open(
+                self.segment_path(fetched_at.date()),
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0),
+                0o644
+            )
+            try:
+                os.write(fd, chunk)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            # O arquivo é secundário: nunca derruba a coleta
+            logger.error(f"❌ Erro ao arquivar resposta de {endpoint}: {e}")
+
+    def list_segments(self, start: date, end: date) -> List[Path]:
+        """Segmentos existentes entre start e end (inclusive), em ordem cronológica"""
+        segments = []
+        day = start
+        while day <= end:
+            path = self.segment_path(day)
+            if path.exists():
+                segments.append(path)
+            day += timedelta(days=1)
+        return segments
+
+    @staticmethod
+    def read_segment(path: Path) -> Iterator[Dict]:
+        """
+        Lê as respostas de um segmento
+
+        Uma linha truncada no fim (processo morto durante a escrita) é ignorada.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.warning(f"⚠️ Linha inválida ignorada em {path.name}")
+        except (EOFError, gzip.BadGzipFile) as e:
+            logger.warning(f"⚠️ Segmento {path.name} truncado: {e}")
+
+
+_raw_archive: Optional[RawArchive] = None
+_raw_archive_lock = threading.Lock()
+
+
+def get_raw_archive() -> RawArchive:
+    """Retorna o arquivo bruto compartilhado do processo"""
+    global _raw_archive
+
+    with _raw_archive_lock:
+        if _raw_archive is None:
+            _raw_archive = RawArchive()
+        return _raw_archive
@@ -0,0 +1,196 @@
+"""
+Camada de resiliência para chamadas à RapidAPI
+- Retentativas limitadas com backoff exponencial + jitter
+- Respeito ao header Retry-After
+- Circuit breaker por liga: falha rápido enquanto a liga está fora do ar
+  e volta a testar (half-open) depois de RAPIDAPI_BREAKER_RECOVERY segundos
+"""
+
+import random
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+from config import (
+    RAPIDAPI_MAX_RETRIES,
+    RAPIDAPI_BACKOFF_BASE,
+    RAPIDAPI_BACKOFF_MAX,
+    RAPIDAPI_BREAKER_THRESHOLD,
+    RAPIDAPI_BREAKER_RECOVERY
+)
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP que valem nova tentativa
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def new_request_stats() -> Dict[str, int]:
+    """Contadores de requisições de um cliente (somados no ScraperLog)"""
+    return {
+        "requests": 0,
+        "retries": 0,
+        "failures": 0,
+        "short_circuited": 0
+    }
+
+
+def merge_request_stats(target: Dict[str, int], source: Dict[str, int]):
+    """Soma os contadores de source em target"""
+    for key, value in source.items():
+        target[key] = target.get(key, 0) + value
+
+
+class RetryPolicy:
+    """Backoff exponencial com jitter ("full jitter") e limite de tentativas"""
+
+    def __init__(
+        self,
+        max_retries: int = RAPIDAPI_MAX_RETRIES,
+        base_delay: float = RAPIDAPI_BACKOFF_BASE,
+        max_delay: float = RAPIDAPI_BACKOFF_MAX
+    ):
+        """
+        Args:
+            max_retries: Retentativas após a primeira tentativa
+            base_delay: Espera base (s) da primeira retentativa
+            max_delay: Espera máxima (s) entre tentativas
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Calcula a espera antes da próxima tentativa
+
+        Args:
+            attempt: Tentativa que acabou de falhar (0 = primeira)
+            retry_after: Valor do header Retry-After, se houver
+
+        Returns:
+            Segundos a aguardar, ou None se não vale a pena tentar de novo
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if retry_after is not None:
+            # Servidor pediu para esperar mais do que aceitamos: desiste neste ciclo
+            if retry_after > self.max_delay:
+                return None
+            return retry_after
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de uma liga
+
+    Estados:
+    - closed: requisições normais
+    - open: falha rápido, sem chamar a API
+    - half_open: recovery_timeout passou, libera uma requisição de teste
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = RAPIDAPI_BREAKER_THRESHOLD,
+        recovery_timeout: float = RAPIDAPI_BREAKER_RECOVERY
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Retorna True se a requisição pode ser feita agora"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"🔌 Circuit breaker [{self.name}]: testando novamente (half-open)")
+
+            # half_open: apenas uma requisição de teste por vez
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def release_probe(self):
+        """Libera a requisição de teste sem registrar sucesso nem falha"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ Circuit breaker [{self.name}]: liga recuperada (closed)")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"⛔ Circuit breaker [{self.name}]: aberto após {self.consecutive_failures} falhas, "
+                        f"nova tentativa em {self.recovery_timeout:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        """Estado atual (para ScraperLog / status)"""
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN and self.opened_at is not None:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(league: str) -> CircuitBreaker:
+    """Retorna o circuit breaker da liga (compartilhado por todos os clientes do processo)"""
+    with _breakers_lock:
+        breaker = _breakers.get(league)
+        if breaker is None:
+            breaker = CircuitBreaker(league)
+            _breakers[league] = breaker
+        return breaker
+
+
+def get_breaker_states() -> Dict[str, Dict]:
+    """Estado de todos os circuit breakers do processo"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,190 @@
+"""
+Cache em disco das respostas da RapidAPI, compartilhado entre processos
+Chave: endpoint + liga + casa de apostas + sport_id.
+
+Cada endpoint tem um TTL (resposta "fresca") e uma janela extra de
+stale-while-revalidate: dentro dela a resposta antiga é devolvida na hora e
+uma atualização é feita em segundo plano. Contadores de hit/stale/miss ficam
+no próprio arquivo para ajustar os TTLs (GET /api/scraper/status).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Any
+
+from config import (
+    RAPIDAPI_CACHE_DB,
+    RAPIDAPI_CACHE_TTL,
+    RAPIDAPI_CACHE_STALE
+)
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class ResponseCache:
+    """Cache SQLite de respostas com TTL por endpoint e stale-while-revalidate"""
+
+    def __init__(
+        self,
+        db_path: Path = RAPIDAPI_CACHE_DB,
+        ttl: Optional[Dict[str, float]] = None,
+        stale: float = RAPIDAPI_CACHE_STALE
+    ):
+        """
+        Args:
+            db_path: Arquivo SQLite compartilhado
+            ttl: Segundos em que a resposta é considerada fresca, por endpoint
+            stale: Segundos extras em que a resposta antiga ainda é servida
+                enquanto é atualizada em segundo plano
+        """
+        self.db_path = str(db_path)
+        self.ttl = ttl if ttl is not None else dict(RAPIDAPI_CACHE_TTL)
+        self.stale = stale
+
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+        if not self._initialized:
+            with self._init_lock:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " cache_key TEXT PRIMARY KEY,"
+                    " endpoint TEXT NOT NULL,"
+                    " payload TEXT NOT NULL,"
+                    " fetched_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS stats ("
+                    " endpoint TEXT NOT NULL,"
+                    " outcome TEXT NOT NULL,"
+                    " count INTEGER NOT NULL DEFAULT 0,"
+                    " PRIMARY KEY (endpoint, outcome))"
+                )
+                self._initialized = True
+
+        return conn
+
+    @staticmethod
+    def make_key(endpoint: str, data: Dict[str, Any]) -> str:
+        """Chave do cache: endpoint|liga|casa|sport_id"""
+        return f"{endpoint}|{data.get('league')}|{data.get('home')}|{data.get('sport_id')}"
+
+    def get(self, endpoint: str, data: Dict[str, Any]) -> Tuple[Optional[Dict], str]:
+        """
+        Busca resposta no cache
+
+        Args:
+            endpoint: Endpoint da API (ex: '/next-matchs')
+            data: Body da requisição (liga, casa, sport_id)
+
+        Returns:
+            Tupla (resposta, situação) com situação em "fresh", "stale" ou "miss"
+        """
+        ttl = self.ttl.get(endpoint, 0)
+        if ttl <= 0:
+            return None, MISS
+
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT payload, fetched_at FROM responses WHERE cache_key = ?",
+                (self.make_key(endpoint, data),)
+            ).fetchone()
+
+            outcome = MISS
+            payload = None
+            if row is not None:
+                age = time.time() - row[1]
+                if age <= ttl:
+                    outcome = FRESH
+                elif age <= ttl + self.stale:
+                    outcome = STALE
+                if outcome != MISS:
+                    payload = json.loads(row[0])
+
+            conn.execute(
+                "INSERT INTO stats (endpoint, outcome, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(endpoint, outcome) DO UPDATE SET count = count + 1",
+                (endpoint, outcome)
+            )
+        finally:
+            conn.close()
+
+        if outcome != MISS:
+            logger.debug(f"💾 Cache {outcome}: {endpoint} [{data.get('league')}]")
+
+        return payload, outcome
+
+    def set(self, endpoint: str, data: Dict[str, Any], payload: Dict):
+        """Grava (ou substitui) a resposta de um endpoint/liga"""
+        if self.ttl.get(endpoint, 0) <= 0:
+            return
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO responses (cache_key, endpoint, payload, fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET payload = excluded.payload, fetched_at = excluded.fetched_at",
+                (self.make_key(endpoint, data), endpoint, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Contadores de hit/stale/miss por endpoint (todos os processos)
+
+        Returns:
+            {endpoint: {"fresh": n, "stale": n, "miss": n, "hit_rate": %, "ttl": s}}
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT endpoint, outcome, count FROM stats").fetchall()
+        finally:
+            conn.close()
+
+        stats: Dict[str, Dict[str, Any]] = {}
+        for endpoint, outcome, count in rows:
+            entry = stats.setdefault(endpoint, {FRESH: 0, STALE: 0, MISS: 0})
+            entry[outcome] = count
+
+        for endpoint, entry in stats.items():
+            total = entry[FRESH] + entry[STALE] + entry[MISS]
+            entry["hit_rate"] = round((entry[FRESH] + entry[STALE]) / total * 100, 1) if total else 0
+            entry["ttl"] = self.ttl.get(endpoint, 0)
+
+        return stats
+
+    def clear(self):
+        """Remove todas as respostas (mantém os contadores)"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Retorna o cache compartilhado do processo (dados persistidos no SQLite)"""
+    global _response_cache
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
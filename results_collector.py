@@ -7,16 +7,63 @@ import logging
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from rapid_api_client import RapidAPIClient
+from async_rapid_api_client import fetch_all_leagues
+from incremental_sync import fetch_last_updated, check_league_changes, mark_league_synced
+from resilience import new_request_stats, get_breaker_states
 from models_rapidapi import Match, ScraperLog
-from database_rapidapi import get_db
-from config import RAPIDAPI_KEY, RAPIDAPI_HOST, RAPIDAPI_LEAGUES
+from odds_schema import ODDS_SCHEMA
+from match_time import site_now, utc_now, kickoff_at
+from db_writer import get_db_writer
+from database_rapidapi import get_db, bulk_upsert
+from config import (
+    RAPIDAPI_KEY,
+    RAPIDAPI_HOST,
+    RAPIDAPI_LEAGUES,
+    SCRAPER_INCREMENTAL,
+    RESULTS_INSERT_UNKNOWN,
+    RESULTS_ONLY_PENDING,
+    RESULTS_PENDING_LOOKBACK_HOURS
+)
 
 logger = logging.getLogger(__name__)
 
 
+def pending_result_leagues(
+    db: Session,
+    leagues: Optional[List[str]] = None,
+    lookback_hours: float = RESULTS_PENDING_LOOKBACK_HOURS
+) -> Dict[str, int]:
+    """
+    Ligas com partidas já iniciadas que ainda não têm resultado
+    
+    Busca por faixa no índice parcial ix_matches_pending_results (result IS NULL,
+    league + kickoff_at): só partidas iniciadas nas últimas lookback_hours horas.
+    
+    Args:
+        db: Sessão do banco
+        leagues: Ligas consideradas (None = RAPIDAPI_LEAGUES)
+        lookback_hours: Partidas mais antigas não contam (já saíram de /matchs)
+    
+    Returns:
+        {liga: partidas aguardando resultado} (só ligas com pendência)
+    """
+    if leagues is None:
+        leagues = RAPIDAPI_LEAGUES
+    
+    now = utc_now()
+    rows = db.query(Match.league, func.count(Match.id)).filter(
+        Match.result.is_(None),
+        Match.league.in_(leagues),
+        Match.kickoff_at.between(now - timedelta(hours=lookback_hours), now)
+    ).group_by(Match.league)
+    
+    return {league: count for league, count in rows}
+
+
 class ResultsCollector:
     """Coleta resultados históricos de partidas finalizadas"""
     
@@ -63,55 +110,54 @@ class ResultsCollector:
         else:
             return 'draw'
     
-    def _update_match_with_result(
-        self, 
-        match: Match, 
-        result_data: Dict,
-        db: Session
-    ) -> bool:
+    def _result_values(self, result_data: Dict) -> Optional[Dict]:
         """
-        Atualiza partida existente com resultado
+        Colunas de resultado de um item de /matchs
         
         Args:
-            match: Objeto Match do banco
             result_data: Dados do resultado da API
-            db: Sessão do banco
         
         Returns:
-            True se atualizado com sucesso
+            {goals_home, goals_away, total_goals, result, status} ou None se o placar é inválido
         """
-        try:
-            # Parse placar final
-            score_ft = result_data.get("resultadoFt") or result_data.get("resultado")
-            goals_home, goals_away = self._parse_score(score_ft)
-            
-            if goals_home is None or goals_away is None:
-                logger.warning(f"❌ Placar inválido para partida {match.external_id}: {score_ft}")
-                return False
-            
-            # Parse placar 1º tempo
-            score_ht = result_data.get("resultadoHt", "")
-            goals_home_ht, goals_away_ht = self._parse_score(score_ht)
-            
-            # Atualiza match
-            match.goals_home = goals_home
-            match.goals_away = goals_away
-            match.total_goals = goals_home + goals_away
-            match.result = self._determine_result(goals_home, goals_away)
-            match.status = "finished"
-            
-            # Metadados adicionais (se disponíveis)
-            if "primeiroMarcar" in result_data:
-                # Poderia adicionar campo no modelo se necessário
-                pass
-            
-            logger.debug(f"   ✓ Atualizada: {match.team_home} {goals_home}-{goals_away} {match.team_away}")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao atualizar partida {match.external_id}: {e}")
-            return False
+        # Parse placar final
+        score_ft = result_data.get("resultadoFt") or result_data.get("resultado")
+        goals_home, goals_away = self._parse_score(score_ft)
+        
+        if goals_home is None or goals_away is None:
+            logger.warning(f"❌ Placar inválido para partida {result_data.get('id')}: {score_ft}")
+            return None
+        
+        return {
+            "goals_home": goals_home,
+            "goals_away": goals_away,
+            "total_goals": goals_home + goals_away,
+            "result": self._determine_result(goals_home, goals_away),
+            "status": "finished"
+        }
+    
+    def _unknown_match_row(self, result_data: Dict, league: str, values: Dict) -> Dict:
+        """Linha completa do Match para um resultado de partida nunca coletada"""
+        odds = result_data.get("odds")
+        odds = odds if isinstance(odds, dict) and odds else None
+        
+        scraped_at = site_now()
+        row = {
+            "external_id": result_data.get("id"),
+            "league": league,
+            "team_home": result_data.get("timeA"),
+            "team_away": result_data.get("timeB"),
+            "hour": result_data.get("hora"),
+            "minute": result_data.get("minuto"),
+            "scheduled_time": result_data.get("horario"),
+            "odds_json": odds,
+            # Usa horário do site (local + 4h), como o scraper; o início fica em UTC
+            "scraped_at": scraped_at,
+            "kickoff_at": kickoff_at(result_data.get("hora"), result_data.get("minuto"), scraped_at)
+        }
+        row.update(ODDS_SCHEMA.parse(odds))
+        row.update(values)
+        return row
     
     def collect_league_results(
         self, 
@@ -135,55 +181,137 @@ class ResultsCollector:
         # Busca partidas finalizadas
         data = self.client.get_matches(league=league)
         
+        result = self.apply_league_results(league, data, db)
+        db.commit()
+        return result
+    
+    def apply_league_results(
+        self,
+        league: str,
+        data: Optional[Dict],
+        db: Session,
+        insert_unknown: Optional[bool] = None
+    ) -> Tuple[int, int]:
+        """
+        Aplica no banco os resultados de /matchs de uma liga (sem commit)
+        
+        Uma consulta busca as partidas do payload ainda sem resultado e um
+        UPDATE em lote grava todos os placares: o custo por ciclo não cresce
+        com o número de resultados. Partidas que já têm resultado são ignoradas.
+        
+        Args:
+            league: Nome da liga
+            data: Resposta da API (None em caso de erro na requisição)
+            db: Sessão do banco
+            insert_unknown: Insere (em lote) resultados de partidas nunca coletadas
+                (None = usa RESULTS_INSERT_UNKNOWN)
+        
+        Returns:
+            Tupla (total_encontrados, atualizados_ou_inseridos)
+        """
+        if insert_unknown is None:
+            insert_unknown = RESULTS_INSERT_UNKNOWN
+        
         if not data or not data.get("status"):
             logger.error(f"❌ Erro ao obter resultados de {league}")
             return (0, 0)
         
-        results_data = data.get("matchs", [])
-        total_found = len(results_data)
-        updated_count = 0
+        results_data = [r for r in data.get("matchs", []) if isinstance(r, dict) and r.get("id")]
+        total_found = len(data.get("matchs", []))
         
         logger.info(f"   Resultados encontrados: {total_found}")
         
+        values_by_id = {}
         for result_data in results_data:
             try:
-                external_id = result_data.get("id")
-                
-                # Busca partida no banco
-                match = db.query(Match).filter(
-                    Match.external_id == external_id
-                ).first()
-                
-                if match:
-                    # Atualiza com resultado
-                    if self._update_match_with_result(match, result_data, db):
-                        updated_count += 1
-                else:
-                    # Partida não estava no banco (pode criar se quiser)
-                    logger.debug(f"   ⚠️ Partida {external_id} não encontrada no banco")
-                
+                values = self._result_values(result_data)
             except Exception as e:
                 logger.error(f"❌ Erro ao processar resultado {result_data.get('id')}: {e}")
                 continue
+            if values is not None:
+                values_by_id[result_data["id"]] = (result_data, values)
         
-        db.commit()
+        # Uma consulta: partidas do payload ainda sem resultado (+ se faltam as odds)
+        pending = {
+            external_id: (match_id, missing_odds)
+            for match_id, external_id, missing_odds in db.query(
+                Match.id, Match.external_id, Match.odds_json.is_(None)
+            ).filter(
+                Match.external_id.in_(list(values_by_id)),
+                Match.result.is_(None)
+            )
+        } if values_by_id else {}
+        
+        updates = []
+        unknown = []
+        for external_id, (result_data, values) in values_by_id.items():
+            if external_id in pending:
+                match_id, missing_odds = pending[external_id]
+                update = {"id": match_id, **values}
+                
+                # Partida gravada sem odds: usa as odds que vêm junto com o resultado
+                odds = result_data.get("odds")
+                if missing_odds and isinstance(odds, dict) and odds:
+                    update.update(ODDS_SCHEMA.parse(odds))
+                    update["odds_json"] = odds
+                updates.append(update)
+            elif insert_unknown:
+                unknown.append(external_id)
+        
+        # Um UPDATE em lote (por chave primária) para todos os placares
+        if updates:
+            db.bulk_update_mappings(Match, updates)
+        
+        inserted_count = 0
+        if unknown:
+            # Pode ser partida já finalizada no banco: só insere o que não existe
+            existing = {
+                external_id for (external_id,) in db.query(Match.external_id).filter(
+                    Match.external_id.in_(unknown)
+                )
+            }
+            rows = [
+                self._unknown_match_row(values_by_id[external_id][0], league, values_by_id[external_id][1])
+                for external_id in unknown if external_id not in existing
+            ]
+            bulk_upsert(db, Match, rows, "external_id")
+            inserted_count = len(rows)
+            if inserted_count:
+                logger.info(f"   ➕ {inserted_count} partidas não coletadas inseridas com resultado")
+        
+        updated_count = len(updates) + inserted_count
         
         logger.info(f"   ✅ Liga {league}: {updated_count}/{total_found} partidas atualizadas")
         
         return (total_found, updated_count)
     
-    def collect_all_results(self, leagues: Optional[List[str]] = None) -> Dict:
+    def collect_all_results(
+        self,
+        leagues: Optional[List[str]] = None,
+        concurrent: bool = True,
+        incremental: Optional[bool] = None,
+        only_pending: Optional[bool] = None
+    ) -> Dict:
         """
         Coleta resultados de todas as ligas
         
         Args:
             leagues: Lista de ligas (None = todas)
+            concurrent: Se True, busca as ligas em paralelo (cliente async)
+            incremental: Se True, pula ligas sem mudança em /last-updated
+                (None = usa SCRAPER_INCREMENTAL)
+            only_pending: Se True, pula ligas sem partida aguardando resultado
+                (None = usa RESULTS_ONLY_PENDING; ignorado com RESULTS_INSERT_UNKNOWN)
         
         Returns:
             Estatísticas da coleta
         """
         if leagues is None:
             leagues = RAPIDAPI_LEAGUES
+        if incremental is None:
+            incremental = SCRAPER_INCREMENTAL
+        if only_pending is None:
+            only_pending = RESULTS_ONLY_PENDING
         
         logger.info(f"\n{'='*60}")
         logger.info(f"🏆 COLETANDO RESULTADOS HISTÓRICOS")
@@ -194,23 +322,121 @@ class ResultsCollector:
         total_updated = 0
         errors = []
         
-        with get_db() as db:
-            for league in leagues:
-                try:
-                    found, updated = self.collect_league_results(league, db)
-                    total_found += found
-                    total_updated += updated
-                    
-                except Exception as e:
-                    error_msg = f"Erro na liga {league}: {e}"
-                    logger.error(f"❌ {error_msg}")
-                    errors.append(error_msg)
+        # Retentativas/falhas deste ciclo (cliente async + cliente síncrono)
+        request_stats = new_request_stats()
+        client_stats_before = dict(self.client.stats)
+        
+        # Todas as gravações passam pelo escritor único do processo
+        writer = get_db_writer()
+        
+        def _create_log(db: Session) -> int:
+            log = ScraperLog(
+                status="running",
+                leagues_scraped=",".join(leagues),
+                scraper_mode="rapidapi_results",
+                started_at=datetime.utcnow()
+            )
+            db.add(log)
+            db.flush()
+            return log.id
+        
+        log_id = writer.run(_create_log, "scraper_log")
+        
+        # Só consulta ligas com partida já iniciada e ainda sem resultado
+        # (com RESULTS_INSERT_UNKNOWN toda liga pode trazer partidas novas)
+        leagues_to_fetch = leagues
+        pending = None
+        no_pending = []
+        if only_pending and not RESULTS_INSERT_UNKNOWN:
+            with get_db() as db:
+                pending = pending_result_leagues(db, leagues)
+            leagues_to_fetch = [league for league in leagues if league in pending]
+            no_pending = [league for league in leagues if league not in pending]
+        
+        # Modo incremental: só coleta ligas cujo /last-updated mudou
+        skipped = []
+        markers = {}
+        if incremental and leagues_to_fetch:
+            candidates = leagues_to_fetch
+            responses = fetch_last_updated(candidates, None if concurrent else self.client, request_stats)
+            leagues_to_fetch, skipped, markers = writer.run(
+                lambda db: check_league_changes("matchs", candidates, db, responses=responses),
+                "last-updated"
+            )
+        
+        # Pipeline: busca -> fila do escritor (cada liga entra assim que chega)
+        futures = {league: None for league in leagues_to_fetch}
+        
+        def _enqueue(league: str, data: Optional[Dict]):
+            logger.info(f"📊 Processando resultados da liga: {league}")
+            marker = markers.get(league) if incremental and data and data.get("status") else None
+            
+            def _write(db: Session) -> Tuple[int, int]:
+                result = self.apply_league_results(league, data, db)
+                mark_league_synced("matchs", league, marker, db)
+                return result
+            
+            futures[league] = writer.submit(_write, f"matchs:{league}")
+        
+        try:
+            if concurrent and leagues_to_fetch:
+                fetch_all_leagues("matchs", leagues_to_fetch, stats=request_stats, on_result=_enqueue)
+            else:
+                for league in leagues_to_fetch:
+                    logger.info(f"📊 Coletando resultados da liga: {league}")
+                    _enqueue(league, self.client.get_matches(league=league))
+        except Exception as e:
+            errors.append(f"Erro na coleta: {e}")
+            logger.error(f"❌ Erro na coleta: {e}")
+        
+        for league in leagues_to_fetch:
+            try:
+                if futures[league] is None:
+                    raise RuntimeError("liga não processada")
+                found, updated = futures[league].result()
+                total_found += found
+                total_updated += updated
+            
+            except Exception as e:
+                error_msg = f"Erro na liga {league}: {e}"
+                logger.error(f"❌ {error_msg}")
+                errors.append(error_msg)
+        
+        for key, value in self.client.stats.items():
+            request_stats[key] += value - client_stats_before.get(key, 0)
+        breaker_states = {
+            league: state for league, state in get_breaker_states().items() if league in leagues
+        }
+        
+        def _finish_log(db: Session):
+            log = db.get(ScraperLog, log_id)
+            log.leagues_scraped = ",".join(leagues_to_fetch)
+            log.status = "success" if not errors else ("partial" if total_found > 0 else "error")
+            log.matches_found = total_found
+            log.matches_updated = total_updated
+            log.leagues_skipped = len(no_pending) + len(skipped)
+            log.error_message = "; ".join(errors) if errors else None
+            log.retry_count = request_stats["retries"]
+            log.failed_requests = request_stats["failures"]
+            log.breaker_states = breaker_states
+            log.finished_at = datetime.utcnow()
+        
+        writer.run(_finish_log, "scraper_log")
         
         # Resumo
         logger.info(f"\n{'='*60}")
         logger.info(f"✅ COLETA DE RESULTADOS FINALIZADA")
         logger.info(f"   Resultados encontrados: {total_found}")
         logger.info(f"   Partidas atualizadas: {total_updated}")
+        if no_pending:
+            logger.info(f"   Ligas sem resultado pendente (puladas): {', '.join(no_pending)}")
+        if skipped:
+            logger.info(f"   Ligas sem novidades (puladas): {', '.join(skipped)}")
+        if request_stats["retries"] or request_stats["failures"] or request_stats["short_circuited"]:
+            logger.info(
+                f"   Requisições: {request_stats['requests']} | Retentativas: {request_stats['retries']} | "
+                f"Falhas: {request_stats['failures']} | Circuito aberto: {request_stats['short_circuited']}"
+            )
         if errors:
             logger.warning(f"   ⚠️ Erros: {len(errors)}")
         logger.info(f"{'='*60}\n")
@@ -218,19 +444,28 @@ class ResultsCollector:
         return {
             "results_found": total_found,
             "matches_updated": total_updated,
+            "leagues_skipped": skipped,
+            "leagues_no_pending": no_pending,
+            "pending_results": pending,
+            "requests": request_stats,
+            "breaker_states": breaker_states,
             "errors": errors
         }
 
 
-def run_results_collector(leagues: Optional[List[str]] = None) -> Dict:
+def run_results_collector(
+    leagues: Optional[List[str]] = None,
+    incremental: Optional[bool] = None
+) -> Dict:
     """
     Função conveniente para executar o coletor de resultados
     
     Args:
         leagues: Lista de ligas (None = todas)
+        incremental: Pula ligas sem novidades (None = usa SCRAPER_INCREMENTAL)
     
     Returns:
         Estatísticas da coleta
     """
     collector = ResultsCollector()
-    return collector.collect_all_results(leagues)
+    return collector.collect_all_results(leagues, incremental=incremental)
@@ -3,22 +3,54 @@ Scraper usando RapidAPI - Futebol Virtual Bet365
 Sem CAPTCHA, sem Selenium, dados estruturados em JSON!
 """
 
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from sqlalchemy import func
+
 from rapid_api_client import RapidAPIClient
-from models_rapidapi import Match, ScraperLog, Base
-from database_rapidapi import get_db
+from async_rapid_api_client import fetch_sources
+from incremental_sync import (
+    fetch_last_updated,
+    check_league_changes,
+    mark_league_synced,
+    payload_hash,
+    is_payload_unchanged,
+    store_payload_hash
+)
+from resilience import new_request_stats, get_breaker_states
+from odds_history import diff_odds, record_odds_changes
+from odds_schema import ODDS_SCHEMA
+from match_time import site_now, kickoff_at
+from match_status import initial_status
+from models_rapidapi import Match, MatchPrice, ScraperLog, Base
+from sources import Source, get_sources, DEFAULT_SPORT_ID
+from database_rapidapi import bulk_upsert
+from db_writer import get_db_writer
 from config import (
     RAPIDAPI_KEY,
     RAPIDAPI_HOST,
-    RAPIDAPI_LEAGUES
+    SCRAPER_INCREMENTAL,
+    ODDS_HISTORY_ENABLED,
+    SOURCE_PRIMARY_BOOKMAKER
 )
 
 logger = logging.getLogger(__name__)
 
+# Campos que entram no fingerprint (as colunas de odds derivam do odds_json)
+FINGERPRINT_FIELDS = ("team_home", "team_away", "hour", "minute", "scheduled_time", "odds_json")
+
+# Janela para ligar as odds de outra casa a uma partida já gravada (por times + horário)
+PRICE_LINK_LOOKBACK = timedelta(hours=12)
+
+
+def match_fingerprint(match_dict: Dict) -> str:
+    """Hash dos dados normalizados da partida (times, horário e odds)"""
+    return payload_hash({key: match_dict.get(key) for key in FINGERPRINT_FIELDS})
+
 
 class RapidAPIScraper:
     """Scraper usando RapidAPI - muito mais eficiente que Selenium!"""
@@ -29,109 +61,90 @@ class RapidAPIScraper:
             api_host=RAPIDAPI_HOST
         )
     
-    def _parse_odds_value(self, value: str) -> Optional[float]:
-        """Converte string de odd para float"""
-        if not value:
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    
-    def _extract_match_data(self, match_data: Dict, league: str) -> Dict:
+    def _extract_match_data(
+        self,
+        match_data: Dict,
+        league: str,
+        parsed_odds: Optional[Dict] = None,
+        sport_id: int = DEFAULT_SPORT_ID
+    ) -> Dict:
         """
         Extrai e normaliza dados de uma partida
         
         Args:
             match_data: Dados brutos da API
             league: Liga da partida
+            parsed_odds: Colunas de odds já convertidas (parse em lote da liga);
+                None = converte aqui
+            sport_id: Esporte da partida (sport_id da RapidAPI)
         
         Returns:
             Dicionário com dados normalizados
         """
         odds = match_data.get("odds", {})
+        if not isinstance(odds, dict):
+            raise ValueError(f"odds em formato inesperado ({type(odds).__name__})")
         
-        return {
+        match_dict = {
             "external_id": match_data.get("id"),
             "league": league,
+            "sport_id": sport_id,
             "team_home": match_data.get("timeA"),
             "team_away": match_data.get("timeB"),
             "hour": match_data.get("hora"),
             "minute": match_data.get("minuto"),
-            "scheduled_time": match_data.get("horario"),
-            
-            # Odds - Resultado Final
-            "odd_home": self._parse_odds_value(odds.get("odd_resultado_final_casa")),
-            "odd_draw": self._parse_odds_value(odds.get("odd_resultado_final_empate")),
-            "odd_away": self._parse_odds_value(odds.get("odd_resultado_final_fora")),
-            
-            # Odds - Over/Under
-            "odd_over_05": self._parse_odds_value(odds.get("odd_over_0.5")),
-            "odd_under_05": self._parse_odds_value(odds.get("odd_under_0.5")),
-            "odd_over_15": self._parse_odds_value(odds.get("odd_over_1.5")),
-            "odd_under_15": self._parse_odds_value(odds.get("odd_under_1.5")),
-            "odd_over_25": self._parse_odds_value(odds.get("odd_over_2.5")),
-            "odd_under_25": self._parse_odds_value(odds.get("odd_under_2.5")),
-            "odd_over_35": self._parse_odds_value(odds.get("odd_over_3.5")),
-            "odd_under_35": self._parse_odds_value(odds.get("odd_under_3.5")),
-            
-            # Odds - Ambas Marcam
-            "odd_both_score_yes": self._parse_odds_value(odds.get("odd_ambas_sim")),
-            "odd_both_score_no": self._parse_odds_value(odds.get("odd_ambas_nao")),
-            
-            # Odds - Resultado Correto
-            "odd_correct_1_0_home": self._parse_odds_value(odds.get("odd_resultado_correto_casa_1-0")),
-            "odd_correct_0_0": self._parse_odds_value(odds.get("odd_resultado_correto_empate_0-0")),
-            "odd_correct_1_0_away": self._parse_odds_value(odds.get("odd_resultado_correto_fora_1-0")),
-            "odd_correct_2_0_home": self._parse_odds_value(odds.get("odd_resultado_correto_casa_2-0")),
-            "odd_correct_1_1": self._parse_odds_value(odds.get("odd_resultado_correto_empate_1-1")),
-            "odd_correct_2_0_away": self._parse_odds_value(odds.get("odd_resultado_correto_fora_2-0")),
-            "odd_correct_2_1_home": self._parse_odds_value(odds.get("odd_resultado_correto_casa_2-1")),
-            "odd_correct_2_2": self._parse_odds_value(odds.get("odd_resultado_correto_empate_2-2")),
-            "odd_correct_2_1_away": self._parse_odds_value(odds.get("odd_resultado_correto_fora_2-1")),
-            
-            # Odds - Dupla Hipótese
-            "odd_double_home_draw": self._parse_odds_value(odds.get("odd_dupla_hipotese_casa_ou_empate")),
-            "odd_double_away_draw": self._parse_odds_value(odds.get("odd_dupla_hipotese_fora_ou_empate")),
-            "odd_double_home_away": self._parse_odds_value(odds.get("odd_dupla_hipotese_casa_ou_fora")),
-            
-            # Odds - Total de Gols Exatos
-            "odd_exact_goals_0": self._parse_odds_value(odds.get("odd_total_gols_extatos_0")),
-            "odd_exact_goals_1": self._parse_odds_value(odds.get("odd_total_gols_extatos_1")),
-            "odd_exact_goals_2": self._parse_odds_value(odds.get("odd_total_gols_extatos_2")),
-            "odd_exact_goals_3": self._parse_odds_value(odds.get("odd_total_gols_extatos_3")),
-            "odd_exact_goals_4": self._parse_odds_value(odds.get("odd_total_gols_extatos_4")),
-            "odd_exact_goals_5": self._parse_odds_value(odds.get("odd_total_gols_extatos_5")),
-            
-            # Odds - Intervalo
-            "odd_halftime_home": self._parse_odds_value(odds.get("odd_intervalo_resultado_casa")),
-            "odd_halftime_draw": self._parse_odds_value(odds.get("odd_intervalo_resultado_empate")),
-            "odd_halftime_away": self._parse_odds_value(odds.get("odd_intervalo_resultado_fora")),
-            
-            # Odds - Gols por Time
-            "odd_home_goals_0": self._parse_odds_value(odds.get("odd_time_gols_casa_0")),
-            "odd_home_goals_1": self._parse_odds_value(odds.get("odd_time_gols_casa_1")),
-            "odd_home_goals_2": self._parse_odds_value(odds.get("odd_time_gols_casa_2")),
-            "odd_home_goals_3": self._parse_odds_value(odds.get("odd_time_gols_casa_3")),
-            "odd_away_goals_0": self._parse_odds_value(odds.get("odd_time_gols_fora_0")),
-            "odd_away_goals_1": self._parse_odds_value(odds.get("odd_time_gols_fora_1")),
-            "odd_away_goals_2": self._parse_odds_value(odds.get("odd_time_gols_fora_2")),
-            "odd_away_goals_3": self._parse_odds_value(odds.get("odd_time_gols_fora_3")),
-            
-            # Odds - Handicap Asiático
-            "odd_handicap_home": self._parse_odds_value(odds.get("odd_handicap_asiatico_casa")),
-            "odd_handicap_away": self._parse_odds_value(odds.get("odd_handicap_asiatico_fora")),
-            
+            "scheduled_time": match_data.get("horario")
+        }
+        
+        # Odds mapeadas para colunas (ver odds_schema.ODDS_FIELDS)
+        match_dict.update(parsed_odds if parsed_odds is not None else ODDS_SCHEMA.parse(odds))
+        
+        scraped_at = site_now()
+        kickoff = kickoff_at(match_dict["hour"], match_dict["minute"], scraped_at)
+        match_dict.update({
             # JSON completo das odds (para análises futuras)
             "odds_json": odds,
             
             # Metadados
-            "status": "scheduled",
-            # Usa horário do site (local + 4h)
-            "scraped_at": datetime.now() + timedelta(hours=4)
-        }
+            "status": initial_status(kickoff),
+            # Usa horário do site (local + 4h); o início fica em UTC
+            "scraped_at": scraped_at,
+            "kickoff_at": kickoff
+        })
+        match_dict["fingerprint"] = match_fingerprint(match_dict)
+        
+        return match_dict
     
-    def scrape_league(self, league: str, db: Session) -> Tuple[int, int, int]:
+    def _extract_matches(
+        self,
+        matches_data: List[Dict],
+        league: str,
+        sport_id: int = DEFAULT_SPORT_ID
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Normaliza todas as partidas de uma liga (odds convertidas em uma passada)
+        
+        Returns:
+            Tupla (partidas_normalizadas, houve_erro)
+        """
+        odds_list = [
+            m.get("odds") if isinstance(m, dict) and isinstance(m.get("odds"), dict) else None
+            for m in matches_data
+        ]
+        parsed = ODDS_SCHEMA.parse_batch(odds_list)
+        
+        rows = []
+        failed = False
+        for match_data, parsed_odds in zip(matches_data, parsed):
+            try:
+                rows.append(self._extract_match_data(match_data, league, parsed_odds, sport_id))
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar partida {match_data.get('id') if isinstance(match_data, dict) else match_data}: {e}")
+                failed = True
+        
+        return rows, failed
+    
+    def scrape_league(self, league: str, db: Session) -> Tuple[int, int, int, int]:
         """
         Coleta dados de uma liga específica
         
@@ -140,135 +153,466 @@ class RapidAPIScraper:
             db: Sessão do banco de dados
         
         Returns:
-            Tupla (total_encontradas, novas, atualizadas)
+            Tupla (total_encontradas, novas, atualizadas, sem_mudanca)
         """
         logger.info(f"📊 Coletando dados da liga: {league}")
         
         # Busca próximas partidas
         data = self.client.get_next_matches(league=league)
         
+        return self.ingest_league_payload(league, data, db)
+    
+    def ingest_league_payload(
+        self,
+        league: str,
+        data: Optional[Dict],
+        db: Session
+    ) -> Tuple[int, int, int, int]:
+        """
+        Grava no banco a resposta de /next-matchs de uma liga (e faz commit)
+        
+        Args:
+            league: Nome da liga
+            data: Resposta da API (None em caso de erro na requisição)
+            db: Sessão do banco de dados
+        
+        Returns:
+            Tupla (total_encontradas, novas, atualizadas, sem_mudanca)
+        """
+        result = self.write_league_payload(league, self.prepare_league_payload(league, data), db)
+        db.commit()
+        return result
+    
+    def prepare_league_payload(
+        self,
+        league: str,
+        data: Optional[Dict],
+        sport_id: int = DEFAULT_SPORT_ID
+    ) -> Optional[Dict]:
+        """
+        Etapa de parse (sem banco): normaliza a resposta de /next-matchs de uma liga
+        
+        Args:
+            league: Nome da liga
+            data: Resposta da API (None em caso de erro na requisição)
+            sport_id: Esporte da liga (sport_id da RapidAPI)
+        
+        Returns:
+            {"total_found", "digest", "rows", "failed"} ou None se a resposta é inválida
+        """
         if not data or not data.get("status"):
             logger.error(f"❌ Erro ao obter dados de {league}")
-            return (0, 0, 0)
+            return None
         
         matches_data = data.get("matchs", [])
-        total_found = len(matches_data)
-        new_count = 0
-        updated_count = 0
+        rows, failed = self._extract_matches(matches_data, league, sport_id)
         
-        logger.info(f"   Partidas encontradas: {total_found}")
+        return {
+            "total_found": len(matches_data),
+            "digest": payload_hash(matches_data),
+            "rows": rows,
+            "failed": failed
+        }
+    
+    def write_league_payload(
+        self,
+        league: str,
+        prepared: Optional[Dict],
+        db: Session
+    ) -> Tuple[int, int, int, int]:
+        """
+        Etapa de escrita: grava as partidas já normalizadas de uma liga (sem commit)
         
-        for match_data in matches_data:
-            try:
-                external_id = match_data.get("id")
-                
-                # Verifica se partida já existe
-                existing_match = db.query(Match).filter(
-                    Match.external_id == external_id
-                ).first()
-                
-                # Extrai dados normalizados
-                match_dict = self._extract_match_data(match_data, league)
-                
-                if existing_match:
-                    # Atualiza partida existente (odds podem mudar)
-                    for key, value in match_dict.items():
-                        if key != "scraped_at":  # Mantém scraped_at original
-                            setattr(existing_match, key, value)
-                    updated_count += 1
-                    logger.debug(f"   ↻ Atualizada: {match_dict['team_home']} vs {match_dict['team_away']}")
-                else:
-                    # Cria nova partida
-                    new_match = Match(**match_dict)
-                    db.add(new_match)
-                    new_count += 1
-                    logger.debug(f"   ✓ Nova: {match_dict['team_home']} vs {match_dict['team_away']}")
-                
-            except Exception as e:
-                logger.error(f"❌ Erro ao processar partida {match_data.get('id')}: {e}")
-                continue
+        Se as partidas são idênticas (mesmo hash) às da última ingestão da liga,
+        não consulta nem grava nada: todas contam como sem mudança.
+        Caso contrário, só as partidas cujo fingerprint mudou são regravadas.
         
-        db.commit()
+        Args:
+            league: Nome da liga
+            prepared: Retorno de prepare_league_payload
+            db: Sessão do banco de dados
+        
+        Returns:
+            Tupla (total_encontradas, novas, atualizadas, sem_mudanca)
+        """
+        if prepared is None:
+            return (0, 0, 0, 0)
+        
+        total_found = prepared["total_found"]
+        digest = prepared["digest"]
+        rows = prepared["rows"]
+        failed = prepared["failed"]
+        
+        logger.info(f"   Partidas encontradas em {league}: {total_found}")
+        
+        if is_payload_unchanged("next-matchs", league, digest, db):
+            logger.info(f"   ⏸️  Liga {league}: payload idêntico ao anterior, nada a gravar")
+            return (total_found, 0, 0, total_found)
+        
+        # Uma busca IN traz o fingerprint atual; só partidas novas ou alteradas são gravadas
+        external_ids = [row["external_id"] for row in rows]
+        stored = dict(
+            db.query(Match.external_id, Match.fingerprint).filter(
+                Match.external_id.in_(external_ids)
+            )
+        ) if external_ids else {}
+        
+        changed_rows = [
+            row for row in rows
+            if row["external_id"] not in stored or stored[row["external_id"]] != row["fingerprint"]
+        ]
+        new_count = sum(1 for row in changed_rows if row["external_id"] not in stored)
+        updated_count = len(changed_rows) - new_count
+        unchanged_count = len(rows) - len(changed_rows)
+        
+        # Odds anteriores das partidas alteradas (só elas, para o histórico)
+        previous_odds = {}
+        if ODDS_HISTORY_ENABLED and updated_count:
+            previous_odds = dict(
+                db.query(Match.external_id, Match.odds_json).filter(
+                    Match.external_id.in_([row["external_id"] for row in changed_rows if row["external_id"] in stored])
+                )
+            )
+        
+        # Atualização mantém o scraped_at original e o status (avança só por match_status)
+        bulk_upsert(db, Match, changed_rows, "external_id", keep_on_update=("scraped_at", "status"))
+        
+        # Partidas novas não entram no histórico: a odd de abertura é a do odds_json
+        if previous_odds:
+            match_ids = dict(
+                db.query(Match.external_id, Match.id).filter(
+                    Match.external_id.in_(list(previous_odds))
+                )
+            )
+            record_odds_changes(db, (
+                (match_ids[row["external_id"]], row["scraped_at"], diff_odds(previous_odds[row["external_id"]], row["odds_json"]))
+                for row in changed_rows if row["external_id"] in previous_odds and row["external_id"] in match_ids
+            ))
         
-        logger.info(f"   ✅ Liga {league}: {new_count} novas, {updated_count} atualizadas")
+        # Só memoriza o hash se todas as partidas foram gravadas
+        store_payload_hash("next-matchs", league, None if failed else digest, db)
         
-        return (total_found, new_count, updated_count)
+        logger.info(f"   ✅ Liga {league}: {new_count} novas, {updated_count} atualizadas, {unchanged_count} sem mudança")
+        
+        return (total_found, new_count, updated_count, unchanged_count)
     
-    def scrape_all_leagues(self, leagues: Optional[List[str]] = None) -> Dict:
+    def write_bookmaker_prices(
+        self,
+        source: Source,
+        prepared: Optional[Dict],
+        db: Session
+    ) -> Tuple[int, int, int, int, int]:
         """
-        Coleta dados de todas as ligas (ou lista especificada)
+        Etapa de escrita de uma casa que não é a principal (sem commit)
+        
+        Cada partida é ligada à linha já existente em matches pela liga, esporte,
+        times e horário, e as odds vão para match_prices (uma linha por partida e
+        casa). Partidas que a casa principal ainda não trouxe ficam de fora e são
+        tentadas de novo no próximo ciclo.
+        
+        Args:
+            source: Célula (liga × casa × esporte)
+            prepared: Retorno de prepare_league_payload
+            db: Sessão do banco de dados
+        
+        Returns:
+            Tupla (total_encontradas, novas, atualizadas, sem_mudanca, sem_partida)
+        """
+        if prepared is None:
+            return (0, 0, 0, 0, 0)
+        
+        total_found = prepared["total_found"]
+        digest = prepared["digest"]
+        rows = prepared["rows"]
+        
+        logger.info(f"   Partidas encontradas em {source.key}: {total_found}")
+        
+        if is_payload_unchanged("next-matchs", source.key, digest, db):
+            logger.info(f"   ⏸️  Fonte {source.key}: payload idêntico ao anterior, nada a gravar")
+            return (total_found, 0, 0, total_found, 0)
+        
+        # Partidas recentes da liga, pela chave natural (a mais recente vence)
+        since = site_now() - PRICE_LINK_LOOKBACK
+        candidates = db.query(
+            Match.id, Match.team_home, Match.team_away, Match.hour, Match.minute
+        ).filter(
+            Match.league == source.league,
+            func.coalesce(Match.sport_id, DEFAULT_SPORT_ID) == source.sport_id,
+            Match.scraped_at >= since
+        ).order_by(Match.scraped_at)
+        by_key = {(home, away, hour, minute): match_id for match_id, home, away, hour, minute in candidates}
+        
+        linked = {}
+        for row in rows:
+            match_id = by_key.get((row["team_home"], row["team_away"], row["hour"], row["minute"]))
+            if match_id is not None:
+                linked[match_id] = row
+        unmatched = len(rows) - len(linked)
+        
+        stored = {
+            match_id: (price_id, fingerprint)
+            for price_id, match_id, fingerprint in db.query(
+                MatchPrice.id, MatchPrice.match_id, MatchPrice.fingerprint
+            ).filter(
+                MatchPrice.bookmaker == source.bookmaker,
+                MatchPrice.match_id.in_(list(linked))
+            )
+        } if linked else {}
+        
+        inserts = []
+        updates = []
+        for match_id, row in linked.items():
+            price = {
+                "match_id": match_id,
+                "bookmaker": source.bookmaker,
+                "external_id": row["external_id"],
+                "odd_home": row.get("odd_home"),
+                "odd_draw": row.get("odd_draw"),
+                "odd_away": row.get("odd_away"),
+                "odds_json": row["odds_json"],
+                "fingerprint": row["fingerprint"],
+                "updated_at": row["scraped_at"]
+            }
+            if match_id not in stored:
+                inserts.append({**price, "scraped_at": row["scraped_at"]})
+            elif stored[match_id][1] != row["fingerprint"]:
+                updates.append({**price, "id": stored[match_id][0]})
+        
+        if inserts:
+            db.bulk_insert_mappings(MatchPrice, inserts)
+        if updates:
+            db.bulk_update_mappings(MatchPrice, updates)
+        
+        # Com partidas ainda sem ligação, o mesmo payload precisa ser reprocessado
+        complete = not prepared["failed"] and not unmatched
+        store_payload_hash("next-matchs", source.key, digest if complete else None, db)
+        
+        unchanged_count = len(linked) - len(inserts) - len(updates)
+        logger.info(
+            f"   ✅ Fonte {source.key}: {len(inserts)} novas, {len(updates)} atualizadas, "
+            f"{unchanged_count} sem mudança, {unmatched} sem partida"
+        )
+        
+        return (total_found, len(inserts), len(updates), unchanged_count, unmatched)
+    
+    def scrape_all_leagues(
+        self,
+        leagues: Optional[List[str]] = None,
+        concurrent: bool = True,
+        incremental: Optional[bool] = None,
+        sources: Optional[List[Source]] = None
+    ) -> Dict:
+        """
+        Coleta dados de todas as fontes (liga × casa × esporte) das ligas pedidas
         
         Args:
             leagues: Lista de ligas para coletar (None = todas)
+            concurrent: Se True, busca as fontes em paralelo (cliente async,
+                no máximo SOURCE_MAX_WORKERS por vez)
+            incremental: Se True, pula ligas sem mudança em /last-updated
+                (None = usa SCRAPER_INCREMENTAL; só vale para a casa/esporte padrão)
+            sources: Células a coletar (None = SOURCE_MATRIX filtrada por leagues)
         
         Returns:
-            Dicionário com estatísticas da coleta
+            Dicionário com estatísticas da coleta (por fonte em "sources")
         """
+        if sources is None:
+            sources = get_sources(leagues)
         if leagues is None:
-            leagues = RAPIDAPI_LEAGUES
+            leagues = list(dict.fromkeys(source.league for source in sources))
+        if incremental is None:
+            incremental = SCRAPER_INCREMENTAL
         
         logger.info(f"\n{'='*60}")
         logger.info(f"🚀 INICIANDO COLETA - RapidAPI")
         logger.info(f"   Ligas: {', '.join(leagues)}")
+        if any(source.key != source.league for source in sources):
+            logger.info(f"   Fontes: {', '.join(source.key for source in sources)}")
         logger.info(f"{'='*60}\n")
         
-        # Cria log da execução
-        log = ScraperLog(
-            status="running",
-            leagues_scraped=",".join(leagues),
-            scraper_mode="rapidapi",
-            started_at=datetime.utcnow()
-        )
-        
         total_found = 0
         total_new = 0
         total_updated = 0
+        total_unchanged = 0
+        unchanged_leagues = []
         errors = []
+        source_stats = {}
+        
+        # Retentativas/falhas deste ciclo (cliente async + cliente síncrono)
+        request_stats = new_request_stats()
+        client_stats_before = dict(self.client.stats)
+        
+        # Todas as gravações passam pelo escritor único do processo
+        writer = get_db_writer()
         
-        with get_db() as db:
+        def _create_log(db: Session) -> int:
+            log = ScraperLog(
+                status="running",
+                leagues_scraped=",".join(leagues),
+                scraper_mode="rapidapi",
+                started_at=datetime.utcnow()
+            )
             db.add(log)
-            db.commit()
-            db.refresh(log)
+            db.flush()
+            return log.id
+        
+        log_id = writer.run(_create_log, "scraper_log")
+        
+        # Modo incremental: só coleta ligas cujo /last-updated mudou
+        # (/last-updated é consultado na casa/esporte padrão, chave = nome da liga)
+        skipped = []
+        markers = {}
+        if incremental:
+            default_leagues = [source.league for source in sources if source.key == source.league]
+            if default_leagues:
+                responses = fetch_last_updated(default_leagues, None if concurrent else self.client, request_stats)
+                _, skipped, markers = writer.run(
+                    lambda db: check_league_changes("next-matchs", default_leagues, db, responses=responses),
+                    "last-updated"
+                )
+        sources_to_fetch = [source for source in sources if source.key not in skipped]
+        
+        # Pipeline: busca -> parse -> fila do escritor (cada fonte entra assim que chega)
+        futures = {}
+        started = time.perf_counter()
+        
+        def _enqueue(source: Source, data: Optional[Dict]):
+            logger.info(f"📊 Processando fonte: {source.key}")
+            fetched_in = time.perf_counter() - started
+            prepared = self.prepare_league_payload(source.league, data, source.sport_id)
+            marker = markers.get(source.key) if incremental and prepared is not None else None
             
-            # Coleta cada liga
-            for league in leagues:
-                try:
-                    found, new, updated = self.scrape_league(league, db)
-                    total_found += found
-                    total_new += new
-                    total_updated += updated
-                    
-                except Exception as e:
-                    error_msg = f"Erro na liga {league}: {e}"
-                    logger.error(f"❌ {error_msg}")
-                    errors.append(error_msg)
+            def _write(db: Session) -> Dict:
+                if source.is_primary:
+                    found, new, updated, unchanged = self.write_league_payload(source.key, prepared, db)
+                    unmatched = 0
+                else:
+                    found, new, updated, unchanged, unmatched = self.write_bookmaker_prices(source, prepared, db)
+                mark_league_synced("next-matchs", source.key, marker, db)
+                return {
+                    "league": source.league,
+                    "bookmaker": source.bookmaker,
+                    "sport_id": source.sport_id,
+                    "found": found,
+                    "new": new,
+                    "updated": updated,
+                    "unchanged": unchanged,
+                    "unmatched": unmatched,
+                    "fetch_seconds": round(fetched_in, 3),
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "error": None if prepared is not None else "resposta inválida"
+                }
             
-            # Atualiza log
+            futures[source] = writer.submit(_write, f"next-matchs:{source.key}")
+        
+        for source in sources_to_fetch:
+            futures[source] = None
+        
+        try:
+            if concurrent and sources_to_fetch:
+                fetch_sources("next-matchs", sources_to_fetch, stats=request_stats, on_result=_enqueue)
+            else:
+                for source in sources_to_fetch:
+                    logger.info(f"📊 Coletando dados da fonte: {source.key}")
+                    _enqueue(source, self.client.get_next_matches(
+                        league=source.league, home=source.bookmaker, sport_id=source.sport_id
+                    ))
+        except Exception as e:
+            errors.append(f"Erro na coleta: {e}")
+            logger.error(f"❌ Erro na coleta: {e}")
+        
+        for source in sources_to_fetch:
+            try:
+                if futures[source] is None:
+                    raise RuntimeError("fonte não processada")
+                stats = futures[source].result()
+                source_stats[source.key] = stats
+                
+                # Totais contam partidas; odds de outras casas ficam só em "sources"
+                if source.is_primary:
+                    total_found += stats["found"]
+                    total_new += stats["new"]
+                    total_updated += stats["updated"]
+                    total_unchanged += stats["unchanged"]
+                    if stats["found"] and stats["unchanged"] == stats["found"]:
+                        unchanged_leagues.append(source.key)
+            
+            except Exception as e:
+                error_msg = f"Erro na fonte {source.key}: {e}"
+                logger.error(f"❌ {error_msg}")
+                errors.append(error_msg)
+                source_stats[source.key] = {
+                    "league": source.league,
+                    "bookmaker": source.bookmaker,
+                    "sport_id": source.sport_id,
+                    "error": str(e)
+                }
+        
+        for key, value in self.client.stats.items():
+            request_stats[key] += value - client_stats_before.get(key, 0)
+        source_keys = {source.key for source in sources}
+        breaker_states = {
+            key: state for key, state in get_breaker_states().items() if key in source_keys
+        }
+        
+        def _finish_log(db: Session) -> Dict:
+            log = db.get(ScraperLog, log_id)
+            log.leagues_scraped = ",".join(dict.fromkeys(source.league for source in sources_to_fetch))
             log.status = "success" if not errors else ("partial" if total_found > 0 else "error")
             log.matches_found = total_found
             log.matches_new = total_new
             log.matches_updated = total_updated
+            log.matches_unchanged = total_unchanged
+            log.leagues_unchanged = ",".join(unchanged_leagues) or None
+            log.leagues_skipped = len(skipped)
             log.error_message = "; ".join(errors) if errors else None
+            log.retry_count = request_stats["retries"]
+            log.failed_requests = request_stats["failures"]
+            log.breaker_states = breaker_states
+            log.source_stats = source_stats
             log.finished_at = datetime.utcnow()
             
-            db.commit()
-            
             # Captura dados do log antes de fechar sessão
-            log_data = {
+            return {
                 "status": log.status,
                 "leagues": leagues,
                 "matches_found": log.matches_found,
                 "matches_new": log.matches_new,
                 "matches_updated": log.matches_updated,
+                "matches_unchanged": log.matches_unchanged,
+                "leagues_unchanged": unchanged_leagues,
+                "leagues_skipped": skipped,
+                "sources": source_stats,
+                "requests": request_stats,
+                "breaker_states": breaker_states,
                 "errors": errors
             }
         
-        # Resumo (fora do with, log já está detached mas temos log_data)
+        log_data = writer.run(_finish_log, "scraper_log")
+        
+        # Resumo
         logger.info(f"\n{'='*60}")
         logger.info(f"✅ COLETA FINALIZADA")
         logger.info(f"   Partidas encontradas: {log_data['matches_found']}")
         logger.info(f"   Novas: {log_data['matches_new']}")
         logger.info(f"   Atualizadas: {log_data['matches_updated']}")
+        if log_data["matches_unchanged"]:
+            logger.info(f"   Sem mudança: {log_data['matches_unchanged']}")
+        if unchanged_leagues:
+            logger.info(f"   Ligas sem nenhuma alteração: {', '.join(unchanged_leagues)}")
+        if skipped:
+            logger.info(f"   Ligas sem novidades (puladas): {', '.join(skipped)}")
+        for key, stats in source_stats.items():
+            if stats.get("bookmaker") != SOURCE_PRIMARY_BOOKMAKER and "found" in stats:
+                logger.info(
+                    f"   Odds {key}: {stats['new']} novas, {stats['updated']} atualizadas, "
+                    f"{stats['unmatched']} sem partida"
+                )
+        if request_stats["retries"] or request_stats["failures"] or request_stats["short_circuited"]:
+            logger.info(
+                f"   Requisições: {request_stats['requests']} | Retentativas: {request_stats['retries']} | "
+                f"Falhas: {request_stats['failures']} | Circuito aberto: {request_stats['short_circuited']}"
+            )
         if log_data["errors"]:
             logger.warning(f"   ⚠️ Erros: {len(log_data['errors'])}")
         logger.info(f"{'='*60}\n")
@@ -276,15 +620,19 @@ class RapidAPIScraper:
         return log_data
 
 
-def run_rapidapi_scraper(leagues: Optional[List[str]] = None) -> Dict:
+def run_rapidapi_scraper(
+    leagues: Optional[List[str]] = None,
+    incremental: Optional[bool] = None
+) -> Dict:
     """
     Função conveniente para executar o scraper
     
     Args:
         leagues: Lista de ligas (None = todas)
+        incremental: Pula ligas sem novidades (None = usa SCRAPER_INCREMENTAL)
     
     Returns:
         Estatísticas da coleta
     """
     scraper = RapidAPIScraper()
-    return scraper.scrape_all_leagues(leagues)
+    return scraper.scrape_all_leagues(leagues, incremental=incremental)
@@ -0,0 +1,95 @@
+"""
+Matriz de fontes da coleta: liga × casa de apostas × esporte
+Cada célula é uma combinação (league, home, sport_id) aceita pela RapidAPI.
+A casa principal (SOURCE_PRIMARY_BOOKMAKER) cria as partidas; as outras
+casas só anexam suas odds (MatchPrice) às partidas já conhecidas.
+
+Formato de SOURCE_MATRIX:
+    bet365:1:express,copa,super,euro,premier;betano:1:euro,premier
+"""
+
+import logging
+from typing import List, NamedTuple, Optional
+
+from config import RAPIDAPI_LEAGUES, SOURCE_MATRIX, SOURCE_PRIMARY_BOOKMAKER
+
+logger = logging.getLogger(__name__)
+
+# Padrões dos clientes da RapidAPI (home/sport_id)
+DEFAULT_BOOKMAKER = "bet365"
+DEFAULT_SPORT_ID = 1
+
+
+def source_key(league: str, bookmaker: str = DEFAULT_BOOKMAKER, sport_id: int = DEFAULT_SPORT_ID) -> str:
+    """
+    Chave da célula (circuit breaker, estado incremental, estatísticas)
+    A célula padrão usa só o nome da liga, como antes da matriz.
+    """
+    if bookmaker == DEFAULT_BOOKMAKER and int(sport_id) == DEFAULT_SPORT_ID:
+        return league
+    return f"{league}@{bookmaker}/{sport_id}"
+
+
+class Source(NamedTuple):
+    """Uma célula da matriz de fontes"""
+    league: str
+    bookmaker: str = DEFAULT_BOOKMAKER
+    sport_id: int = DEFAULT_SPORT_ID
+
+    @property
+    def key(self) -> str:
+        return source_key(self.league, self.bookmaker, self.sport_id)
+
+    @property
+    def is_primary(self) -> bool:
+        """Casa principal: grava as partidas (as outras só anexam odds)"""
+        return self.bookmaker == SOURCE_PRIMARY_BOOKMAKER
+
+
+def parse_source_matrix(spec: str) -> List[Source]:
+    """
+    Converte SOURCE_MATRIX em células (vazio = casa padrão, todas as ligas)
+
+    Args:
+        spec: "casa:esporte:liga1,liga2;casa:esporte:ligas"
+
+    Returns:
+        Células sem repetição, na ordem da configuração
+    """
+    if not spec.strip():
+        return [Source(league) for league in RAPIDAPI_LEAGUES]
+
+    sources = []
+    for group in filter(None, (part.strip() for part in spec.split(";"))):
+        try:
+            bookmaker, sport_id, leagues = (part.strip() for part in group.split(":"))
+            sport_id = int(sport_id)
+        except ValueError:
+            raise ValueError(f"SOURCE_MATRIX inválido em '{group}' (esperado casa:esporte:liga1,liga2)")
+
+        for league in filter(None, (league.strip() for league in leagues.split(","))):
+            source = Source(league, bookmaker, sport_id)
+            if source not in sources:
+                sources.append(source)
+
+    return sources
+
+
+SOURCES: List[Source] = parse_source_matrix(SOURCE_MATRIX)
+
+
+def get_sources(leagues: Optional[List[str]] = None) -> List[Source]:
+    """
+    Células configuradas, opcionalmente só das ligas informadas
+
+    Liga pedida explicitamente mas fora da matriz entra com a casa principal
+    no esporte padrão. A casa principal vem antes das outras na lista.
+    """
+    if leagues is None:
+        sources = list(SOURCES)
+    else:
+        sources = [source for source in SOURCES if source.league in leagues]
+        covered = {source.league for source in sources}
+        sources += [Source(league, SOURCE_PRIMARY_BOOKMAKER) for league in leagues if league not in covered]
+
+    return sorted(sources, key=lambda source: not source.is_primary)
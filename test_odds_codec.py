@@ -0,0 +1,175 @@
+"""
+Testes do formato binário do odds_json (odds_codec)
+O formato gravado no banco é append-only e versionado: estes testes fixam
+MARKET_CODES, o layout da versão 2 e a leitura da versão 1. Se algum falhar
+depois de uma mudança no codec, as linhas já gravadas passariam a decodificar
+errado: crie uma versão nova em vez de alterar a atual.
+
+Uso:
+    python -m pytest test_odds_codec.py -q
+"""
+
+import hashlib
+import json
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from odds_codec import (
+    MARKET_CODES,
+    MARKET_INDEX,
+    FORMAT_VERSION,
+    LEGACY_VERSION,
+    FLAG_ZLIB,
+    FLAG_FLOAT64,
+    FLAG_EXTRAS,
+    encode_odds,
+    decode_odds
+)
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Os 93 primeiros códigos gravados até aqui (mercados novos entram depois deles)
+PINNED_MARKET_COUNT = 93
+PINNED_MARKET_SHA1 = "0a88cbba2533d5f514c025618bffb25b741d0e87"
+
+# encode_odds(PINNED_ODDS, compress=False) na versão 2
+PINNED_ODDS = {
+    "odd_resultado_final_casa": "2.30",
+    "odd_resultado_final_fora": "3.1",
+    "odd_handicap_asiatico_fora": "1.084",
+    "odd_inexistente": "-"
+}
+PINNED_BYTES = (
+    "240c050000000000000000000010fc0800001c0c00003c040000"
+    "367b226f64645f696e6578697374656e7465223a222d227d"
+)
+
+
+def _fixture_odds():
+    """odds de todas as partidas dos rapidapi_*.json (como a ingestão grava)"""
+    odds = []
+    for path in sorted(BASE_DIR.glob("rapidapi_*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        payloads = [data] if "matchs" in data else [v for v in data.values() if isinstance(v, dict)]
+        for payload in payloads:
+            odds.extend(match["odds"] for match in payload.get("matchs", []) if isinstance(match.get("odds"), dict))
+    return odds
+
+
+FIXTURE_ODDS = _fixture_odds()
+
+
+def _legacy_blob(odds, float64=False, compress=False, extras=None):
+    """Monta uma linha da versão 1 (odds numéricas, sem casas decimais)"""
+    coded = sorted((MARKET_INDEX[market], price) for market, price in odds.items())
+    bitmap = bytearray(coded[-1][0] // 8 + 1)
+    for code, _ in coded:
+        bitmap[code // 8] |= 1 << (code % 8)
+
+    body = bytearray([len(bitmap)]) + bitmap
+    if float64:
+        body += struct.pack(f"<{len(coded)}d", *(price for _, price in coded))
+    else:
+        body += struct.pack(f"<{len(coded)}I", *(round(price * 1000) for _, price in coded))
+
+    flags = FLAG_FLOAT64 if float64 else 0
+    if extras:
+        flags |= FLAG_EXTRAS
+        body += json.dumps(extras).encode("utf-8")
+    if compress:
+        flags |= FLAG_ZLIB
+        body = zlib.compress(bytes(body))
+    return bytes([(LEGACY_VERSION << 4) | flags]) + bytes(body)
+
+
+def test_fixtures_exist():
+    assert len(FIXTURE_ODDS) >= 10
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_fixture_round_trip(compress):
+    for odds in FIXTURE_ODDS:
+        data = encode_odds(odds, compress=compress)
+        assert data[0] >> 4 == FORMAT_VERSION
+        assert decode_odds(data) == odds
+
+
+def test_fixture_markets_are_coded():
+    """Os mercados das fixtures vão para o corpo binário, não para os extras"""
+    for odds in FIXTURE_ODDS:
+        assert set(odds) <= set(MARKET_INDEX)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_extras_round_trip(compress):
+    odds = {
+        "odd_resultado_final_casa": "-",  # Suspenso
+        "odd_resultado_final_empate": 3.4,  # Número em vez de string
+        "odd_resultado_final_fora": "2.0001",  # Mais de 3 casas
+        "odd_over_0.5": "1e3",
+        "odd_under_0.5": "5000000.00",  # Não cabe em uint32 de milésimos
+        "odd_ambas_sim": None,
+        "odd_ambas_nao": "1.76",
+        "odd_mercado_novo": "2.50",  # Fora de MARKET_CODES
+    }
+    data = encode_odds(odds, compress=compress)
+    assert data[0] & FLAG_EXTRAS
+
+    decoded = decode_odds(data)
+    assert decoded == odds
+    assert type(decoded["odd_resultado_final_empate"]) is float
+    assert decoded["odd_ambas_sim"] is None
+
+
+@pytest.mark.parametrize("value", ["0", "7", "2.3", "2.30", "1.055", "10.00", "4294967.295"])
+def test_decimal_places_preserved(value):
+    assert decode_odds(encode_odds({"odd_resultado_final_casa": value})) == {"odd_resultado_final_casa": value}
+
+
+def test_empty_odds():
+    assert decode_odds(encode_odds({})) == {}
+
+
+@pytest.mark.parametrize("float64", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+def test_legacy_v1_decodes_to_two_decimals(float64, compress):
+    odds = {
+        "odd_resultado_final_casa": 2.3,
+        "odd_resultado_final_empate": 10.0,
+        "odd_over_0.5": 1.055,
+        "odd_handicap_asiatico_fora": 1.84,
+    }
+    data = _legacy_blob(odds, float64=float64, compress=compress, extras={"odd_x": "-"})
+    assert decode_odds(data) == {
+        "odd_resultado_final_casa": "2.30",
+        "odd_resultado_final_empate": "10.00",
+        "odd_over_0.5": "1.055",
+        "odd_handicap_asiatico_fora": "1.84",
+        "odd_x": "-",
+    }
+
+
+def test_unknown_version_rejected():
+    with pytest.raises(ValueError):
+        decode_odds(bytes([(FORMAT_VERSION + 1) << 4]) + encode_odds({})[1:])
+
+
+def test_market_codes_are_append_only():
+    """Reordenar, remover ou renomear um mercado muda o código das linhas gravadas"""
+    assert len(MARKET_CODES) >= PINNED_MARKET_COUNT
+    pinned = "\n".join(MARKET_CODES[:PINNED_MARKET_COUNT]).encode("utf-8")
+    assert hashlib.sha1(pinned).hexdigest() == PINNED_MARKET_SHA1
+    assert len(set(MARKET_CODES)) == len(MARKET_CODES)
+
+    assert MARKET_INDEX["odd_resultado_final_casa"] == 0
+    assert MARKET_INDEX["odd_resultado_final_empate"] == 1
+    assert MARKET_INDEX["odd_resultado_final_fora"] == 2
+    assert MARKET_INDEX["odd_handicap_asiatico_fora"] == 92
+
+
+def test_v2_layout_pinned():
+    assert encode_odds(PINNED_ODDS, compress=False).hex() == PINNED_BYTES
+    assert decode_odds(bytes.fromhex(PINNED_BYTES)) == PINNED_ODDS
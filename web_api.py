@@ -12,7 +12,7 @@ from typing import List, Optional, Set, Dict
 import subprocess
 import psutil
 import signal
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 import asyncio
@@ -21,12 +21,28 @@ import threading
 import time
 
 # Imports do projeto
-from database_rapidapi import get_db
-from models_rapidapi import Match, ScraperLog
-from sqlalchemy import func, desc
+from database_rapidapi import get_db, get_async_db, dispose_async_engine, init_db
+from db_writer import get_db_writer
+from models_rapidapi import Match, MatchPrice, ScraperLog
+from sqlalchemy import and_, func, desc, select
+from sqlalchemy.orm import undefer
 from sqlalchemy.sql import case
 from scraper_rapidapi import run_rapidapi_scraper
-from results_collector import run_results_collector
+from results_collector import run_results_collector, pending_result_leagues
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache
+from odds_history import get_odds_history
+from odds_schema import ODDS_SCHEMA, EXPORT_ODDS_COLUMNS
+from poll_planner import get_poll_planner, NEXT_MATCHES, RESULTS
+from match_time import utc_now
+from match_status import refresh_match_statuses, MATCH_STATUSES
+from config import (
+    RAPIDAPI_RATE_LIMITER_ENABLED,
+    RAPIDAPI_CACHE_ENABLED,
+    ODDS_HISTORY_MAX_POINTS,
+    SCHEDULER_ADAPTIVE,
+    SOURCE_PRIMARY_BOOKMAKER
+)
 
 # Inicializar FastAPI
 app = FastAPI(
@@ -70,6 +86,7 @@ class MatchResponse(BaseModel):
     hour: str
     minute: str
     scheduled_time: Optional[str] = None  # Formato "HH.MM"
+    kickoff_at: Optional[datetime] = None  # Início em UTC
     odd_home: float
     odd_draw: float
     odd_away: float
@@ -90,6 +107,8 @@ class StatsResponse(BaseModel):
     total: int
     finished: int
     scheduled: int
+    live: int = 0
+    expired: int = 0
     accuracy: float
     leagues: dict
     last_execution: Optional[dict]
@@ -137,111 +156,33 @@ async def get_matches(
     - **limit**: Número máximo de resultados (padrão: 2000)
     """
     try:
-        with get_db() as db:
-            query = db.query(Match)
+        async with get_async_db() as db:
+            query = select(Match)
             
             if league:
-                query = query.filter(Match.league == league)
+                query = query.where(Match.league == league)
             
             if status:
                 if status == 'finished':
                     # Partida finalizada = tem goals_home E goals_away preenchidos
-                    query = query.filter(
+                    query = query.where(
                         Match.goals_home.isnot(None),
                         Match.goals_away.isnot(None)
                     )
                 elif status == 'scheduled':
                     # Partida agendada = goals_home OU goals_away são None
-                    query = query.filter(
+                    query = query.where(
                         (Match.goals_home.is_(None)) | (Match.goals_away.is_(None))
                     )
             
             # Ordenação: ID decrescente (mais recentes primeiro)
             # Ordenação específica será feita no frontend
-            matches = query.order_by(Match.id.desc()).limit(limit).all()
-            
-            # Adicionar campo 'status' dinamicamente considerando horário
-            from datetime import datetime, timedelta
-            # IMPORTANTE: Adicionar +4h para sincronizar com horário do site Bet365
-            # Se no PC é 12:22, no site são 16:22
-            site_time = datetime.now() + timedelta(hours=4)
+            matches = (await db.scalars(query.order_by(Match.id.desc()).limit(limit))).all()
             
+            # Status já gravado (match_status.refresh_match_statuses, a cada ciclo do scheduler)
             result = []
             for match in matches:
                 try:
-                    # Determinar status real baseado no horário do site
-                    if match.goals_home is not None and match.goals_away is not None:
-                        # Tem resultado confirmado (gols definidos)
-                        match_status = "finished"
-                    elif match.scheduled_time:
-                        # Usar scheduled_time (formato "HH:MM")
-                        try:
-                            time_parts = match.scheduled_time.split(':')
-                            match_hour = int(time_parts[0])
-                            match_minute = int(time_parts[1])
-                            
-                            # Cria datetime da partida no horário do site
-                            match_datetime = site_time.replace(
-                                hour=match_hour, 
-                                minute=match_minute, 
-                                second=0, 
-                                microsecond=0
-                            )
-                            
-                            # Se o horário da partida já passou hoje, pode ser amanhã
-                            if match_datetime < site_time:
-                                # Verifica se a diferença é maior que 12 horas (provavelmente é amanhã)
-                                time_diff = (site_time - match_datetime).total_seconds() / 60
-                                if time_diff > 720:  # 12 horas
-                                    match_datetime = match_datetime + timedelta(days=1)
-                            
-                            # Calcula diferença em minutos
-                            time_diff_minutes = (match_datetime - site_time).total_seconds() / 60
-                            
-                            # Define status
-                            if time_diff_minutes > 120:  # Mais de 2h no futuro
-                                match_status = "scheduled"
-                            elif time_diff_minutes > -30:  # Entre 2h antes e 30min depois
-                                match_status = "live"
-                            else:  # Mais de 30min atrás
-                                match_status = "expired"
-                        except:
-                            # Fallback para hour/minute se scheduled_time não funcionar
-                            try:
-                                match_hour = int(match.hour) if match.hour else 0
-                                match_minute = int(match.minute) if match.minute else 0
-                                match_time_minutes = match_hour * 60 + match_minute
-                                current_time_minutes = site_time.hour * 60 + site_time.minute
-                                time_diff_minutes = current_time_minutes - match_time_minutes
-                            except (ValueError, TypeError):
-                                match_status = "scheduled"
-                                continue
-                            
-                            if time_diff_minutes > 120:
-                                match_status = "expired"
-                            elif time_diff_minutes > -30:
-                                match_status = "live"
-                            else:
-                                match_status = "scheduled"
-                    else:
-                        # Fallback final: usar hour/minute
-                        try:
-                            match_hour = int(match.hour) if match.hour else 0
-                            match_minute = int(match.minute) if match.minute else 0
-                            match_time_minutes = match_hour * 60 + match_minute
-                            current_time_minutes = site_time.hour * 60 + site_time.minute
-                            time_diff_minutes = current_time_minutes - match_time_minutes
-                        except (ValueError, TypeError):
-                            match_status = "scheduled"
-                            continue
-                        
-                        if time_diff_minutes > 120:
-                            match_status = "expired"
-                        elif time_diff_minutes > -30:
-                            match_status = "live"
-                        else:
-                            match_status = "scheduled"
-                    
                     match_dict = {
                         "id": match.id,
                         "external_id": match.external_id,
@@ -250,6 +191,7 @@ async def get_matches(
                         "team_away": match.team_away,
                         "hour": match.hour,
                         "minute": match.minute,
+                        "kickoff_at": match.kickoff_at,
                         "odd_home": float(match.odd_home) if match.odd_home else None,
                         "odd_draw": float(match.odd_draw) if match.odd_draw else None,
                         "odd_away": float(match.odd_away) if match.odd_away else None,
@@ -257,7 +199,7 @@ async def get_matches(
                         "odd_under_25": float(match.odd_under_25) if match.odd_under_25 else None,
                         "odd_both_score_yes": float(match.odd_both_score_yes) if match.odd_both_score_yes else None,
                         "odd_both_score_no": float(match.odd_both_score_no) if match.odd_both_score_no else None,
-                        "status": match_status,
+                        "status": match.status,
                         "total_goals": float(match.total_goals) if match.total_goals is not None else None,
                         "result": match.result,
                         "goals_home": int(match.goals_home) if match.goals_home is not None else None,
@@ -277,8 +219,8 @@ async def get_matches(
 async def get_match(match_id: int):
     """Retorna detalhes de uma partida específica"""
     try:
-        with get_db() as db:
-            match = db.query(Match).filter(Match.id == match_id).first()
+        async with get_async_db() as db:
+            match = await db.get(Match, match_id)
             
             if not match:
                 raise HTTPException(status_code=404, detail="Partida não encontrada")
@@ -290,6 +232,103 @@ async def get_match(match_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao buscar partida: {str(e)}")
 
+@app.get("/api/matches/{match_id}/prices")
+async def get_match_prices(match_id: int, full: bool = False):
+    """
+    Retorna as odds da partida em cada casa de apostas
+    
+    - full: inclui o odds_json completo de cada casa
+    """
+    try:
+        async with get_async_db() as db:
+            # odds_json é deferred: carregado junto quando pedido (sem lazy load na sessão async)
+            options = [undefer(Match.odds_json)] if full else []
+            match = await db.get(Match, match_id, options=options)
+            
+            if not match:
+                raise HTTPException(status_code=404, detail="Partida não encontrada")
+            
+            prices_query = select(MatchPrice).where(MatchPrice.match_id == match_id).order_by(MatchPrice.bookmaker)
+            if full:
+                prices_query = prices_query.options(undefer(MatchPrice.odds_json))
+            
+            prices = [{
+                'bookmaker': SOURCE_PRIMARY_BOOKMAKER,
+                'external_id': match.external_id,
+                'odd_home': match.odd_home,
+                'odd_draw': match.odd_draw,
+                'odd_away': match.odd_away,
+                'updated_at': match.scraped_at.isoformat() if match.scraped_at else None,
+                **({'odds_json': match.odds_json} if full else {})
+            }]
+            for price in await db.scalars(prices_query):
+                prices.append({
+                    'bookmaker': price.bookmaker,
+                    'external_id': price.external_id,
+                    'odd_home': price.odd_home,
+                    'odd_draw': price.odd_draw,
+                    'odd_away': price.odd_away,
+                    'updated_at': price.updated_at.isoformat() if price.updated_at else None,
+                    **({'odds_json': price.odds_json} if full else {})
+                })
+            
+            return {
+                'match_id': match.id,
+                'external_id': match.external_id,
+                'prices': prices
+            }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao buscar odds por casa: {str(e)}")
+
+@app.get("/api/matches/{match_id}/odds-history")
+async def get_match_odds_history(
+    match_id: int,
+    markets: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_points: int = ODDS_HISTORY_MAX_POINTS
+):
+    """
+    Retorna a evolução das odds de uma partida
+    
+    - markets: mercados separados por vírgula (ex: odd_resultado_final_casa,odd_ambas_sim)
+    - start/end: janela de tempo (horário do site, ISO 8601)
+    - max_points: máximo de pontos por mercado (0 = série completa)
+    """
+    try:
+        async with get_async_db() as db:
+            match = (await db.execute(
+                select(Match.id, Match.external_id).where(Match.id == match_id)
+            )).first()
+            
+            if not match:
+                raise HTTPException(status_code=404, detail="Partida não encontrada")
+            
+            # get_odds_history usa a API síncrona: roda na Session por trás da AsyncSession
+            series = await db.run_sync(
+                get_odds_history,
+                match_id,
+                markets=[m.strip() for m in markets.split(",") if m.strip()] if markets else None,
+                start=start,
+                end=end,
+                max_points=max_points
+            )
+            
+            return {
+                'match_id': match.id,
+                'external_id': match.external_id,
+                'max_points': max_points,
+                'markets': series
+            }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao buscar histórico de odds: {str(e)}")
+
 # ============================================================================
 # Endpoints - Estatísticas
 # ============================================================================
@@ -298,37 +337,29 @@ async def get_match(match_id: int):
 async def get_stats():
     """Retorna estatísticas gerais do sistema"""
     try:
-        with get_db() as db:
-            # Total de partidas
-            total = db.query(func.count(Match.id)).scalar()
-            
-            # Finalizadas (status = 'finished')
-            finished = db.query(func.count(Match.id)).filter(
-                Match.status == 'finished'
-            ).scalar()
+        async with get_async_db() as db:
+            # Partidas por liga e status (uma passada no índice (league, status));
+            # os totais gerais são a soma das ligas, com os mesmos critérios
+            counts = (await db.execute(select(
+                Match.league,
+                Match.status,
+                func.count(Match.id)
+            ).group_by(Match.league, Match.status))).all()
             
-            # Agendadas
-            scheduled = db.query(func.count(Match.id)).filter(
-                Match.status == 'scheduled'
-            ).scalar()
+            def _empty_counts() -> Dict[str, int]:
+                return {'total': 0, **{status: 0 for status in MATCH_STATUSES}}
             
-            # Por liga
+            totals = _empty_counts()
             leagues_stats = {}
-            leagues = db.query(
-                Match.league,
-                func.count(Match.id).label('count'),
-                func.sum(case((Match.status == 'finished', 1), else_=0)).label('finished_count')
-            ).group_by(Match.league).all()
-            
-            for league, count, finished_count in leagues:
-                leagues_stats[league] = {
-                    'total': count,
-                    'finished': finished_count,
-                    'scheduled': count - finished_count
-                }
+            for league, status, count in counts:
+                league_stats = leagues_stats.setdefault(league, _empty_counts())
+                for stats in (league_stats, totals):
+                    stats['total'] += count
+                    if status in MATCH_STATUSES:
+                        stats[status] += count
             
             # Última execução
-            last_log = db.query(ScraperLog).order_by(desc(ScraperLog.id)).first()
+            last_log = await db.scalar(select(ScraperLog).order_by(desc(ScraperLog.id)).limit(1))
             last_execution = None
             if last_log:
                 last_execution = {
@@ -343,9 +374,7 @@ async def get_stats():
             accuracy = prediction_stats.get('accuracy_winner', 0) if prediction_stats else 0
             
             return {
-                'total': total,
-                'finished': finished,
-                'scheduled': scheduled,
+                **totals,
                 'accuracy': accuracy,
                 'leagues': leagues_stats,
                 'last_execution': last_execution
@@ -367,11 +396,11 @@ async def predict_match(request: PredictionRequest):
     - **minute**: Minuto da partida (ex: "05")
     """
     try:
-        with get_db() as db:
-            match = db.query(Match).filter(
+        async with get_async_db() as db:
+            match = await db.scalar(select(Match).where(
                 Match.hour == request.hour,
                 Match.minute == request.minute
-            ).first()
+            ).limit(1))
             
             if not match:
                 raise HTTPException(
@@ -565,9 +594,13 @@ async def get_scraper_status():
         
         # Buscar última execução
         last_execution = None
+        pending_results = None
         try:
-            with get_db() as db:
-                last_log = db.query(ScraperLog).order_by(desc(ScraperLog.id)).first()
+            async with get_async_db() as db:
+                # Ligas com partida iniciada e sem placar (as únicas consultadas em /matchs)
+                pending_results = await db.run_sync(pending_result_leagues)
+                
+                last_log = await db.scalar(select(ScraperLog).order_by(desc(ScraperLog.id)).limit(1))
                 
                 if last_log:
                     last_execution = {
@@ -579,10 +612,38 @@ async def get_scraper_status():
         except Exception as db_error:
             print(f"Erro ao buscar logs: {db_error}")
         
+        # Uso da cota da RapidAPI (compartilhado entre todos os processos)
+        # Limitador e cache leem SQLite: em thread, fora do event loop
+        quota = None
+        if RAPIDAPI_RATE_LIMITER_ENABLED:
+            try:
+                quota = await asyncio.to_thread(lambda: get_rate_limiter().get_status())
+            except Exception as quota_error:
+                print(f"Erro ao ler cota da RapidAPI: {quota_error}")
+        
+        # Hit/miss do cache de respostas (para ajustar os TTLs)
+        cache = None
+        if RAPIDAPI_CACHE_ENABLED:
+            try:
+                cache = await asyncio.to_thread(lambda: get_response_cache().get_stats())
+            except Exception as cache_error:
+                print(f"Erro ao ler estatísticas do cache: {cache_error}")
+        
+        # Fila do escritor único do banco (backpressure da ingestão)
+        db_writer = get_db_writer().get_stats()
+        
+        # Plano do agendamento adaptativo (próxima coleta útil por liga)
+        polling = get_poll_planner().get_status() if SCHEDULER_ADAPTIVE else None
+        
         return {
             'is_running': is_running,
             'pid': scraper_process.pid if is_running else None,
-            'last_execution': last_execution
+            'last_execution': last_execution,
+            'quota': quota,
+            'cache': cache,
+            'db_writer': db_writer,
+            'pending_results': pending_results,
+            'polling': polling
         }
     
     except Exception as e:
@@ -606,8 +667,8 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Enviar status inicial
-        with get_db() as db:
-            total = db.query(func.count(Match.id)).scalar()
+        async with get_async_db() as db:
+            total = await db.scalar(select(func.count(Match.id)))
         
         await websocket.send_json({
             'type': 'connected',
@@ -660,62 +721,87 @@ async def broadcast_update(message: dict):
 # Scheduler Automático
 # ============================================================================
 
+def _scheduled_scraper(leagues=None):
+    """Busca próximas partidas e avisa o frontend das novas"""
+    print("🔍 Executando scraper automático...")
+    try:
+        result = run_rapidapi_scraper(leagues=leagues)
+        if result['matches_new'] > 0:
+            # Notificar via WebSocket
+            asyncio.run(broadcast_update({
+                'type': 'new_matches',
+                'count': result['matches_new'],
+                'message': f"{result['matches_new']} nova(s) partida(s) adicionada(s)!",
+                'timestamp': datetime.now().isoformat()
+            }))
+            print(f"✅ {result['matches_new']} novas partidas")
+    except Exception as e:
+        print(f"❌ Erro no scraper: {e}")
+
+
+def _scheduled_results(leagues=None):
+    """Atualiza resultados, avisa o frontend e valida as predições"""
+    print("📊 Atualizando resultados...")
+    try:
+        result = run_results_collector(leagues=leagues)
+        if result['matches_updated'] > 0:
+            # Notificar via WebSocket
+            asyncio.run(broadcast_update({
+                'type': 'results_updated',
+                'count': result['matches_updated'],
+                'message': f"{result['matches_updated']} resultado(s) atualizado(s)!",
+                'timestamp': datetime.now().isoformat()
+            }))
+            print(f"✅ {result['matches_updated']} resultados atualizados")
+            
+            # Validar predições
+            validate_predictions()
+    except Exception as e:
+        print(f"❌ Erro ao atualizar resultados: {e}")
+
+
 def auto_update_scheduler():
     """
-    Scheduler que roda em background:
-    - A cada 5 minutos: busca novas partidas
-    - A cada 3 minutos: atualiza resultados
+    Scheduler que roda em background (verifica a cada 30 segundos):
+    - Status das partidas por horário (match_status), a cada ciclo
+    - Adaptativo (SCHEDULER_ADAPTIVE): cada liga só é consultada quando o
+      calendário indica novidade (ver poll_planner)
+    - Fixo: novas partidas a cada 5 minutos, resultados a cada 3 minutos
     """
     global scheduler_running, last_match_count
     
     scraper_counter = 0
     results_counter = 0
+    planner = get_poll_planner()
     
-    print("🔄 Scheduler automático iniciado")
+    print(f"🔄 Scheduler automático iniciado ({'adaptativo' if SCHEDULER_ADAPTIVE else 'intervalo fixo'})")
     
     while scheduler_running:
         try:
-            scraper_counter += 1
-            results_counter += 1
-            
-            # A cada 5 minutos (300 segundos / 30 = 10 iterações)
-            if scraper_counter >= 10:
-                print("🔍 Executando scraper automático...")
-                try:
-                    result = run_rapidapi_scraper()
-                    if result['matches_new'] > 0:
-                        # Notificar via WebSocket
-                        asyncio.run(broadcast_update({
-                            'type': 'new_matches',
-                            'count': result['matches_new'],
-                            'message': f"{result['matches_new']} nova(s) partida(s) adicionada(s)!",
-                            'timestamp': datetime.now().isoformat()
-                        }))
-                        print(f"✅ {result['matches_new']} novas partidas")
-                except Exception as e:
-                    print(f"❌ Erro no scraper: {e}")
-                scraper_counter = 0
-            
-            # A cada 3 minutos (180 segundos / 30 = 6 iterações)
-            if results_counter >= 6:
-                print("📊 Atualizando resultados...")
-                try:
-                    result = run_results_collector()
-                    if result['updated'] > 0:
-                        # Notificar via WebSocket
-                        asyncio.run(broadcast_update({
-                            'type': 'results_updated',
-                            'count': result['updated'],
-                            'message': f"{result['updated']} resultado(s) atualizado(s)!",
-                            'timestamp': datetime.now().isoformat()
-                        }))
-                        print(f"✅ {result['updated']} resultados atualizados")
-                        
-                        # Validar predições
-                        validate_predictions()
-                except Exception as e:
-                    print(f"❌ Erro ao atualizar resultados: {e}")
-                results_counter = 0
+            # Transições de status vencidas (poucos UPDATEs por faixa de kickoff_at)
+            get_db_writer().run(refresh_match_statuses, "match_statuses")
+            
+            if SCHEDULER_ADAPTIVE:
+                next_due, results_due = planner.due()
+                if next_due:
+                    _scheduled_scraper(next_due)
+                    planner.mark_fetched(NEXT_MATCHES, next_due)
+                if results_due:
+                    _scheduled_results(results_due)
+                    planner.mark_fetched(RESULTS, results_due)
+            else:
+                scraper_counter += 1
+                results_counter += 1
+                
+                # A cada 5 minutos (300 segundos / 30 = 10 iterações)
+                if scraper_counter >= 10:
+                    _scheduled_scraper()
+                    scraper_counter = 0
+                
+                # A cada 3 minutos (180 segundos / 30 = 6 iterações)
+                if results_counter >= 6:
+                    _scheduled_results()
+                    results_counter = 0
             
             # Aguardar 30 segundos
             time.sleep(30)
@@ -791,6 +877,9 @@ async def startup_event():
     """Inicia scheduler automático quando API inicia"""
     global scheduler_running, scheduler_thread
     
+    # Cria tabelas/colunas novas em bancos antigos
+    init_db()
+    
     # Executa validação inicial
     print("🔄 Executando validação inicial de predições...")
     validate_predictions()
@@ -807,76 +896,32 @@ async def startup_event():
 
 def update_match_status_by_time():
     """
-    Atualiza o status dos jogos baseado na data/hora atual.
-    Jogos com horário passado (mais de 2h atrás) e sem resultado são marcados como 'finished'
+    Confere os jogos cujo início (kickoff_at) passou há mais de 2h sem resultado.
+    Nessa altura o refresh_match_statuses já os moveu para "expired" (ou ainda
+    "live", se o scheduler não rodou); o placar não é inventado, só registra.
     """
     try:
         with get_db() as db:
-            from datetime import datetime, timedelta
-            
-            # Pegar data/hora atual do SITE (+4h)
-            now = datetime.now() + timedelta(hours=4)
-            current_hour = now.hour
-            current_minute = now.minute
-            current_time_minutes = current_hour * 60 + current_minute
-            
-            # Buscar jogos agendados sem resultado
-            scheduled_matches = db.query(Match).filter(
-                Match.status == 'scheduled',
+            # Busca por faixa no índice (status, kickoff_at)
+            overdue = db.query(Match).filter(
+                Match.status.in_(('live', 'expired')),
+                Match.kickoff_at < utc_now() - timedelta(hours=2),
                 Match.result.is_(None)
-            ).all()
+            ).order_by(Match.kickoff_at.desc()).all()
             
-            updated_count = 0
-            for match in scheduled_matches:
-                # Calcular tempo do jogo em minutos (converter strings para int)
-                try:
-                    match_hour = int(match.hour) if match.hour else 0
-                    match_minute = int(match.minute) if match.minute else 0
-                    match_time_minutes = match_hour * 60 + match_minute
-                except (ValueError, TypeError):
-                    # Se não conseguir converter, pular esta partida
-                    continue
-                
-                # Se tem match_date, usar ela para comparação
-                if match.match_date:
-                    time_diff = now - match.match_date
-                    # Se passou mais de 2 horas (tempo suficiente para jogo + margem)
-                    if time_diff > timedelta(hours=2):
-                        # Marcar como agendado mas provavelmente encerrado
-                        # Não mudamos para 'finished' sem resultado confirmado
-                        # mas podemos adicionar um novo status 'expired'
-                        pass
-                else:
-                    # Sem match_date, usar apenas hora/minuto
-                    # Se passou mais de 2 horas do horário
-                    time_diff_minutes = current_time_minutes - match_time_minutes
-                    
-                    # Se é do dia anterior (horário menor que atual)
-                    if time_diff_minutes > 120:  # 2 horas = 120 minutos
-                        # Não alterar status sem resultado confirmado
-                        # Apenas logar para investigação
-                        if updated_count == 0:
-                            print(f"⚠️ Jogos com horário passado sem resultado:")
-                        print(f"   • {match.hour:02d}:{match.minute:02d} - {match.team_home} vs {match.team_away}")
-                        updated_count += 1
-            
-            if updated_count > 0:
-                print(f"⚠️ Total de {updated_count} jogos com horário passado sem resultado")
+            if overdue:
+                print(f"⚠️ Jogos com horário passado sem resultado (mais recentes):")
+                for match in overdue[:20]:
+                    print(f"   • {match.scheduled_time} - {match.team_home} vs {match.team_away}")
+                print(f"⚠️ Total de {len(overdue)} jogos com horário passado sem resultado")
                 print(f"💡 Aguardando atualização de resultados via scraper")
             else:
                 print("✅ Todos os jogos agendados estão dentro do prazo esperado")
             
-            db.commit()
-            
     except Exception as e:
         print(f"❌ Erro ao atualizar status por horário: {e}")
         import traceback
         traceback.print_exc()
-    
-    scheduler_running = True
-    scheduler_thread = threading.Thread(target=auto_update_scheduler, daemon=True)
-    scheduler_thread.start()
-    print("✅ Sistema de auto-atualização iniciado!")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -894,8 +939,8 @@ async def shutdown_event():
 async def get_logs(limit: int = 50):
     """Retorna logs do scraper"""
     try:
-        with get_db() as db:
-            logs = db.query(ScraperLog).order_by(desc(ScraperLog.id)).limit(limit).all()
+        async with get_async_db() as db:
+            logs = (await db.scalars(select(ScraperLog).order_by(desc(ScraperLog.id)).limit(limit))).all()
             
             return {
                 'logs': [
@@ -907,7 +952,15 @@ async def get_logs(limit: int = 50):
                         'matches_found': log.matches_found,
                         'matches_new': log.matches_new,
                         'matches_updated': log.matches_updated,
-                        'error_message': log.error_message
+                        'matches_unchanged': log.matches_unchanged,
+                        'leagues_unchanged': log.leagues_unchanged.split(',') if log.leagues_unchanged else [],
+                        'leagues_skipped': log.leagues_skipped or 0,
+                        'error_message': log.error_message,
+                        'scraper_mode': log.scraper_mode,
+                        'retry_count': log.retry_count,
+                        'failed_requests': log.failed_requests,
+                        'breaker_states': log.breaker_states,
+                        'source_stats': log.source_stats
                     }
                     for log in logs
                 ]
@@ -920,8 +973,8 @@ async def get_logs(limit: int = 50):
 async def get_latest_log():
     """Retorna o log mais recente"""
     try:
-        with get_db() as db:
-            log = db.query(ScraperLog).order_by(desc(ScraperLog.id)).first()
+        async with get_async_db() as db:
+            log = await db.scalar(select(ScraperLog).order_by(desc(ScraperLog.id)).limit(1))
             
             if not log:
                 return {'log': None}
@@ -935,7 +988,15 @@ async def get_latest_log():
                     'matches_found': log.matches_found,
                     'matches_new': log.matches_new,
                     'matches_updated': log.matches_updated,
+                    'matches_unchanged': log.matches_unchanged,
+                    'leagues_unchanged': log.leagues_unchanged.split(',') if log.leagues_unchanged else [],
+                    'leagues_skipped': log.leagues_skipped or 0,
                     'error_message': log.error_message,
+                    'scraper_mode': log.scraper_mode,
+                    'retry_count': log.retry_count,
+                    'failed_requests': log.failed_requests,
+                    'breaker_states': log.breaker_states,
+                    'source_stats': log.source_stats,
                     'duration': (log.finished_at - log.started_at).total_seconds() if (log.finished_at and log.started_at) else None
                 }
             }
@@ -953,15 +1014,15 @@ async def monitor_database_changes():
     
     while True:
         try:
-            with get_db() as db:
-                current_count = db.query(func.count(Match.id)).scalar()
+            async with get_async_db() as db:
+                current_count = await db.scalar(select(func.count(Match.id)))
                 
                 if current_count > last_match_count and last_match_count > 0:
                     # Novas partidas adicionadas
                     new_count = current_count - last_match_count
                     
                     # Buscar últimas partidas adicionadas
-                    new_matches = db.query(Match).order_by(desc(Match.id)).limit(new_count).all()
+                    new_matches = (await db.scalars(select(Match).order_by(desc(Match.id)).limit(new_count))).all()
                     
                     # Broadcast para clientes
                     await broadcast_update({
@@ -1010,8 +1071,8 @@ async def startup_event():
     
     # Inicializar contador de partidas
     try:
-        with get_db() as db:
-            last_match_count = db.query(func.count(Match.id)).scalar()
+        async with get_async_db() as db:
+            last_match_count = await db.scalar(select(func.count(Match.id)))
         print(f"📊 Total de partidas: {last_match_count}")
     except:
         last_match_count = 0
@@ -1041,6 +1102,9 @@ async def shutdown_event():
         except:
             scraper_process.kill()
     
+    # Conexões do engine asyncio dos endpoints
+    await dispose_async_engine()
+    
     print("\n✅ ApiBet API - Encerrado")
 
 # ============================================================================
@@ -1053,62 +1117,48 @@ async def get_analytics_overview():
     Retorna overview de analytics: taxa de acerto, distribuição por liga, etc.
     """
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             
             # Total de partidas
-            total_matches = db.query(Match).count()
+            total_matches = await db.scalar(select(func.count(Match.id)))
             
             # Partidas com resultado (status finished)
-            finished_matches = db.query(Match).filter(
+            finished_matches = await db.scalar(select(func.count(Match.id)).where(
                 Match.status == 'finished'
-            ).count()
+            ))
+            
+            # Taxa de acerto do vencedor previsto pelas odds (menor odd = favorito;
+            # empate de odds: casa, depois fora), contada no próprio banco
+            predicted_winner = case(
+                (and_(Match.odd_home <= Match.odd_draw, Match.odd_home <= Match.odd_away), 'home'),
+                (Match.odd_away <= Match.odd_draw, 'away'),
+                else_='draw'
+            )
+            predictions = (await db.execute(select(
+                func.count(Match.id).label('total'),
+                func.sum(case((predicted_winner == Match.result, 1), else_=0)).label('winner')
+            ).where(
+                Match.result.isnot(None),
+                Match.status == 'finished'
+            ))).one()
             
-            # Taxa de acerto por tipo de predição
+            # Placar exato não temos predição no modelo atual, conta como 0
             correct_predictions = {
-                'winner': 0,
-                'draw': 0,
+                'winner': predictions.winner or 0,
                 'score': 0,
-                'total': 0
+                'total': predictions.total
             }
             
-            matches_with_prediction = db.query(Match).filter(
-                Match.result.isnot(None),
-                Match.status == 'finished'
-            ).all()
-            
-            for match in matches_with_prediction:
-                correct_predictions['total'] += 1
-                
-                # Verifica predição de vencedor (baseado em odds)
-                odds = [match.odd_home, match.odd_draw, match.odd_away]
-                if min(odds) == match.odd_home:
-                    predicted_winner = 'home'
-                elif min(odds) == match.odd_away:
-                    predicted_winner = 'away'
-                else:
-                    predicted_winner = 'draw'
-                
-                if predicted_winner == match.result:
-                    correct_predictions['winner'] += 1
-                
-                if match.result == 'draw':
-                    correct_predictions['draw'] += 1
-                
-                # Verifica placar exato (se disponível)
-                if (match.goals_home is not None and match.goals_away is not None):
-                    # Placar exato não temos predição no modelo atual, conta como 0
-                    pass
-            
             # Calcula taxas
             winner_accuracy = (correct_predictions['winner'] / correct_predictions['total'] * 100) if correct_predictions['total'] > 0 else 0
             score_accuracy = (correct_predictions['score'] / correct_predictions['total'] * 100) if correct_predictions['total'] > 0 else 0
             
             # Distribuição por liga
-            league_stats = db.query(
+            league_stats = (await db.execute(select(
                 Match.league,
                 func.count(Match.id).label('count'),
                 func.sum(case((Match.status == 'finished', 1), else_=0)).label('finished')
-            ).group_by(Match.league).all()
+            ).group_by(Match.league))).all()
             
             leagues = [
                 {
@@ -1121,11 +1171,11 @@ async def get_analytics_overview():
             ]
             
             # Média de odds
-            avg_odds = db.query(
+            avg_odds = (await db.execute(select(
                 func.avg(Match.odd_home).label('home'),
                 func.avg(Match.odd_draw).label('draw'),
                 func.avg(Match.odd_away).label('away')
-            ).first()
+            ))).first()
             
             return {
                 'status': 'success',
@@ -1155,15 +1205,15 @@ async def get_timeline_data():
     Retorna dados para gráfico de timeline de partidas
     """
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             
             # Agrupa por data
-            timeline = db.query(
+            timeline = (await db.execute(select(
                 func.date(Match.match_date).label('date'),
                 func.count(Match.id).label('count')
             ).group_by(
                 func.date(Match.match_date)
-            ).order_by('date').all()
+            ).order_by('date'))).all()
             
             return {
                 'status': 'success',
@@ -1185,14 +1235,16 @@ async def get_recommendations(min_confidence: float = 0.65):
     Busca partidas onde as odds indicam valor (menor odd = favorito)
     """
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             
-            # Busca partidas futuras (status scheduled)
-            upcoming = db.query(Match).filter(
-                Match.status == 'scheduled'
+            # Busca partidas futuras sem resultado (faixa no índice de kickoff_at;
+            # o status vira "live" 2h antes do início, então não serve de filtro)
+            upcoming = (await db.scalars(select(Match).where(
+                Match.kickoff_at > utc_now(),
+                Match.result.is_(None)
             ).order_by(
-                Match.match_date
-            ).limit(50).all()
+                Match.kickoff_at
+            ).limit(50))).all()
             
             recommendations = []
             for match in upcoming:
@@ -1225,8 +1277,10 @@ async def get_recommendations(min_confidence: float = 0.65):
                 expected_odd = 1 / (confidence / 100) if confidence > 0 else 0
                 value = ((min_odd - expected_odd) / expected_odd * 100) if expected_odd > 0 else 0
                 
-                # Predição de Over/Under 2.5
-                over_under_pred = 'Under 2.5' if match.odd_under_25 < match.odd_over_25 else 'Over 2.5'
+                # Predição de Over/Under 2.5 (sem as duas odds: sem predição)
+                over_under_pred = None
+                if match.odd_under_25 and match.odd_over_25:
+                    over_under_pred = 'Under 2.5' if match.odd_under_25 < match.odd_over_25 else 'Over 2.5'
                 
                 recommendations.append({
                     'match_id': match.id,
@@ -1287,59 +1341,66 @@ async def update_match_result(
     Atualiza resultado de uma partida manualmente
     Útil para validação rápida ou correção de dados
     """
+    def _apply_result(db) -> Optional[Dict]:
+        # Busca a partida
+        match = db.query(Match).filter(Match.id == match_id).first()
+        if not match:
+            return None
+        
+        # Atualiza os campos
+        match.goals_home = goals_home
+        match.goals_away = goals_away
+        match.total_goals = goals_home + goals_away
+        
+        # Determina o resultado
+        if goals_home > goals_away:
+            match.result = 'home'
+        elif goals_away > goals_home:
+            match.result = 'away'
+        else:
+            match.result = 'draw'
+        
+        match.status = 'finished'
+        
+        return {
+            'id': match.id,
+            'team_home': match.team_home,
+            'team_away': match.team_away,
+            'goals_home': goals_home,
+            'goals_away': goals_away,
+            'result': match.result
+        }
+    
     try:
-        with get_db() as db:
-            
-            # Busca a partida
-            match = db.query(Match).filter(Match.id == match_id).first()
-            if not match:
-                raise HTTPException(status_code=404, detail="Partida não encontrada")
-            
-            # Atualiza os campos
-            match.goals_home = goals_home
-            match.goals_away = goals_away
-            match.total_goals = goals_home + goals_away
-            
-            # Determina o resultado
-            if goals_home > goals_away:
-                match.result = 'home'
-            elif goals_away > goals_home:
-                match.result = 'away'
-            else:
-                match.result = 'draw'
-            
-            match.status = 'finished'
-            
-            db.commit()
-            
-            print(f"✅ Resultado atualizado manualmente: {match.team_home} {goals_home}x{goals_away} {match.team_away}")
-            
-            # Valida predições após atualização
-            validate_predictions()
-            
-            # Envia notificação via WebSocket
-            await broadcast_update({
-                'type': 'result_updated',
-                'match_id': match_id,
-                'match': f"{match.team_home} vs {match.team_away}",
-                'score': f"{goals_home}-{goals_away}",
-                'result': match.result,
-                'message': f"Resultado atualizado: {match.team_home} {goals_home}x{goals_away} {match.team_away}",
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            return {
-                'status': 'success',
-                'match': {
-                    'id': match.id,
-                    'team_home': match.team_home,
-                    'team_away': match.team_away,
-                    'goals_home': goals_home,
-                    'goals_away': goals_away,
-                    'result': match.result
-                },
-                'prediction_stats': prediction_stats
-            }
+        # Gravação pelo escritor único (fora do event loop: submit pode bloquear)
+        loop = asyncio.get_running_loop()
+        match = await loop.run_in_executor(
+            None, lambda: get_db_writer().run(_apply_result, f"manual_result:{match_id}")
+        )
+        if match is None:
+            raise HTTPException(status_code=404, detail="Partida não encontrada")
+        
+        print(f"✅ Resultado atualizado manualmente: {match['team_home']} {goals_home}x{goals_away} {match['team_away']}")
+        
+        # Valida predições após atualização (varre as finalizadas: fora do event loop)
+        await loop.run_in_executor(None, validate_predictions)
+        
+        # Envia notificação via WebSocket
+        await broadcast_update({
+            'type': 'result_updated',
+            'match_id': match_id,
+            'match': f"{match['team_home']} vs {match['team_away']}",
+            'score': f"{goals_home}-{goals_away}",
+            'result': match['result'],
+            'message': f"Resultado atualizado: {match['team_home']} {goals_home}x{goals_away} {match['team_away']}",
+            'timestamp': datetime.now().isoformat()
+        })
+        
+        return {
+            'status': 'success',
+            'match': match,
+            'prediction_stats': prediction_stats
+        }
     
     except HTTPException:
         raise
@@ -1347,29 +1408,34 @@ async def update_match_result(
         raise HTTPException(status_code=500, detail=f"Erro ao atualizar resultado: {str(e)}")
 
 @app.get("/api/export/csv")
-async def export_csv(league: Optional[str] = None, limit: int = 1000):
+async def export_csv(league: Optional[str] = None, limit: int = 1000, all_odds: bool = False):
     """
     Exporta dados em formato CSV
+    
+    - all_odds: inclui todos os mercados do schema de odds (padrão: casa/empate/fora)
     """
     try:
-        with get_db() as db:
+        async with get_async_db() as db:
             
-            query = db.query(Match)
+            query = select(Match)
             if league:
-                query = query.filter(Match.league == league)
+                query = query.where(Match.league == league)
             
-            matches = query.order_by(desc(Match.match_date)).limit(limit).all()
+            matches = (await db.scalars(query.order_by(desc(Match.match_date)).limit(limit))).all()
             
-            # Gera CSV
+            # Gera CSV (colunas de odds vindas do odds_schema)
+            odds_columns = ODDS_SCHEMA.columns if all_odds else EXPORT_ODDS_COLUMNS
             csv_lines = [
-                "ID,Liga,Data,Casa,Fora,Odds Casa,Odds Empate,Odds Fora,Placar Casa,Placar Fora,Resultado"
+                "ID,Liga,Data,Casa,Fora,"
+                + ",".join(ODDS_SCHEMA.label(column) for column in odds_columns)
+                + ",Placar Casa,Placar Fora,Resultado"
             ]
             
             for m in matches:
                 csv_lines.append(
                     f"{m.id},{m.league},{m.match_date},{m.team_home},{m.team_away},"
-                    f"{m.odd_home},{m.odd_draw},{m.odd_away},"
-                    f"{m.goals_home or ''},{m.goals_away or ''},"
+                    + ",".join(str(getattr(m, column)) for column in odds_columns)
+                    + f",{m.goals_home or ''},{m.goals_away or ''},"
                     f"{m.result or ''}"
                 )
             
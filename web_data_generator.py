@@ -6,6 +6,8 @@ import json
 import sqlite3
 from datetime import datetime
 
+from odds_schema import DASHBOARD_ODDS_COLUMNS
+
 def generate_web_data():
     """Gera arquivo JSON com dados do banco para o dashboard"""
     
@@ -20,18 +22,13 @@ def generate_web_data():
     cursor = conn.cursor()
     
     # Buscar todas as partidas
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT 
             id, external_id, league,
             team_home, team_away,
             hour, minute, scheduled_time,
             goals_home, goals_away, total_goals, result,
-            odd_home, odd_draw, odd_away,
-            odd_over_25, odd_under_25,
-            odd_both_score_yes, odd_both_score_no,
-            odd_correct_1_0_home, odd_correct_0_0, odd_correct_1_0_away,
-            odd_correct_2_0_home, odd_correct_1_1, odd_correct_2_0_away,
-            odd_correct_2_1_home, odd_correct_2_2, odd_correct_2_1_away,
+            {", ".join(DASHBOARD_ODDS_COLUMNS)},
             status, scraped_at
         FROM matches
         ORDER BY hour, minute
@@ -52,13 +49,7 @@ def generate_web_data():
             'goals_away': row['goals_away'],
             'total_goals': row['total_goals'],
             'result': row['result'],
-            'odd_home': row['odd_home'],
-            'odd_draw': row['odd_draw'],
-            'odd_away': row['odd_away'],
-            'odd_over_25': row['odd_over_25'],
-            'odd_under_25': row['odd_under_25'],
-            'odd_both_score_yes': row['odd_both_score_yes'],
-            'odd_both_score_no': row['odd_both_score_no'],
+            **{column: row[column] for column in DASHBOARD_ODDS_COLUMNS},
             'status': row['status'],
             'scraped_at': row['scraped_at']
         }